@@ -0,0 +1,108 @@
+"""
+开放模型（到达率）调度
+封闭模型下每个用户等待上一个请求完成后才发起下一个，Jira变慢时实际施加的负载会悄悄下降，
+响应时间反而显得更好（协调遗漏）。开放模型按计划的到达时间发起操作，与响应快慢无关；
+响应时间从计划开始时间算起，排队等待的时间也会体现在结果中。
+"""
+import random
+import time
+
+from gevent.local import local
+
+import derived_stats
+
+DISTRIBUTIONS = ("poisson", "constant")
+
+# 当前greenlet正在执行的操作的计划开始时间
+_arrival_state = local()
+
+
+def parse_arrival_rates(spec):
+    """解析 'create_issue=5,search_issues=0.5' 格式的到达率配置（每秒操作数）"""
+    rates = {}
+    for item in spec.split(','):
+        item = item.strip()
+        if not item:
+            continue
+        task_name, sep, rate = item.partition('=')
+        if not sep:
+            raise ValueError(f"ARRIVAL_RATES格式错误: {item}")
+        rate = float(rate)
+        if rate < 0:
+            raise ValueError(f"到达率不能为负数: {item}")
+        if rate > 0:
+            rates[task_name.strip()] = rate
+    return rates
+
+
+class ArrivalSchedule:
+    """
+    计划到达时间序列
+
+    poisson: 到达间隔服从指数分布（泊松过程）
+    constant: 固定间隔；起点随机错开，避免多个用户同时发起
+    """
+
+    def __init__(self, rate, distribution="poisson", start=None):
+        if rate <= 0:
+            raise ValueError(f"到达率必须大于0: {rate}")
+        if distribution not in DISTRIBUTIONS:
+            raise ValueError(f"不支持的到达分布: {distribution}")
+        self.rate = rate
+        self.distribution = distribution
+        start = time.time() if start is None else start
+        if distribution == "constant":
+            self.next_time = start + random.uniform(0, 1.0 / rate)
+        else:
+            self.next_time = start + random.expovariate(rate)
+
+    def next(self):
+        """返回下一次计划到达时间（time.time()时间戳）"""
+        arrival = self.next_time
+        if self.distribution == "constant":
+            self.next_time += 1.0 / self.rate
+        else:
+            self.next_time += random.expovariate(self.rate)
+        return arrival
+
+
+def run_at_intended(operation, intended_start, *args):
+    """执行一次到达的操作，期间发出的请求都携带计划开始时间"""
+    _arrival_state.intended_start = intended_start
+    try:
+        operation(*args)
+    finally:
+        _arrival_state.intended_start = None
+
+
+def arrival_context():
+    """User.context()的补充：当前greenlet在执行到达操作时返回计划开始时间"""
+    intended_start = getattr(_arrival_state, 'intended_start', None)
+    if intended_start is None:
+        return {}
+    return {'intended_start': intended_start}
+
+
+def setup_intended_latency_reporting(environment, request_type="QUEUED"):
+    """
+    为携带计划开始时间的请求额外上报一条QUEUED类型的派生记录（名称不变），响应时间从计划开始时间算到请求完成
+
+    原始条目仍是服务端响应时间，两者之差即为负载生成器侧的排队延迟；派生记录不计入Aggregated和容量搜索
+    """
+    def on_request(name, response_time, response_length, exception=None, context=None, start_time=None,
+                   **kwargs):
+        intended_start = (context or {}).get('intended_start')
+        if intended_start is None or start_time is None or response_time is None:
+            return
+        completed = start_time * 1000 + response_time
+        derived_stats.report(
+            request_type,
+            name,
+            max(completed - intended_start * 1000, response_time),
+            response_length=response_length,
+            exception=exception,
+            start_time=intended_start,
+            url=kwargs.get('url')
+        )
+
+    environment.events.request.add_listener(on_request)
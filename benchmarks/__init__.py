@@ -0,0 +1,3 @@
+"""
+负载生成器自身代码路径的基准测试
+"""
@@ -0,0 +1,74 @@
+"""
+JiraAPIClient客户端路径微基准：不发网络请求，测量请求体构造、Wazuh告警格式化和响应处理的CPU耗时
+
+会话替换为直接返回固定响应的CannedSession，因此结果只包含本项目代码的开销（不含requests发送请求的开销）。
+
+用法:
+    python -m benchmarks.bench_client
+    python -m benchmarks.bench_client --number 5000
+"""
+import argparse
+
+# jira_utils会导入locust并执行gevent monkey patch，需要在requests之前导入
+from jira_utils import JiraAPIClient, SecurityDataGenerator
+from benchmarks.bench_payloads import COMMENT, DESCRIPTION, SUMMARY, measure
+
+import requests
+
+# 预先生成一条告警，避免把Faker的耗时计入格式化
+WAZUH_ALERT = SecurityDataGenerator.generate_wazuh_alert_data()
+
+
+def _response(status_code, content):
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = content
+    return response
+
+
+class CannedSession:
+    """按HTTP方法返回固定响应的会话"""
+
+    RESPONSES = {
+        "POST": _response(201, b'{"id":"10001","key":"SOC-1","self":"http://stub/rest/api/2/issue/10001"}'),
+        "PUT": _response(204, b""),
+        "GET": _response(200, b'{"key":"SOC-1","fields":{}}'),
+    }
+
+    def request(self, method, url, **kwargs):
+        return self.RESPONSES[method]
+
+
+def _client():
+    client = JiraAPIClient(session=CannedSession())
+    client.report_stats = False
+    return client
+
+
+def cases(client):
+    return [
+        ("create_issue", lambda: client.create_issue(SUMMARY, DESCRIPTION, priority="High")),
+        ("add_comment", lambda: client.add_comment("SOC-1", COMMENT)),
+        ("update_priority", lambda: client.update_incident_priority("SOC-1", "Critical")),
+        ("transition", lambda: client.transition_incident_status("SOC-1", "21", COMMENT)),
+        ("wazuh_fields", lambda: JiraAPIClient.wazuh_incident_fields(WAZUH_ALERT)),
+        ("create_from_wazuh", lambda: client.create_incident_from_wazuh(WAZUH_ALERT)),
+    ]
+
+
+def run(number):
+    """运行全部用例，返回 {用例名: 单次耗时(微秒)}"""
+    return {name: measure(func, number, repeat=3) for name, func in cases(_client())}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="JiraAPIClient客户端路径微基准")
+    parser.add_argument("--number", type=int, default=5000, help="每轮调用次数")
+    args = parser.parse_args()
+
+    for name, us in run(args.number).items():
+        print(f"{name:<22}{us:>12.2f}µs")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+端到端基准：在进程内启动Jira替身服务，用Locust的LocalRunner运行JiraUser（或JiraFastUser）固定时长，
+测量每CPU秒完成的请求数（requests/sec-per-core）
+
+替身服务与用户运行在同一进程、同一核心上，CPU时间包含两者，因此结果用于前后对比，不代表对真实Jira的吞吐。
+用户等待时间固定为0，日志关闭，只测量请求路径本身。
+
+用法:
+    python -m benchmarks.bench_e2e
+    python -m benchmarks.bench_e2e --users 20 --duration 15 --user-class JiraHeavyUser
+"""
+import argparse
+import time
+
+import gevent
+from locust import constant
+from locust.env import Environment
+
+from config import jira_config
+from jira_stub_server import JiraStubServer
+from log_utils import LEVELS, logger
+
+
+def _load_user_class(name):
+    """把harness指向替身服务后再导入locustfile（用户类的host在类定义时读取）"""
+    import locustfile
+
+    if jira_config.http_client == 'fast' and not name.startswith('JiraFast'):
+        name = name.replace('Jira', 'JiraFast', 1)
+    user_class = getattr(locustfile, name)
+    user_class.host = jira_config.base_url
+    user_class.wait_time = constant(0)
+    return user_class
+
+
+def run(users=10, duration=10.0, user_class="JiraUser", warmup=2.0):
+    """
+    运行一次端到端基准
+
+    Returns:
+        dict: requests、failures、rps、cpu_seconds、req_per_cpu_s
+    """
+    stub = JiraStubServer(port=0).start()
+    jira_config.base_url = stub.base_url
+    jira_config.api_url = f"{stub.base_url}/rest/api/2"
+    level, logger.level = logger.level, LEVELS['OFF']
+    try:
+        environment = Environment(user_classes=[_load_user_class(user_class)])
+        runner = environment.create_local_runner()
+        runner.start(users, spawn_rate=users)
+        # 预热：启动阶段、issue池预热的请求不计入
+        gevent.sleep(warmup)
+        environment.stats.reset_all()
+
+        cpu_start = time.process_time()
+        wall_start = time.perf_counter()
+        gevent.sleep(duration)
+        cpu_seconds = time.process_time() - cpu_start
+        wall_seconds = time.perf_counter() - wall_start
+        total = environment.stats.total
+        requests, failures = total.num_requests, total.num_failures
+        runner.quit()
+    finally:
+        logger.level = level
+        stub.stop()
+
+    return {
+        "requests": requests,
+        "failures": failures,
+        "rps": requests / wall_seconds,
+        "cpu_seconds": cpu_seconds,
+        "req_per_cpu_s": requests / cpu_seconds if cpu_seconds else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="进程内替身服务上的端到端基准")
+    parser.add_argument("--users", type=int, default=10, help="并发用户数")
+    parser.add_argument("--duration", type=float, default=10.0, help="测量时长（秒）")
+    parser.add_argument("--user-class", default="JiraUser", help="locustfile中的用户类")
+    args = parser.parse_args()
+
+    result = run(args.users, args.duration, args.user_class)
+    print(f"{args.user_class} × {args.users} ({jira_config.http_client}): {result['requests']} 个请求，"
+          f"失败 {result['failures']}，{result['rps']:.0f} req/s，{result['req_per_cpu_s']:.0f} req/CPU秒")
+
+
+if __name__ == "__main__":
+    main()
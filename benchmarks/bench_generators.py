@@ -0,0 +1,43 @@
+"""
+测试数据生成器微基准：SecurityDataGenerator各方法的单次耗时，以及当前配置的data_generator（语料库或实时Faker）
+
+用法:
+    python -m benchmarks.bench_generators
+    python -m benchmarks.bench_generators --number 2000
+"""
+import argparse
+
+from benchmarks.bench_payloads import measure
+from jira_utils import SecurityDataGenerator, data_generator
+
+CASES = [
+    ("summary", SecurityDataGenerator.generate_security_incident_summary),
+    ("description", SecurityDataGenerator.generate_security_incident_description),
+    ("comment", SecurityDataGenerator.generate_security_comment),
+    ("ioc", SecurityDataGenerator.generate_ioc),
+    ("wazuh_alert", SecurityDataGenerator.generate_wazuh_alert_data),
+    ("jql", SecurityDataGenerator.generate_soc_jql_queries),
+    # 请求路径上实际使用的生成器（DATA_CORPUS_PATH配置时为语料库）
+    ("active_summary", data_generator.generate_security_incident_summary),
+    ("active_description", data_generator.generate_security_incident_description),
+    ("active_comment", data_generator.generate_security_comment),
+]
+
+
+def run(number):
+    """运行全部用例，返回 {用例名: 单次耗时(微秒)}"""
+    return {name: measure(func, number, repeat=3) for name, func in CASES}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="测试数据生成器微基准")
+    parser.add_argument("--number", type=int, default=1000, help="每轮调用次数")
+    args = parser.parse_args()
+
+    print(f"data_generator: {getattr(data_generator, '__name__', type(data_generator).__name__)}")
+    for name, us in run(args.number).items():
+        print(f"{name:<22}{us:>12.2f}µs")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+请求体构造微基准：嵌套字典 + json.dumps 对比预序列化模板
+
+用法:
+    python -m benchmarks.bench_payloads
+    python -m benchmarks.bench_payloads --number 50000
+"""
+import argparse
+import json
+import timeit
+
+import payload_templates
+from config import jira_config
+
+SUMMARY = "Malware Detection detected via Email"
+DESCRIPTION = (
+    "Wazuh Alert Details:\n- Timestamp: 2024-01-01 12:00:00\n- Source IP: 10.0.0.1\n"
+    "- Destination IP: 10.0.0.2\n- User Agent: Mozilla/5.0 (Windows NT 10.0; Win64; x64)\n"
+    "- Rule ID: 5710\n- Alert Level: 10\n- Description: Multiple failed logins."
+)
+COMMENT = "[Alice] Initial triage completed. Escalating to L2 for further analysis."
+
+
+def dict_create_issue():
+    payload = {
+        "fields": {
+            "project": {
+                "key": jira_config.project_key
+            },
+            "summary": SUMMARY,
+            "description": DESCRIPTION,
+            "issuetype": {
+                "name": jira_config.default_issue_type
+            },
+            "priority": {"name": "High"}
+        }
+    }
+    return json.dumps(payload)
+
+
+def template_create_issue():
+    return payload_templates.create_issue_payload(SUMMARY, DESCRIPTION, priority="High")
+
+
+def dict_comment():
+    return json.dumps({"body": COMMENT})
+
+
+def template_comment():
+    return payload_templates.comment_payload(COMMENT)
+
+
+def dict_transition():
+    payload = {"transition": {"id": "21"}}
+    payload["update"] = {"comment": [{"add": {"body": COMMENT}}]}
+    return json.dumps(payload)
+
+
+def template_transition():
+    return payload_templates.transition_payload("21", COMMENT)
+
+
+def dict_priority():
+    return json.dumps({"fields": {"priority": {"name": "Critical"}}})
+
+
+def template_priority():
+    return payload_templates.priority_payload("Critical")
+
+
+CASES = [
+    ("create_issue", dict_create_issue, template_create_issue),
+    ("add_comment", dict_comment, template_comment),
+    ("transition", dict_transition, template_transition),
+    ("update_priority", dict_priority, template_priority),
+]
+
+
+def measure(func, number, repeat=5):
+    """返回单次调用的最小耗时（微秒）"""
+    return min(timeit.repeat(func, number=number, repeat=repeat)) / number * 1e6
+
+
+def run(number):
+    """运行全部用例，返回 {用例名: {'dict_us', 'template_us'}}"""
+    results = {}
+    for name, baseline, template in CASES:
+        # 校验两种方式生成的请求体语义一致
+        assert json.loads(baseline()) == json.loads(template()), name
+        results[name] = {
+            'dict_us': measure(baseline, number),
+            'template_us': measure(template, number),
+        }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="请求体构造微基准")
+    parser.add_argument("--number", type=int, default=20000, help="每轮调用次数")
+    args = parser.parse_args()
+
+    print(f"JSON后端: {payload_templates.JSON_BACKEND}")
+    print(f"{'用例':<18}{'dict+json.dumps':>18}{'模板':>12}{'节省':>10}")
+    for name, result in run(args.number).items():
+        saved = 1 - result['template_us'] / result['dict_us']
+        print(f"{name:<18}{result['dict_us']:>15.2f}µs{result['template_us']:>10.2f}µs{saved:>10.0%}")
+
+
+if __name__ == "__main__":
+    main()
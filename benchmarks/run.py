@@ -0,0 +1,139 @@
+"""
+运行全部基准并输出机器可读的结果，可与基线比较用于发现性能回退
+
+每个指标记录 value、unit 和 better（lower: 越小越好，如µs/次；higher: 越大越好，如req/CPU秒）。
+与基线比较时，指标向不利方向变化超过 --tolerance（默认10%）即视为回退，以退出码1结束；
+计数指标（如端到端的失败数）和基线为0的指标按绝对值比较，只要变差就是回退。
+基线与运行环境相关，请在同一台机器上生成（--save-baseline）后再比较，仓库中不提交基线文件。
+
+用法:
+    python -m benchmarks.run                                    # 运行并写入bench_results.json
+    python -m benchmarks.run --save-baseline                    # 把本次结果保存为基线
+    python -m benchmarks.run --baseline benchmarks/baseline.json --tolerance 0.15
+    python -m benchmarks.run --quick --skip-e2e                 # 快速检查，只运行微基准
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+
+# bench_e2e会导入locust并执行gevent monkey patch，需要最先导入
+from benchmarks import bench_e2e
+from benchmarks import bench_client, bench_generators, bench_payloads
+from config import jira_config
+
+DEFAULT_BASELINE = "benchmarks/baseline.json"
+
+
+def _metric(value, unit, better):
+    return {"value": round(value, 3), "unit": unit, "better": better}
+
+
+def collect(args):
+    """运行各基准，返回扁平化的 {指标名: 指标} 字典"""
+    scale = 10 if args.quick else 1
+    metrics = {}
+    for name, result in bench_payloads.run(20000 // scale).items():
+        metrics[f"payloads.{name}.dict"] = _metric(result["dict_us"], "us", "lower")
+        metrics[f"payloads.{name}.template"] = _metric(result["template_us"], "us", "lower")
+    for name, value in bench_client.run(5000 // scale).items():
+        metrics[f"client.{name}"] = _metric(value, "us", "lower")
+    for name, value in bench_generators.run(1000 // scale).items():
+        metrics[f"generators.{name}"] = _metric(value, "us", "lower")
+
+    if not args.skip_e2e:
+        duration = args.e2e_duration / 2 if args.quick else args.e2e_duration
+        result = bench_e2e.run(args.e2e_users, duration, args.e2e_user_class)
+        prefix = f"e2e.{args.e2e_user_class}.{jira_config.http_client}"
+        metrics[f"{prefix}.req_per_cpu_s"] = _metric(result["req_per_cpu_s"], "req/cpu-s", "higher")
+        metrics[f"{prefix}.rps"] = _metric(result["rps"], "req/s", "higher")
+        metrics[f"{prefix}.failures"] = _metric(result["failures"], "count", "lower")
+    return metrics
+
+
+def _worse_by(metric, base_value):
+    """当前值相对基线向不利方向变化的量，为正表示变差"""
+    diff = metric["value"] - base_value
+    return -diff if metric["better"] == "higher" else diff
+
+
+def compare(metrics, baseline, tolerance):
+    """
+    与基线比较
+
+    计数指标（unit为count，如失败数）比较绝对值，比基线变差即为回退；基线为0时无法计算比例，同样只要变差即为回退；
+    其余指标向不利方向变化的比例超过tolerance为回退。
+
+    Returns:
+        list: 回退的指标 (名称, 基线值, 当前值, 变化比例)，变化比例为正表示变差；按绝对值比较的指标变化比例为None
+    """
+    regressions = []
+    for name, metric in metrics.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        worse = _worse_by(metric, base["value"])
+        if metric["unit"] == "count" or not base["value"]:
+            if worse > 0:
+                regressions.append((name, base["value"], metric["value"], None))
+            continue
+        change = worse / base["value"]
+        if change > tolerance:
+            regressions.append((name, base["value"], metric["value"], change))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="运行负载生成器基准并与基线比较")
+    parser.add_argument("--output", default="bench_results.json", help="结果文件（JSON）")
+    parser.add_argument("--baseline", help="基线文件，指定时与之比较，出现回退以退出码1结束")
+    parser.add_argument("--save-baseline", nargs="?", const=DEFAULT_BASELINE, metavar="PATH",
+                        help=f"把本次结果保存为基线（默认 {DEFAULT_BASELINE}）")
+    parser.add_argument("--tolerance", type=float, default=0.1, help="允许的变差比例（默认0.1，即10%%）")
+    parser.add_argument("--skip-e2e", action="store_true", help="跳过端到端基准")
+    parser.add_argument("--e2e-users", type=int, default=10, help="端到端基准的并发用户数")
+    parser.add_argument("--e2e-duration", type=float, default=10.0, help="端到端基准的测量时长（秒）")
+    parser.add_argument("--e2e-user-class", default="JiraUser", help="端到端基准使用的用户类")
+    parser.add_argument("--quick", action="store_true", help="减少迭代次数与测量时长（结果波动更大）")
+    args = parser.parse_args()
+
+    metrics = collect(args)
+    results = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "http_client": jira_config.http_client,
+            "quick": args.quick,
+        },
+        "metrics": metrics,
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(results, f, ensure_ascii=False, indent=2)
+
+    width = max(len(name) for name in metrics)
+    for name, metric in metrics.items():
+        print(f"{name:<{width}} {metric['value']:>12.3f} {metric['unit']}")
+    print(f"结果已写入 {args.output}")
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"基线已保存到 {args.save_baseline}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)["metrics"]
+        regressions = compare(metrics, baseline, args.tolerance)
+        if regressions:
+            print(f"\n性能回退（超过 {args.tolerance:.0%}）:")
+            for name, base, value, change in regressions:
+                delta = f"{change:+.1%}" if change is not None else f"{value - base:+g}"
+                print(f"  {name}: {base:.3f} -> {value:.3f} ({delta})")
+            sys.exit(1)
+        print(f"与基线 {args.baseline} 相比没有超过 {args.tolerance:.0%} 的回退")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+"""
+每个worker进程一次性的启动阶段
+校验配置、获取并缓存项目元数据（issue类型、优先级、状态转换），供该进程内的全部虚拟用户共享，
+避免每个用户在on_start中重复校验配置、新建客户端并请求 /project/{key}
+"""
+import threading
+
+from config import jira_config
+from jira_utils import JiraAPIClient
+from log_utils import logger
+
+
+class ProjectMetadata:
+    """缓存的项目元数据"""
+
+    def __init__(self, client, project, issue_types, priorities, transitions):
+        self.client = client
+        self.project = project
+        self.issue_types = issue_types
+        self.priorities = priorities
+        # 状态转换名称 -> 转换ID，以及目标状态名称 -> 转换ID
+        self.transitions = transitions
+        self.transitions_to = {}
+        self._transition_lock = threading.Lock()
+        # 已经为其发现过转换的名称（发现后仍找不到时不再重复请求）
+        self._discovered_for = set()
+        self._discovery_lock = threading.Lock()
+
+    @property
+    def project_key(self):
+        return self.project.get('key', jira_config.project_key)
+
+    @property
+    def issue_type(self):
+        """创建issue时使用的类型：配置的默认类型在项目中不存在时回退到项目的第一个类型"""
+        if not self.issue_types or jira_config.default_issue_type in self.issue_types:
+            return jira_config.default_issue_type
+        return self.issue_types[0]
+
+    def transition_id(self, name):
+        """按转换名称或目标状态名称查找转换ID"""
+        return self.transitions.get(name) or self.transitions_to.get(name)
+
+    def find_transition(self, name, issue_key):
+        """
+        查找转换ID，缓存中没有时用指定issue发现一次
+
+        同一名称只发现一次；并发的调用方等待同一次发现完成后再查缓存
+
+        Returns:
+            str或None: 转换ID
+        """
+        transition_id = self.transition_id(name)
+        if transition_id is not None or name in self._discovered_for:
+            return transition_id
+        with self._discovery_lock:
+            if self.transition_id(name) is None and name not in self._discovered_for:
+                self.discover_transitions(issue_key)
+                self._discovered_for.add(name)
+        return self.transition_id(name)
+
+    def discover_transitions(self, issue_key):
+        """
+        通过指定issue发现可用的状态转换并合并进缓存
+
+        启动阶段项目中可能还没有issue，此时由第一个拿到issue的调用方补充
+        """
+        with self._transition_lock:
+            response = self.client.get_transitions(issue_key)
+            if response.status_code != 200:
+                logger.warning("bootstrap.transitions_failed", "获取状态转换失败: {status_code}",
+                               status_code=response.status_code)
+                return self.transitions
+            for transition in response.json().get('transitions', []):
+                self.transitions.setdefault(transition['name'], transition['id'])
+                target = (transition.get('to') or {}).get('name')
+                if target:
+                    self.transitions_to.setdefault(target, transition['id'])
+            return self.transitions
+
+
+class WorkerBootstrap:
+    """进程级启动缓存：第一个调用get()的用户执行启动，其余用户等待并复用结果"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._metadata = None
+        self._error = None
+
+    def get(self):
+        """返回缓存的项目元数据；启动失败时每次都抛出同一个异常，不再重复请求Jira"""
+        if self._metadata is not None:
+            return self._metadata
+        with self._lock:
+            if self._metadata is None and self._error is None:
+                try:
+                    self._metadata = self._run()
+                except Exception as e:
+                    self._error = e
+                    logger.error("bootstrap.error", "启动阶段失败: {error}", error=str(e))
+            if self._error is not None:
+                raise self._error
+            return self._metadata
+
+    def reset(self):
+        """丢弃缓存（例如目标Jira或配置发生变化后）"""
+        with self._lock:
+            self._metadata = None
+            self._error = None
+
+    def _run(self):
+        jira_config.validate_config()
+        client = JiraAPIClient()
+
+        response = client.get_project_info()
+        if response.status_code != 200:
+            raise Exception(f"无法连接到项目 {jira_config.project_key}: {response.status_code}")
+        project = response.json()
+        issue_types = [issue_type['name'] for issue_type in project.get('issueTypes', [])]
+
+        if issue_types and jira_config.default_issue_type not in issue_types:
+            logger.warning("bootstrap.issue_type_missing", "项目中不存在issue类型 {issue_type}，改用 {fallback}",
+                           issue_type=jira_config.default_issue_type, fallback=issue_types[0])
+
+        priorities = []
+        response = client.get_priorities()
+        if response.status_code == 200:
+            priorities = [priority['name'] for priority in response.json()]
+        else:
+            logger.warning("bootstrap.priorities_failed", "获取优先级列表失败: {status_code}",
+                           status_code=response.status_code)
+
+        metadata = ProjectMetadata(client, project, issue_types, priorities, {})
+
+        # 用项目中最近的一个issue发现状态转换
+        response = client.search_issues(
+            jql=f"project = {jira_config.project_key} ORDER BY created DESC",
+            max_results=1
+        )
+        if response.status_code == 200:
+            issues = response.json().get('issues', [])
+            if issues:
+                metadata.discover_transitions(issues[0]['key'])
+
+        logger.info("bootstrap.completed", "启动完成，项目 {project_key}: {issue_types} 个issue类型、"
+                    "{priorities} 个优先级、{transitions} 个状态转换",
+                    project_key=metadata.project_key, issue_types=len(issue_types),
+                    priorities=len(priorities), transitions=len(metadata.transitions))
+        return metadata
+
+
+# 进程级启动缓存
+worker_bootstrap = WorkerBootstrap()
@@ -0,0 +1,168 @@
+"""
+容量搜索
+按SLO（p95响应时间、错误率）自动寻找Jira的拐点，不再手动用不同的 -u 反复运行。
+每个探测点保持固定用户数，待用户启动完成并预热后测量一个时间窗口:
+
+    1. 指数阶段: 从start_users开始，满足SLO时用户数乘以growth，直到不满足或达到max_users
+    2. 二分阶段: 在最后一个满足与第一个不满足的用户数之间二分，区间小于precision时结束
+
+测量基于Locust累计统计的差值（不重置统计），只统计真实HTTP请求（GET/POST/PUT/DELETE），
+THROTTLE、SCAN等派生统计不计入。结束时报告满足SLO的最高吞吐及沿途测得的延迟曲线。
+由load_shapes.CapacitySearchShape驱动（LOAD_SHAPE=capacity）。
+"""
+import csv
+import sys
+from collections import namedtuple
+
+from locust.stats import calculate_response_time_percentile, diff_response_time_dicts
+
+# 参与测量的请求类型（派生统计的QUEUED、BULK、SCAN、THROTTLE、TXN等类型不计入）
+MEASURED_REQUEST_TYPES = ("GET", "POST", "PUT", "DELETE")
+
+# 一次探测的结果
+Probe = namedtuple("Probe", ["users", "duration", "requests", "failures", "rps", "p50_ms", "p95_ms", "p99_ms",
+                             "error_rate", "passed"])
+
+# 统计快照: 合并后的响应时间分布、请求数、失败数
+Snapshot = namedtuple("Snapshot", ["response_times", "requests", "failures"])
+
+CSV_HEADER = ["Users", "Duration (s)", "Requests", "Failures", "RPS", "p50 (ms)", "p95 (ms)", "p99 (ms)",
+              "Error Rate", "Meets SLO"]
+
+
+class Slo:
+    """服务等级目标: p95响应时间（毫秒）与错误率上限"""
+
+    def __init__(self, p95_ms, error_rate):
+        self.p95_ms = p95_ms
+        self.error_rate = error_rate
+
+    def met(self, p95_ms, error_rate):
+        return p95_ms <= self.p95_ms and error_rate <= self.error_rate
+
+    def __str__(self):
+        return f"p95 <= {self.p95_ms:g}ms，错误率 <= {self.error_rate:.2%}"
+
+
+def snapshot(stats):
+    """合并所有真实HTTP请求条目的累计统计"""
+    response_times = {}
+    requests = failures = 0
+    for entry in stats.entries.values():
+        if entry.method not in MEASURED_REQUEST_TYPES:
+            continue
+        requests += entry.num_requests
+        failures += entry.num_failures
+        for bucket, count in entry.response_times.items():
+            response_times[bucket] = response_times.get(bucket, 0) + count
+    return Snapshot(response_times, requests, failures)
+
+
+def measure(start, end, users, duration, slo):
+    """由窗口起止的两个快照计算一次探测的结果"""
+    requests = end.requests - start.requests
+    failures = end.failures - start.failures
+    response_times = diff_response_time_dicts(end.response_times, start.response_times)
+    # response_times只记录成功与失败请求的耗时，总数与requests一致
+    total = sum(response_times.values())
+
+    def percentile(percent):
+        return int(calculate_response_time_percentile(response_times, total, percent)) if total else 0
+
+    p95_ms = percentile(0.95)
+    error_rate = failures / requests if requests else 1.0
+    return Probe(
+        users=users,
+        duration=duration,
+        requests=requests,
+        failures=failures,
+        rps=requests / duration if duration else 0.0,
+        p50_ms=percentile(0.5),
+        p95_ms=p95_ms,
+        p99_ms=percentile(0.99),
+        error_rate=error_rate,
+        passed=bool(requests) and slo.met(p95_ms, error_rate),
+    )
+
+
+class CapacitySearch:
+    """决定下一个探测的用户数（指数扩大后二分）"""
+
+    def __init__(self, start_users, max_users, precision=5, growth=2.0):
+        if not 1 <= start_users <= max_users:
+            raise ValueError("容量搜索需要满足 1 <= start_users <= max_users")
+        if growth <= 1:
+            raise ValueError("容量搜索的growth必须大于1")
+        self.max_users = max_users
+        self.precision = max(int(precision), 1)
+        self.growth = growth
+        self.probes = []
+        # 已知满足SLO的最大用户数与已知不满足的最小用户数
+        self.low = 0
+        self.high = None
+        self.users = start_users
+
+    @property
+    def done(self):
+        return self.users is None
+
+    def record(self, probe):
+        """
+        记录一次探测并选出下一个用户数
+
+        Returns:
+            int或None: 下一个探测的用户数，搜索结束时为None
+        """
+        self.probes.append(probe)
+        if probe.passed:
+            self.low = max(self.low, probe.users)
+        else:
+            self.high = probe.users if self.high is None else min(self.high, probe.users)
+
+        if self.high is None:
+            # 指数阶段：到达max_users仍满足SLO时结束
+            if probe.users >= self.max_users:
+                self.users = None
+            else:
+                self.users = min(max(int(probe.users * self.growth), probe.users + 1), self.max_users)
+        elif self.high - self.low <= self.precision:
+            self.users = None
+        else:
+            self.users = (self.low + self.high) // 2
+        return self.users
+
+    def best(self):
+        """满足SLO的探测中吞吐最高的一次，没有时返回None"""
+        passed = [probe for probe in self.probes if probe.passed]
+        return max(passed, key=lambda probe: probe.rps) if passed else None
+
+    def curve(self):
+        """按用户数排序的探测结果（即测得的延迟曲线）"""
+        return sorted(self.probes, key=lambda probe: (probe.users, probe.duration))
+
+
+def print_report(search, slo, out=sys.stdout):
+    """打印延迟曲线与容量结论"""
+    out.write(f"容量搜索（SLO: {slo}）\n")
+    out.write(f"{'Users':>8} {'RPS':>10} {'p50':>8} {'p95':>8} {'p99':>8} {'Errors':>8} {'Requests':>10}  SLO\n")
+    for probe in search.curve():
+        out.write(f"{probe.users:>8} {probe.rps:>10.1f} {probe.p50_ms:>8} {probe.p95_ms:>8} {probe.p99_ms:>8} "
+                  f"{probe.error_rate:>8.2%} {probe.requests:>10}  {'✓' if probe.passed else '✗'}\n")
+    best = search.best()
+    if best is None:
+        out.write("没有满足SLO的探测点，请降低start_users或放宽SLO\n")
+    else:
+        limit = "（已达max_users上限）" if search.high is None and best.users >= search.max_users else ""
+        out.write(f"满足SLO的最高吞吐: {best.rps:.1f} req/s（{best.users} 个用户，p95 {best.p95_ms}ms，"
+                  f"错误率 {best.error_rate:.2%}）{limit}\n")
+        if search.high is not None:
+            out.write(f"拐点位于 {search.low} 到 {search.high} 个用户之间\n")
+    out.flush()
+
+
+def write_csv(search, out):
+    writer = csv.writer(out)
+    writer.writerow(CSV_HEADER)
+    for probe in search.curve():
+        writer.writerow([probe.users, f"{probe.duration:.1f}", probe.requests, probe.failures, f"{probe.rps:.2f}",
+                         probe.p50_ms, probe.p95_ms, probe.p99_ms, f"{probe.error_rate:.4f}", probe.passed])
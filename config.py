@@ -1,54 +1,199 @@
-"""
-Jira性能测试配置管理
-"""
-import os
-from decouple import config
-
-class JiraConfig:
-    """Jira配置类"""
-    
-    def __init__(self):
-        # Jira服务器配置
-        self.base_url = config('JIRA_BASE_URL', default='https://your-domain.atlassian.net')
-        self.api_url = f"{self.base_url}/rest/api/2"
-        
-        # 认证配置
-        self.username = config('JIRA_USERNAME', default='')
-        self.api_token = config('JIRA_API_TOKEN', default='')
-        self.password = config('JIRA_PASSWORD', default='')
-        
-        # 项目配置
-        self.project_key = config('PROJECT_KEY', default='TEST')
-        self.default_issue_type = config('DEFAULT_ISSUE_TYPE', default='Task')
-        
-        # 性能测试配置
-        self.max_wait_time = config('MAX_WAIT_TIME', default=5, cast=int)
-        self.min_wait_time = config('MIN_WAIT_TIME', default=1, cast=int)
-        
-    def get_auth(self):
-        """获取认证信息"""
-        if self.api_token:
-            return (self.username, self.api_token)
-        elif self.password:
-            return (self.username, self.password)
-        else:
-            raise ValueError("必须提供API Token或密码进行认证")
-    
-    def validate_config(self):
-        """验证配置是否完整"""
-        if not self.base_url or self.base_url == 'https://your-domain.atlassian.net':
-            raise ValueError("请在.env文件中设置正确的JIRA_BASE_URL")
-        
-        if not self.username:
-            raise ValueError("请在.env文件中设置JIRA_USERNAME")
-        
-        if not self.api_token and not self.password:
-            raise ValueError("请在.env文件中设置JIRA_API_TOKEN或JIRA_PASSWORD")
-        
-        if not self.project_key or self.project_key == 'TEST':
-            print("警告: 使用默认项目KEY 'TEST'，建议设置PROJECT_KEY")
-        
-        return True
-
-# 全局配置实例
+"""
+Jira性能测试配置管理
+"""
+import os
+from decouple import config
+
+class JiraConfig:
+    """Jira配置类"""
+    
+    def __init__(self):
+        # Jira服务器配置
+        self.base_url = config('JIRA_BASE_URL', default='https://your-domain.atlassian.net')
+        self.api_url = f"{self.base_url}/rest/api/2"
+        
+        # 认证配置
+        self.username = config('JIRA_USERNAME', default='')
+        self.api_token = config('JIRA_API_TOKEN', default='')
+        self.password = config('JIRA_PASSWORD', default='')
+        
+        # 虚拟用户的多身份凭据文件（CSV: username,secret，为空时所有用户使用上面的账号）、身份分配策略（round_robin/sticky）
+        self.credentials_file = config('CREDENTIALS_FILE', default='')
+        self.credential_assignment = config('CREDENTIAL_ASSIGNMENT', default='round_robin').lower()
+        
+        # 项目配置
+        self.project_key = config('PROJECT_KEY', default='TEST')
+        self.default_issue_type = config('DEFAULT_ISSUE_TYPE', default='Task')
+        
+        # 性能测试配置
+        self.max_wait_time = config('MAX_WAIT_TIME', default=5, cast=int)
+        self.min_wait_time = config('MIN_WAIT_TIME', default=1, cast=int)
+        
+        # 负载模型: closed（封闭模型，按等待时间循环执行任务）、open（开放模型，按到达率发起操作）或 replay（回放访问日志）
+        self.load_model = config('LOAD_MODEL', default='closed').lower()
+        # 开放模型下每个用户各类操作的到达率（每秒次数）、到达间隔分布、开放模型/回放模式下每个用户的最大并发操作数
+        self.arrival_rates = config('ARRIVAL_RATES', default='create_issue=5,add_comment_to_existing_issue=3,get_issue_details=2,search_issues=1,update_issue_description=1')
+        self.arrival_distribution = config('ARRIVAL_DISTRIBUTION', default='poisson').lower()
+        self.arrival_max_inflight = config('ARRIVAL_MAX_INFLIGHT', default=100, cast=int)
+        
+        # 回放模式: 录制的请求日志路径（JSON Lines或Jira访问日志，支持.gz）、时间缩放倍数（0为不等待）、读完后是否从头循环
+        self.replay_log = config('REPLAY_LOG', default='')
+        self.replay_speed = config('REPLAY_SPEED', default=1.0, cast=float)
+        self.replay_loop = config('REPLAY_LOOP', default=False, cast=bool)
+        
+        # 负载曲线: step、spike、soak、diurnal、capacity（为空则使用命令行的 --users/--spawn-rate）、曲线参数、默认启动速率
+        self.load_shape = config('LOAD_SHAPE', default='').lower()
+        self.shape_params = config('SHAPE_PARAMS', default='')
+        self.shape_spawn_rate = config('SHAPE_SPAWN_RATE', default=10.0, cast=float)
+        # 容量搜索（LOAD_SHAPE=capacity）测得的延迟曲线CSV导出路径
+        self.capacity_csv_path = config('CAPACITY_CSV_PATH', default='')
+        
+        # HTTP客户端实现: requests (HttpUser) 或 fast (FastHttpUser/geventhttpclient)
+        self.http_client = config('HTTP_CLIENT', default='requests').lower()
+        
+        # SOC分析师用户: 是否参与调度（默认不参与，避免改变已有运行的流量组合）、
+        # 事件依次转换到的状态（转换名称或目标状态名称，最后一个为解决）、分配给的分析师（为空时使用用户的身份）
+        self.analyst_users = config('ANALYST_USERS', default=False, cast=bool)
+        self.analyst_workflow = config('ANALYST_WORKFLOW', default='Investigating,Contained,Resolved')
+        self.analyst_assignee = config('ANALYST_ASSIGNEE', default='')
+        
+        # 共享issue key池配置
+        self.issue_pool_capacity = config('ISSUE_POOL_CAPACITY', default=10000, cast=int)
+        self.issue_pool_shared = config('ISSUE_POOL_SHARED', default=False, cast=bool)
+        
+        # 预生成测试数据语料库路径（为空时使用实时Faker生成）
+        self.data_corpus_path = config('DATA_CORPUS_PATH', default='')
+        
+        # 搜索任务的JQL负载模型文件（带权重的参数化查询模板，为空时使用内置的固定查询）
+        self.jql_workload_path = config('JQL_WORKLOAD_PATH', default='')
+        
+        # 响应解析方式: full（完整json解析）或 lazy（只提取需要的字段，只关心状态码的请求不缓冲响应体）
+        self.response_parsing = config('RESPONSE_PARSING', default='full').lower()
+        
+        # 请求体JSON序列化后端: auto (优先orjson) / orjson / json
+        self.json_backend = config('JSON_BACKEND', default='auto').lower()
+        
+        # 日志配置: 级别 (DEBUG/INFO/WARNING/ERROR/OFF)、按事件的采样率、输出目标
+        self.log_level = config('LOG_LEVEL', default='INFO').upper()
+        self.log_sample_rates = config('LOG_SAMPLE_RATES', default='')
+        self.log_default_sample_rate = config('LOG_DEFAULT_SAMPLE_RATE', default=1.0, cast=float)
+        self.log_console = config('LOG_CONSOLE', default=True, cast=bool)
+        self.log_jsonl_path = config('LOG_JSONL_PATH', default='')
+        self.log_flush_interval = config('LOG_FLUSH_INTERVAL', default=1.0, cast=float)
+        
+        # JiraAPIClient配置: 进程内共享连接池大小、是否向Locust上报请求统计
+        self.api_pool_size = config('API_POOL_SIZE', default=20, cast=int)
+        self.api_report_stats = config('API_REPORT_STATS', default=True, cast=bool)
+        
+        # SOCTestScenarios批量场景的最大并发调用数（1为顺序执行）
+        self.scenario_concurrency = config('SCENARIO_CONCURRENCY', default=1, cast=int)
+        
+        # 批量创建: 服务端单次请求允许的最大issue数（超过时自动分片）、批量任务每次创建的issue数
+        self.bulk_create_max_issues = config('BULK_CREATE_MAX_ISSUES', default=50, cast=int)
+        self.bulk_create_batch_size = config('BULK_CREATE_BATCH_SIZE', default=20, cast=int)
+        
+        # 深度分页导出: 每页issue数、每次导出最多遍历的issue数、导出端写出一页的耗时（毫秒）、处理当前页时是否预取下一页
+        self.export_page_size = config('EXPORT_PAGE_SIZE', default=100, cast=int)
+        self.export_max_issues = config('EXPORT_MAX_ISSUES', default=1000, cast=int)
+        self.export_process_ms = config('EXPORT_PROCESS_MS', default=10.0, cast=float)
+        self.search_prefetch = config('SEARCH_PREFETCH', default=True, cast=bool)
+        
+        # HDR直方图: 是否启用、有效位数、可记录的最大响应时间（毫秒）、分位数表CSV导出路径
+        self.hdr_enabled = config('HDR_ENABLED', default=True, cast=bool)
+        self.hdr_significant_digits = config('HDR_SIGNIFICANT_DIGITS', default=3, cast=int)
+        self.hdr_max_latency_ms = config('HDR_MAX_LATENCY_MS', default=3600000, cast=int)
+        self.hdr_csv_path = config('HDR_CSV_PATH', default='')
+        
+        # 限流处理: 是否用共享令牌桶控制每个worker的发送速率（AIMD）、初始/最低/最高速率（次/秒）、
+        # 速率成为瓶颈时每秒增加的速率、收到429时的降速系数、令牌桶容量、
+        # 缺少Retry-After时的等待秒数、Retry-After的上限（秒）、JiraAPIClient收到429后的最大重试次数
+        self.rate_limit_pacing = config('RATE_LIMIT_PACING', default=False, cast=bool)
+        self.rate_limit_initial_rps = config('RATE_LIMIT_INITIAL_RPS', default=10.0, cast=float)
+        self.rate_limit_min_rps = config('RATE_LIMIT_MIN_RPS', default=0.5, cast=float)
+        self.rate_limit_max_rps = config('RATE_LIMIT_MAX_RPS', default=100.0, cast=float)
+        self.rate_limit_increase = config('RATE_LIMIT_INCREASE', default=1.0, cast=float)
+        self.rate_limit_decrease = config('RATE_LIMIT_DECREASE', default=0.5, cast=float)
+        self.rate_limit_burst = config('RATE_LIMIT_BURST', default=5, cast=int)
+        self.rate_limit_default_retry_after = config('RATE_LIMIT_DEFAULT_RETRY_AFTER', default=1.0, cast=float)
+        self.rate_limit_max_retry_after = config('RATE_LIMIT_MAX_RETRY_AFTER', default=60.0, cast=float)
+        self.rate_limit_max_retries = config('RATE_LIMIT_MAX_RETRIES', default=2, cast=int)
+        
+        # 负载生成器饱和检测: 是否启用、采样间隔（秒）、事件循环延迟阈值（毫秒）、CPU阈值（%）、
+        # 允许超过阈值的采样比例、饱和时是否以非0退出码结束、采样时间序列CSV导出路径
+        self.saturation_monitor = config('SATURATION_MONITOR', default=True, cast=bool)
+        self.saturation_interval = config('SATURATION_INTERVAL', default=1.0, cast=float)
+        self.saturation_lag_ms = config('SATURATION_LAG_MS', default=50.0, cast=float)
+        self.saturation_cpu_percent = config('SATURATION_CPU_PERCENT', default=90.0, cast=float)
+        self.saturation_tolerance = config('SATURATION_TOLERANCE', default=0.05, cast=float)
+        self.saturation_fail = config('SATURATION_FAIL', default=False, cast=bool)
+        self.saturation_csv_path = config('SATURATION_CSV_PATH', default='')
+        
+    def get_auth(self):
+        """获取认证信息"""
+        if self.api_token:
+            return (self.username, self.api_token)
+        elif self.password:
+            return (self.username, self.password)
+        else:
+            raise ValueError("必须提供API Token或密码进行认证")
+    
+    def validate_config(self):
+        """验证配置是否完整"""
+        if not self.base_url or self.base_url == 'https://your-domain.atlassian.net':
+            raise ValueError("请在.env文件中设置正确的JIRA_BASE_URL")
+        
+        if not self.username:
+            raise ValueError("请在.env文件中设置JIRA_USERNAME")
+        
+        if not self.api_token and not self.password:
+            raise ValueError("请在.env文件中设置JIRA_API_TOKEN或JIRA_PASSWORD")
+        
+        if self.log_level not in ('DEBUG', 'INFO', 'WARNING', 'ERROR', 'OFF'):
+            raise ValueError("LOG_LEVEL必须为 DEBUG、INFO、WARNING、ERROR 或 OFF")
+        
+        if self.credential_assignment not in ('round_robin', 'sticky'):
+            raise ValueError("CREDENTIAL_ASSIGNMENT必须为 round_robin 或 sticky")
+        
+        if not [status for status in self.analyst_workflow.split(',') if status.strip()]:
+            raise ValueError("ANALYST_WORKFLOW至少需要一个状态")
+        
+        if self.http_client not in ('requests', 'fast'):
+            raise ValueError("HTTP_CLIENT必须为 requests 或 fast")
+        
+        if self.response_parsing not in ('full', 'lazy'):
+            raise ValueError("RESPONSE_PARSING必须为 full 或 lazy")
+        
+        if self.load_model not in ('closed', 'open', 'replay'):
+            raise ValueError("LOAD_MODEL必须为 closed、open 或 replay")
+        
+        if self.load_model == 'replay' and not self.replay_log:
+            raise ValueError("LOAD_MODEL=replay 时必须设置REPLAY_LOG")
+        
+        if self.arrival_distribution not in ('poisson', 'constant'):
+            raise ValueError("ARRIVAL_DISTRIBUTION必须为 poisson 或 constant")
+        
+        if self.load_shape not in ('', 'step', 'spike', 'soak', 'diurnal', 'capacity'):
+            raise ValueError("LOAD_SHAPE必须为 step、spike、soak、diurnal 或 capacity")
+        
+        if self.bulk_create_max_issues < 1 or self.bulk_create_batch_size < 1:
+            raise ValueError("BULK_CREATE_MAX_ISSUES和BULK_CREATE_BATCH_SIZE必须大于0")
+        
+        if self.export_page_size < 1 or self.export_max_issues < 1:
+            raise ValueError("EXPORT_PAGE_SIZE和EXPORT_MAX_ISSUES必须大于0")
+        
+        if self.export_process_ms < 0:
+            raise ValueError("EXPORT_PROCESS_MS不能为负数")
+        
+        if not 1 <= self.hdr_significant_digits <= 5:
+            raise ValueError("HDR_SIGNIFICANT_DIGITS必须在1到5之间")
+        
+        if self.saturation_interval <= 0:
+            raise ValueError("SATURATION_INTERVAL必须大于0")
+        
+        if not self.project_key or self.project_key == 'TEST':
+            print("警告: 使用默认项目KEY 'TEST'，建议设置PROJECT_KEY")
+        
+        return True
+
+# 全局配置实例
 jira_config = JiraConfig()
\ No newline at end of file
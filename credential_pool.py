@@ -0,0 +1,154 @@
+"""
+多身份凭据池
+所有虚拟用户共用JIRA_USERNAME一个账号时，Jira按用户的限流和会话缓存会让结果失真（一个账号的限流被所有用户共享，
+服务端只维护一个用户的权限/会话缓存）。配置CREDENTIALS_FILE后，虚拟用户从凭据文件中按分配策略领取身份:
+
+    round_robin: 所有worker交错轮询全部身份（worker w上第k个用户使用第 k*worker数+w 个身份），各身份的用户数尽量均衡
+    sticky:      身份按序号分给各worker（第i个身份只属于worker i % worker数），worker内轮询；
+                 同一身份只出现在一个worker上，其会话cookie和限流计数不会被多个进程分摊
+
+每个身份只计算一次Authorization头，同一身份的所有用户共享一个cookie jar（复用Jira的JSESSIONID），
+需要JiraAPIClient时按身份缓存一个会话。JIRA_USERNAME等全局凭据仍用于worker启动阶段读取项目元数据。
+
+凭据文件格式（CSV，# 开头为注释，可选表头 username,secret）:
+    soc.analyst01,api-token-1
+    soc.analyst02,api-token-2
+"""
+import csv
+from base64 import b64encode
+
+from gevent.lock import Semaphore
+from locust.runners import WorkerRunner
+from requests.cookies import RequestsCookieJar
+
+from config import jira_config
+from log_utils import logger
+
+ASSIGNMENT_MODES = ("round_robin", "sticky")
+
+
+class Credential:
+    """一个Jira身份：认证信息、预先编码的Authorization头以及该身份共享的会话状态"""
+
+    def __init__(self, username, secret, share_session=True):
+        self.username = username
+        self.auth = (username, secret)
+        self.auth_header = "Basic " + b64encode(f"{username}:{secret}".encode('latin1')).decode('ascii')
+        # 同一身份的用户共享cookie（requests与geventhttpclient都接受http.cookiejar.CookieJar）
+        self.cookies = RequestsCookieJar() if share_session else None
+        self.users = 0
+        self._api_client = None
+
+    def api_client(self):
+        """该身份的JiraAPIClient（首次调用时创建，之后复用同一个会话和连接池）"""
+        if self._api_client is None:
+            from jira_utils import JiraAPIClient, create_session
+            self._api_client = JiraAPIClient(session=create_session(auth=self.auth))
+        return self._api_client
+
+    def __repr__(self):
+        return f"Credential({self.username!r})"
+
+
+def load_credentials(path):
+    """
+    读取凭据文件
+
+    Returns:
+        list: Credential列表（按文件中的顺序）
+    """
+    credentials = []
+    with open(path, newline='', encoding='utf-8') as f:
+        for line_number, row in enumerate(csv.reader(f), 1):
+            row = [field.strip() for field in row]
+            if not row or not row[0] or row[0].startswith('#'):
+                continue
+            if line_number == 1 and row[0].lower() == 'username':
+                continue
+            if len(row) < 2 or not row[1]:
+                raise ValueError(f"凭据文件 {path} 第{line_number}行格式错误，应为 username,secret")
+            credentials.append(Credential(row[0], row[1]))
+    if not credentials:
+        raise ValueError(f"凭据文件中没有可用的身份: {path}")
+    return credentials
+
+
+class CredentialPool:
+    """按分配策略把身份分给本进程的虚拟用户"""
+
+    def __init__(self, credentials, assignment="round_robin", worker_index=0, worker_count=1):
+        if assignment not in ASSIGNMENT_MODES:
+            raise ValueError(f"CREDENTIAL_ASSIGNMENT必须为: {', '.join(ASSIGNMENT_MODES)}")
+        self.assignment = assignment
+        self.worker_index = worker_index
+        self.worker_count = max(worker_count, 1)
+        self.credentials = credentials
+        if assignment == "sticky":
+            self._own = credentials[worker_index::self.worker_count]
+            if not self._own:
+                raise ValueError(f"sticky分配需要至少{self.worker_count}个身份，凭据文件中只有{len(credentials)}个")
+        self._next = 0
+        self._lock = Semaphore()
+
+    def acquire(self):
+        """为一个新用户领取身份"""
+        with self._lock:
+            seq, self._next = self._next, self._next + 1
+        if self.assignment == "sticky":
+            credential = self._own[seq % len(self._own)]
+        else:
+            credential = self.credentials[(seq * self.worker_count + self.worker_index) % len(self.credentials)]
+        credential.users += 1
+        return credential
+
+    def release(self, credential):
+        credential.users -= 1
+
+    def usage(self):
+        """当前使用中的身份及其用户数"""
+        return {credential.username: credential.users for credential in self.credentials if credential.users}
+
+
+_process_pool = None
+_default_credential = None
+
+
+def get_process_pool(environment):
+    """
+    返回本进程的凭据池，未配置CREDENTIALS_FILE时返回None
+
+    worker数取master的 --expect-workers，worker序号为worker_index；单机运行时使用全部身份
+    """
+    global _process_pool
+    if _process_pool is None and jira_config.credentials_file:
+        runner = environment.runner
+        worker_index, worker_count = 0, 1
+        if isinstance(runner, WorkerRunner):
+            options = environment.parsed_options
+            worker_count = getattr(options, 'expect_workers', 1) or 1
+            worker_index = max(runner.worker_index, 0) % worker_count
+        _process_pool = CredentialPool(load_credentials(jira_config.credentials_file),
+                                       jira_config.credential_assignment, worker_index, worker_count)
+        logger.info("credentials.loaded", "凭据池: {count} 个身份，分配策略 {assignment}",
+                    count=len(_process_pool.credentials), assignment=_process_pool.assignment)
+    return _process_pool
+
+
+def default_credential():
+    """全局凭据（JIRA_USERNAME），各用户只共享预先编码的Authorization头，不共享cookie"""
+    global _default_credential
+    if _default_credential is None:
+        _default_credential = Credential(*jira_config.get_auth(), share_session=False)
+    return _default_credential
+
+
+def acquire_credential(environment):
+    """为虚拟用户领取身份：配置了凭据池时按分配策略领取，否则使用全局凭据"""
+    pool = get_process_pool(environment)
+    return pool.acquire() if pool is not None else default_credential()
+
+
+def release_credential(environment, credential):
+    pool = get_process_pool(environment)
+    if pool is not None and credential is not None:
+        pool.release(credential)
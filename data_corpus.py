@@ -0,0 +1,173 @@
+"""
+预生成测试数据语料库
+一次性用Faker生成标题、描述、处理记录、IOC和Wazuh告警并写入紧凑的二进制文件，
+worker通过mmap映射该文件并以O(1)随机采样，请求路径上不再调用Faker
+
+用法:
+    python data_corpus.py --output soc_corpus.bin --size 20000
+    然后在 .env 中设置 DATA_CORPUS_PATH=soc_corpus.bin
+
+文件格式（小端）:
+    头部      MAGIC(8s) 段数量(I)
+    段表      段名(16s) 条目数(I) 索引偏移(Q)  × 段数量
+    每个段    (条目数+1)个Q类型的数据偏移，随后是UTF-8编码的条目内容
+"""
+import argparse
+import json
+import mmap
+import random
+import struct
+import time
+
+MAGIC = b"SOCCORP1"
+HEADER = struct.Struct("<8sI")
+SECTION = struct.Struct("<16sIQ")
+OFFSET = struct.Struct("<Q")
+OFFSET_PAIR = struct.Struct("<QQ")
+
+SECTIONS = ("summaries", "descriptions", "comments", "iocs", "wazuh_alerts")
+
+
+class DataCorpus:
+    """只读的内存映射语料库"""
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, "rb")
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._sections = self._read_section_table()
+
+    def _read_section_table(self):
+        magic, section_count = HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{self.path} 不是有效的语料库文件")
+
+        sections = {}
+        position = HEADER.size
+        for _ in range(section_count):
+            raw_name, count, index_offset = SECTION.unpack_from(self._mm, position)
+            position += SECTION.size
+            if count:
+                sections[raw_name.rstrip(b"\0").decode("ascii")] = (count, index_offset)
+        return sections
+
+    def __contains__(self, section):
+        return section in self._sections
+
+    def count(self, section):
+        return self._sections[section][0]
+
+    def get(self, section, index):
+        """读取指定段的第index条数据"""
+        count, index_offset = self._sections[section]
+        if not 0 <= index < count:
+            raise IndexError(f"{section} 索引越界: {index}")
+        start, end = OFFSET_PAIR.unpack_from(self._mm, index_offset + index * OFFSET.size)
+        return self._mm[start:end].decode("utf-8")
+
+    def sample(self, section):
+        """从指定段随机采样一条数据"""
+        count, index_offset = self._sections[section]
+        start, end = OFFSET_PAIR.unpack_from(self._mm, index_offset + random.randrange(count) * OFFSET.size)
+        return self._mm[start:end].decode("utf-8")
+
+    def close(self):
+        self._mm.close()
+        self._file.close()
+
+
+class CorpusDataGenerator:
+    """与SecurityDataGenerator接口一致、基于语料库采样的数据生成器"""
+
+    def __init__(self, corpus):
+        missing = [section for section in SECTIONS if section not in corpus]
+        if missing:
+            raise ValueError(f"语料库缺少数据段: {', '.join(missing)}")
+        self.corpus = corpus
+
+    def generate_security_incident_summary(self):
+        return self.corpus.sample("summaries")
+
+    def generate_security_incident_description(self):
+        return self.corpus.sample("descriptions")
+
+    def generate_security_comment(self):
+        return self.corpus.sample("comments")
+
+    def generate_ioc(self):
+        return self.corpus.sample("iocs")
+
+    def generate_wazuh_alert_data(self):
+        # 每次返回新的字典，调用方可以安全修改
+        return json.loads(self.corpus.sample("wazuh_alerts"))
+
+
+def build_corpus(path, size, generator):
+    """
+    生成语料库文件
+
+    Args:
+        path: 输出文件路径
+        size: 每个数据段的条目数
+        generator: 实时数据生成器（SecurityDataGenerator）
+
+    Returns:
+        dict: 每个数据段的条目数
+    """
+    producers = {
+        "summaries": generator.generate_security_incident_summary,
+        "descriptions": generator.generate_security_incident_description,
+        "comments": generator.generate_security_comment,
+        "iocs": generator.generate_ioc,
+        "wazuh_alerts": lambda: json.dumps(generator.generate_wazuh_alert_data(), separators=(",", ":")),
+    }
+
+    encoded = {name: [producers[name]().encode("utf-8") for _ in range(size)] for name in SECTIONS}
+
+    # 先计算各段索引位置，再一次性顺序写出
+    position = HEADER.size + SECTION.size * len(SECTIONS)
+    layout = []
+    for name in SECTIONS:
+        items = encoded[name]
+        index_offset = position
+        data_offset = index_offset + OFFSET.size * (len(items) + 1)
+        offsets = [data_offset]
+        for item in items:
+            offsets.append(offsets[-1] + len(item))
+        layout.append((name, index_offset, offsets))
+        position = offsets[-1]
+
+    with open(path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, len(SECTIONS)))
+        for name, index_offset, offsets in layout:
+            f.write(SECTION.pack(name.encode("ascii"), len(offsets) - 1, index_offset))
+        for name, index_offset, offsets in layout:
+            f.write(struct.pack(f"<{len(offsets)}Q", *offsets))
+            f.write(b"".join(encoded[name]))
+
+    return {name: len(encoded[name]) for name in SECTIONS}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="生成SOC测试数据语料库")
+    parser.add_argument("--output", default="soc_corpus.bin", help="输出文件路径")
+    parser.add_argument("--size", type=int, default=10000, help="每个数据段的条目数")
+    parser.add_argument("--seed", type=int, help="Faker随机种子（用于生成可复现的语料库）")
+    args = parser.parse_args()
+
+    from jira_utils import SecurityDataGenerator, fake
+
+    if args.seed is not None:
+        fake.seed_instance(args.seed)
+
+    start = time.time()
+    counts = build_corpus(args.output, args.size, SecurityDataGenerator)
+    elapsed = time.time() - start
+
+    print(f"✓ 语料库已生成: {args.output} ({elapsed:.1f}s)")
+    for name, count in counts.items():
+        print(f"   {name}: {count}")
+
+
+if __name__ == "__main__":
+    main()
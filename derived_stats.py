@@ -0,0 +1,50 @@
+"""
+派生统计
+由真实请求推导出的记录（批量创建的每个元素BULK等）不是额外的请求。如果经由events.request上报，
+Locust会把它们计入Aggregated的请求数、RPS和失败数，容量搜索和基准测试读取的总数也随之虚高。
+
+这里把派生记录直接写入本进程统计中各自的条目（按request_type区分），不经过stats.total：
+条目照常出现在统计表、分位数和CSV中，分布式运行时随worker的统计一起发给master合并，但不计入Aggregated。
+HDR直方图等记录器通过derived_request事件接收同样的数据（同样不计入汇总）。
+"""
+from locust.event import EventHook
+from locust.stats import StatsError
+
+# 派生记录事件，参数与events.request相同
+derived_request = EventHook()
+
+# 记录派生条目的统计（由setup_derived_stats设置；未设置时只触发derived_request）
+_stats = None
+
+
+def setup_derived_stats(environment):
+    """把派生记录写入environment的统计（Locust初始化时调用）"""
+    global _stats
+    _stats = environment.stats
+
+
+def report(request_type, name, response_time, response_length=0, exception=None, start_time=None, url=None,
+           context=None):
+    """上报一条派生记录：计入 (name, request_type) 条目和错误表，不计入Aggregated"""
+    stats = _stats
+    if stats is not None:
+        entry = stats.get(name, request_type)
+        entry.log(response_time, response_length)
+        if exception is not None:
+            entry.log_error(exception)
+            key = StatsError.create_key(request_type, name, exception)
+            error = stats.errors.get(key)
+            if error is None:
+                error = stats.errors[key] = StatsError(request_type, name, exception)
+            error.occurred()
+    derived_request.fire(
+        request_type=request_type,
+        name=name,
+        response_time=response_time,
+        response_length=response_length,
+        response=None,
+        context=context or {},
+        exception=exception,
+        start_time=start_time,
+        url=url
+    )
@@ -0,0 +1,265 @@
+"""
+HDR直方图延迟记录
+Locust内置统计把响应时间四舍五入到粗粒度的桶中，p99.9/p99.99等尾部分位数不可靠。
+这里为每个请求名称维护一个对数-线性（HDR）直方图：在整个量程内保持固定的相对精度，
+内存只与量程和精度有关，与请求数无关。worker定期把增量随统计一起上报，由master合并，
+测试结束时导出分位数表。
+"""
+import csv
+import math
+import sys
+
+from locust.runners import MasterRunner, WorkerRunner
+
+from config import jira_config
+from derived_stats import derived_request
+
+# 导出的分位数
+PERCENTILES = (50.0, 90.0, 95.0, 99.0, 99.9, 99.99, 99.999, 100.0)
+
+
+class HdrHistogram:
+    """
+    对数-线性直方图（整数微秒）
+
+    每个2的幂区间再线性划分为sub_bucket_count个子桶，相对误差不超过 1/sub_bucket_count；
+    计数稀疏地保存在字典中，键为子桶能表示的最小值。超过量程的值计入最高的桶，并保留精确的最大值。
+    """
+
+    __slots__ = ('significant_digits', 'highest_trackable', 'sub_bucket_bits', 'counts',
+                 'total_count', 'min_value', 'max_value', 'clamped')
+
+    def __init__(self, significant_digits=3, highest_trackable=3600 * 1000 * 1000):
+        if not 1 <= significant_digits <= 5:
+            raise ValueError("significant_digits必须在1到5之间")
+        self.significant_digits = significant_digits
+        self.highest_trackable = highest_trackable
+        # 子桶数为不小于 2×10^digits 的2的幂，保证有效位数
+        self.sub_bucket_bits = math.ceil(math.log2(2 * 10 ** significant_digits))
+        self.counts = {}
+        self.total_count = 0
+        self.min_value = None
+        self.max_value = 0
+        self.clamped = 0
+
+    def _lowest_equivalent(self, value):
+        shift = value.bit_length() - self.sub_bucket_bits
+        if shift <= 0:
+            return value
+        return (value >> shift) << shift
+
+    def _highest_equivalent(self, lowest):
+        shift = lowest.bit_length() - self.sub_bucket_bits
+        if shift <= 0:
+            return lowest
+        return lowest + (1 << shift) - 1
+
+    def record(self, value, count=1):
+        """记录一个值（整数，单位由调用方决定）"""
+        if value < 0:
+            value = 0
+        if value > self.max_value:
+            self.max_value = value
+        if self.min_value is None or value < self.min_value:
+            self.min_value = value
+        if value > self.highest_trackable:
+            self.clamped += count
+            value = self.highest_trackable
+
+        key = self._lowest_equivalent(value)
+        counts = self.counts
+        counts[key] = counts.get(key, 0) + count
+        self.total_count += count
+
+    def merge(self, other):
+        """合并另一个直方图（精度必须一致）"""
+        if other.sub_bucket_bits != self.sub_bucket_bits:
+            raise ValueError("只能合并精度相同的直方图")
+        self.merge_state(other.to_state())
+
+    def value_at_percentile(self, percentile):
+        """返回分位数对应的值（所在子桶能表示的最大值，100%时为精确最大值）"""
+        if not self.total_count:
+            return 0
+        if percentile >= 100.0:
+            return self.max_value
+        target = max(math.ceil(self.total_count * percentile / 100.0), 1)
+        seen = 0
+        for key in sorted(self.counts):
+            seen += self.counts[key]
+            if seen >= target:
+                return min(self._highest_equivalent(key), self.max_value)
+        return self.max_value
+
+    @property
+    def mean(self):
+        if not self.total_count:
+            return 0.0
+        total = sum(self._median_equivalent(key) * count for key, count in self.counts.items())
+        return total / self.total_count
+
+    def _median_equivalent(self, lowest):
+        return (lowest + self._highest_equivalent(lowest)) / 2
+
+    def reset(self):
+        self.counts = {}
+        self.total_count = 0
+        self.min_value = None
+        self.max_value = 0
+        self.clamped = 0
+
+    def to_state(self):
+        """序列化为可通过msgpack发送的结构"""
+        return [self.counts, self.total_count, self.min_value, self.max_value, self.clamped]
+
+    def merge_state(self, state):
+        counts, total_count, min_value, max_value, clamped = state
+        own = self.counts
+        for key, count in counts.items():
+            own[key] = own.get(key, 0) + count
+        self.total_count += total_count
+        if min_value is not None and (self.min_value is None or min_value < self.min_value):
+            self.min_value = min_value
+        self.max_value = max(self.max_value, max_value)
+        self.clamped += clamped
+
+
+class LatencyRecorder:
+    """按 (请求类型, 请求名称) 维护响应时间直方图（微秒），并额外维护一个汇总直方图"""
+
+    AGGREGATED = ("", "Aggregated")
+
+    def __init__(self, significant_digits=3, max_latency_ms=3600 * 1000):
+        self.significant_digits = significant_digits
+        self.highest_trackable = int(max_latency_ms * 1000)
+        self.histograms = {}
+
+    def _histogram(self, key):
+        histogram = self.histograms.get(key)
+        if histogram is None:
+            histogram = self.histograms[key] = HdrHistogram(self.significant_digits, self.highest_trackable)
+        return histogram
+
+    def record(self, request_type, name, response_time_ms, aggregate=True):
+        value = int(response_time_ms * 1000)
+        self._histogram((request_type, name)).record(value)
+        if aggregate:
+            self._histogram(self.AGGREGATED).record(value)
+
+    def on_request(self, request_type, name, response_time, **kwargs):
+        """events.request监听器"""
+        if response_time is not None:
+            self.record(request_type, name, response_time)
+
+    def on_derived_request(self, request_type, name, response_time, **kwargs):
+        """derived_stats.derived_request监听器：派生记录不计入汇总直方图"""
+        if response_time is not None:
+            self.record(request_type, name, response_time, aggregate=False)
+
+    def reset(self, **kwargs):
+        self.histograms = {}
+
+    def drain_states(self):
+        """取出自上次调用以来的增量（worker上报用）"""
+        histograms, self.histograms = self.histograms, {}
+        return [[request_type, name, histogram.to_state()]
+                for (request_type, name), histogram in histograms.items()]
+
+    def merge_states(self, states):
+        for request_type, name, state in states:
+            self._histogram((request_type, name)).merge_state(state)
+
+    def percentile_table(self, percentiles=PERCENTILES):
+        """
+        生成分位数表
+
+        Returns:
+            list: 每行为 [类型, 名称, 请求数, 最小值, 平均值, 各分位数..., 超出量程数]，时间单位为毫秒
+        """
+        rows = []
+        keys = sorted(key for key in self.histograms if key != self.AGGREGATED)
+        if self.AGGREGATED in self.histograms:
+            keys.append(self.AGGREGATED)
+        for key in keys:
+            histogram = self.histograms[key]
+            rows.append([
+                key[0], key[1], histogram.total_count,
+                (histogram.min_value or 0) / 1000, histogram.mean / 1000,
+                *[histogram.value_at_percentile(p) / 1000 for p in percentiles],
+                histogram.clamped,
+            ])
+        return rows
+
+    def write_csv(self, path, percentiles=PERCENTILES):
+        with open(path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(["Type", "Name", "Request Count", "Min (ms)", "Mean (ms)",
+                             *[f"p{p:g}" for p in percentiles], "Clamped"])
+            for row in self.percentile_table(percentiles):
+                writer.writerow([f"{value:.3f}" if isinstance(value, float) else value for value in row])
+
+    def print_table(self, percentiles=PERCENTILES, out=sys.stdout):
+        rows = self.percentile_table(percentiles)
+        if not rows:
+            return
+        headers = [f"p{p:g}" for p in percentiles]
+        out.write("HDR直方图响应时间分位数（毫秒）\n")
+        out.write(f"{'Type':<8} {'Name':<40} {'# reqs':>8} " + " ".join(f"{h:>9}" for h in headers) + "\n")
+        for row in rows:
+            request_type, name, count = row[:3]
+            values = row[5:5 + len(percentiles)]
+            out.write(f"{request_type:<8} {name:<40} {count:>8} " + " ".join(f"{v:>9.2f}" for v in values) + "\n")
+        out.flush()
+
+
+def _create_recorder():
+    return LatencyRecorder(jira_config.hdr_significant_digits, jira_config.hdr_max_latency_ms)
+
+
+# 进程级延迟记录器
+latency_recorder = _create_recorder()
+
+
+def setup_hdr_recording(environment, recorder=latency_recorder):
+    """
+    把HDR直方图接入Locust事件
+
+    worker: 记录本进程的请求，每次向master上报统计时附带增量
+    master: 合并各worker的增量
+    单机/master: 测试结束时打印分位数表，并按HDR_CSV_PATH导出CSV
+    """
+    runner = environment.runner
+    events = environment.events
+
+    events.test_start.add_listener(lambda **kwargs: recorder.reset())
+    events.reset_stats.add_listener(recorder.reset)
+
+    if isinstance(runner, WorkerRunner):
+        events.request.add_listener(recorder.on_request)
+        derived_request.add_listener(recorder.on_derived_request)
+
+        def on_report_to_master(client_id, data):
+            states = recorder.drain_states()
+            if states:
+                data["hdr_histograms"] = states
+
+        events.report_to_master.add_listener(on_report_to_master)
+        return
+
+    if isinstance(runner, MasterRunner):
+        def on_worker_report(client_id, data):
+            states = data.get("hdr_histograms")
+            if states:
+                recorder.merge_states(states)
+
+        events.worker_report.add_listener(on_worker_report)
+    else:
+        events.request.add_listener(recorder.on_request)
+        derived_request.add_listener(recorder.on_derived_request)
+
+    def on_quitting(environment, **kwargs):
+        recorder.print_table()
+        if jira_config.hdr_csv_path:
+            recorder.write_csv(jira_config.hdr_csv_path)
+
+    events.quitting.add_listener(on_quitting)
@@ -0,0 +1,137 @@
+"""
+共享的issue key池
+进程内所有虚拟用户共用一个有容量上限的key池，可选地在分布式worker之间同步新key
+"""
+import random
+import threading
+from collections import deque
+
+from locust.runners import MasterRunner, WorkerRunner
+
+from config import jira_config
+
+
+class IssueKeyPool:
+    """
+    有界issue key池
+
+    - 数组存储key，随机采样为O(1)
+    - 字典记录key在数组中的位置，成员判断与删除为O(1)
+    - 达到容量上限后按插入顺序淘汰最旧的key
+    """
+
+    def __init__(self, capacity=10000):
+        if capacity <= 0:
+            raise ValueError("issue key池容量必须大于0")
+        self.capacity = capacity
+        self._keys = []
+        self._positions = {}
+        # 下一个被淘汰的槽位（仅在池满后使用）
+        self._cursor = 0
+        self._lock = threading.Lock()
+        # 防止多个用户同时为空池执行预热搜索
+        self.refill_lock = threading.Lock()
+        # 等待同步到其他worker的新key（仅在启用worker间共享时记录）
+        self.sharing = False
+        # 积压超过容量时自动丢弃最旧的key，避免无界增长
+        self._outbox = deque(maxlen=capacity)
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __contains__(self, issue_key):
+        return issue_key in self._positions
+
+    def add(self, issue_key, publish=True):
+        """
+        添加issue key
+
+        Returns:
+            bool: 是否为新key
+        """
+        with self._lock:
+            if issue_key in self._positions:
+                return False
+
+            if len(self._keys) < self.capacity:
+                self._positions[issue_key] = len(self._keys)
+                self._keys.append(issue_key)
+            else:
+                slot = self._cursor
+                del self._positions[self._keys[slot]]
+                self._keys[slot] = issue_key
+                self._positions[issue_key] = slot
+                self._cursor = (slot + 1) % self.capacity
+
+            if publish and self.sharing:
+                self._outbox.append(issue_key)
+            return True
+
+    def add_many(self, issue_keys, publish=True):
+        """批量添加，返回新增数量"""
+        return sum(1 for issue_key in issue_keys if self.add(issue_key, publish=publish))
+
+    def discard(self, issue_key):
+        """移除key（例如issue已被删除返回404时）"""
+        with self._lock:
+            slot = self._positions.pop(issue_key, None)
+            if slot is None:
+                return False
+
+            last_key = self._keys.pop()
+            if slot < len(self._keys):
+                self._keys[slot] = last_key
+                self._positions[last_key] = slot
+            if self._keys:
+                self._cursor %= len(self._keys)
+            else:
+                self._cursor = 0
+            return True
+
+    def sample(self):
+        """随机返回一个key，池为空时返回None"""
+        keys = self._keys
+        if not keys:
+            return None
+        return keys[random.randrange(len(keys))]
+
+    def drain_outbox(self, limit=500):
+        """取出待同步的新key"""
+        with self._lock:
+            outbox = self._outbox
+            return [outbox.popleft() for _ in range(min(limit, len(outbox)))]
+
+
+# 进程级共享池
+issue_pool = IssueKeyPool(capacity=jira_config.issue_pool_capacity)
+
+
+def setup_worker_sharing(environment, pool=issue_pool):
+    """
+    在分布式运行中同步各worker新建的issue key
+
+    worker随每次统计上报把新key发给master，master再广播给所有worker
+    """
+    runner = environment.runner
+
+    if isinstance(runner, WorkerRunner):
+        pool.sharing = True
+
+        def on_report_to_master(client_id, data):
+            keys = pool.drain_outbox()
+            if keys:
+                data["issue_keys"] = keys
+
+        def on_issue_keys(msg, **kwargs):
+            pool.add_many(msg.data, publish=False)
+
+        environment.events.report_to_master.add_listener(on_report_to_master)
+        runner.register_message("issue_keys", on_issue_keys)
+
+    elif isinstance(runner, MasterRunner):
+        def on_worker_report(client_id, data):
+            keys = data.get("issue_keys")
+            if keys:
+                runner.send_message("issue_keys", keys)
+
+        environment.events.worker_report.add_listener(on_worker_report)
@@ -0,0 +1,497 @@
+"""
+Jira REST API 本地替身服务
+在不依赖真实Jira的情况下压测负载生成器本身，测量单个worker核心的吞吐上限
+
+用法:
+    python jira_stub_server.py --port 8080
+    python jira_stub_server.py --port 8080 --profiles stub_profiles.json
+
+然后将 .env 中的 JIRA_BASE_URL 指向 http://127.0.0.1:8080 即可运行 locustfile.py
+"""
+import argparse
+import itertools
+import json
+import random
+import re
+import time
+from datetime import datetime, timezone
+
+import gevent
+from gevent import pywsgi, socket
+
+API_PREFIX = '/rest/api/2'
+
+# 默认的状态转换（与常见的SOC工作流保持一致）
+DEFAULT_TRANSITIONS = [
+    {'id': '11', 'name': 'Start Investigation', 'to': {'name': 'Investigating'}},
+    {'id': '21', 'name': 'Contain', 'to': {'name': 'Contained'}},
+    {'id': '31', 'name': 'Resolve', 'to': {'name': 'Resolved'}},
+    {'id': '41', 'name': 'Reopen', 'to': {'name': 'To Do'}},
+]
+
+DEFAULT_ISSUE_TYPES = ['Task', 'Bug', 'Story', 'Security Incident']
+
+DEFAULT_PRIORITIES = ['Critical', 'High', 'Medium', 'Low', 'Info']
+
+class EndpointProfile:
+    """单个端点的延迟与错误分布"""
+
+    DISTRIBUTIONS = ('constant', 'uniform', 'exponential')
+
+    def __init__(self, latency_ms=0.0, jitter_ms=0.0, distribution='constant',
+                 error_rate=0.0, error_status=503):
+        if distribution not in self.DISTRIBUTIONS:
+            raise ValueError(f'不支持的延迟分布: {distribution}')
+        if not 0.0 <= error_rate <= 1.0:
+            raise ValueError(f'error_rate必须在0到1之间: {error_rate}')
+
+        self.latency_ms = float(latency_ms)
+        self.jitter_ms = float(jitter_ms)
+        self.distribution = distribution
+        self.error_rate = float(error_rate)
+        self.error_status = int(error_status)
+
+    @classmethod
+    def from_dict(cls, data):
+        """从配置字典创建"""
+        return cls(
+            latency_ms=data.get('latency_ms', 0.0),
+            jitter_ms=data.get('jitter_ms', 0.0),
+            distribution=data.get('distribution', 'constant'),
+            error_rate=data.get('error_rate', 0.0),
+            error_status=data.get('error_status', 503),
+        )
+
+    def sample_delay(self):
+        """采样一次响应延迟（秒）"""
+        if self.distribution == 'exponential':
+            delay = random.expovariate(1.0 / self.latency_ms) if self.latency_ms > 0 else 0.0
+        elif self.distribution == 'uniform':
+            delay = random.uniform(self.latency_ms - self.jitter_ms, self.latency_ms + self.jitter_ms)
+        else:
+            delay = self.latency_ms
+        return max(delay, 0.0) / 1000.0
+
+    def should_fail(self):
+        """按错误率决定本次请求是否返回错误"""
+        return self.error_rate > 0 and random.random() < self.error_rate
+
+class RateLimit:
+    """全局令牌桶限流：超出速率的请求返回429和Retry-After（模拟Jira Cloud的限流）"""
+
+    def __init__(self, rate, burst=None, retry_after=1):
+        if rate <= 0:
+            raise ValueError(f'限流速率必须大于0: {rate}')
+        self.rate = float(rate)
+        self.burst = float(burst or rate)
+        self.retry_after = retry_after
+        self.rejected = 0
+        self._tokens = self.burst
+        self._last = time.monotonic()
+
+    def allow(self):
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+        self._last = now
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return True
+        self.rejected += 1
+        return False
+
+class IssueStore:
+    """内存中的issue存储，按key和项目建立索引"""
+
+    def __init__(self):
+        self.issues = {}
+        self.by_project = {}
+        self._id_counter = itertools.count(10000)
+        self._key_counters = {}
+        self._comment_counter = itertools.count(1)
+
+    def create(self, fields):
+        """创建issue，返回issue字典"""
+        project_key = (fields.get('project') or {}).get('key') or 'TEST'
+        counter = self._key_counters.setdefault(project_key, itertools.count(1))
+        issue_key = f'{project_key}-{next(counter)}'
+        now = _now()
+
+        issue = {
+            'id': str(next(self._id_counter)),
+            'key': issue_key,
+            'fields': {
+                'project': {'key': project_key},
+                'summary': fields.get('summary', ''),
+                'description': fields.get('description', ''),
+                'issuetype': fields.get('issuetype') or {'name': 'Task'},
+                'priority': fields.get('priority') or {'name': 'Medium'},
+                'assignee': fields.get('assignee'),
+                'status': {'name': 'To Do'},
+                'created': now,
+                'updated': now,
+                'comment': {'comments': [], 'total': 0},
+            },
+        }
+        self.issues[issue_key] = issue
+        self.by_project.setdefault(project_key, []).append(issue_key)
+        return issue
+
+    def get(self, issue_key):
+        return self.issues.get(issue_key)
+
+    def update(self, issue_key, fields):
+        issue = self.issues.get(issue_key)
+        if issue is None:
+            return None
+        issue['fields'].update(fields)
+        issue['fields']['updated'] = _now()
+        return issue
+
+    def add_comment(self, issue_key, body):
+        issue = self.issues.get(issue_key)
+        if issue is None:
+            return None
+        comment = {'id': str(next(self._comment_counter)), 'body': body, 'created': _now()}
+        comments = issue['fields']['comment']
+        comments['comments'].append(comment)
+        comments['total'] += 1
+        return comment
+
+    def transition(self, issue_key, transition_id):
+        issue = self.issues.get(issue_key)
+        if issue is None:
+            return None
+        for transition in DEFAULT_TRANSITIONS:
+            if transition['id'] == str(transition_id):
+                issue['fields']['status'] = {'name': transition['to']['name']}
+                issue['fields']['updated'] = _now()
+                return transition
+        return False
+
+    def search(self, project_key, start_at=0, max_results=50, descending=True):
+        """按项目分页查询，返回 (total, issues)"""
+        if project_key:
+            keys = self.by_project.get(project_key, [])
+        else:
+            keys = list(self.issues)
+
+        total = len(keys)
+        if descending:
+            # 倒序切片，避免复制整个索引
+            end = max(total - start_at, 0)
+            begin = max(end - max_results, 0)
+            page = reversed(keys[begin:end])
+        else:
+            page = keys[start_at:start_at + max_results]
+        return total, [self.issues[key] for key in page]
+
+class JiraStubServer:
+    """Jira REST API替身服务（WSGI应用 + gevent服务器）"""
+
+    _PROJECT_RE = re.compile(r"project\s*=\s*\"?([A-Za-z0-9_]+)\"?", re.IGNORECASE)
+
+    def __init__(self, host='127.0.0.1', port=8080, profiles=None, default_profile=None, bulk_limit=50,
+                 rate_limit=None):
+        self.host = host
+        self.port = port
+        # 可选的全局限流（RateLimit），为None时不限流
+        self.rate_limit = rate_limit
+        # 单次批量创建允许的最大issue数（与Jira默认的 jira.bulk.create.max.issues.per.request 一致）
+        self.bulk_limit = bulk_limit
+        self.store = IssueStore()
+        self.default_profile = default_profile or EndpointProfile()
+        self.profiles = profiles or {}
+        self.request_count = 0
+        self._server = None
+
+        # (方法, 正则, 端点名, 处理函数)
+        self.routes = [
+            ('POST', re.compile(rf'^{API_PREFIX}/issue/?$'), 'create_issue', self._create_issue),
+            ('POST', re.compile(rf'^{API_PREFIX}/issue/bulk/?$'), 'bulk_create_issue', self._bulk_create_issue),
+            ('GET', re.compile(rf'^{API_PREFIX}/issue/([^/]+)/comment/?$'), 'get_comments', self._get_comments),
+            ('POST', re.compile(rf'^{API_PREFIX}/issue/([^/]+)/comment/?$'), 'add_comment', self._add_comment),
+            ('GET', re.compile(rf'^{API_PREFIX}/issue/([^/]+)/transitions/?$'), 'get_transitions', self._get_transitions),
+            ('POST', re.compile(rf'^{API_PREFIX}/issue/([^/]+)/transitions/?$'), 'do_transition', self._do_transition),
+            ('GET', re.compile(rf'^{API_PREFIX}/issue/([^/]+)/?$'), 'get_issue', self._get_issue),
+            ('PUT', re.compile(rf'^{API_PREFIX}/issue/([^/]+)/?$'), 'update_issue', self._update_issue),
+            ('GET', re.compile(rf'^{API_PREFIX}/search/?$'), 'search', self._search),
+            ('POST', re.compile(rf'^{API_PREFIX}/search/?$'), 'search', self._search),
+            ('GET', re.compile(rf'^{API_PREFIX}/project/([^/]+)/?$'), 'get_project', self._get_project),
+            ('GET', re.compile(rf'^{API_PREFIX}/priority/?$'), 'get_priorities', self._get_priorities),
+        ]
+
+    @property
+    def base_url(self):
+        return f'http://{self.host}:{self.port}'
+
+    def profile_for(self, endpoint):
+        return self.profiles.get(endpoint, self.default_profile)
+
+    # ---- WSGI ----
+
+    def __call__(self, environ, start_response):
+        self.request_count += 1
+        method = environ['REQUEST_METHOD']
+        path = environ.get('PATH_INFO', '')
+
+        if self.rate_limit is not None and not self.rate_limit.allow():
+            return self._respond(start_response, 429, {'errorMessages': ['Rate limit exceeded.']},
+                                 [('Retry-After', str(self.rate_limit.retry_after))])
+
+        for route_method, pattern, endpoint, handler in self.routes:
+            if route_method != method:
+                continue
+            match = pattern.match(path)
+            if not match:
+                continue
+
+            profile = self.profile_for(endpoint)
+            delay = profile.sample_delay()
+            if delay:
+                gevent.sleep(delay)
+            if profile.should_fail():
+                return self._respond(start_response, profile.error_status,
+                                     {'errorMessages': [f'注入的{endpoint}错误']})
+
+            try:
+                body = self._read_json(environ)
+            except ValueError:
+                return self._respond(start_response, 400, {'errorMessages': ['请求体不是合法的JSON']})
+
+            status, payload = handler(environ, body, *match.groups())
+            return self._respond(start_response, status, payload)
+
+        return self._respond(start_response, 404, {'errorMessages': [f'未实现的端点: {method} {path}']})
+
+    @staticmethod
+    def _read_json(environ):
+        try:
+            length = int(environ.get('CONTENT_LENGTH') or 0)
+        except ValueError:
+            length = 0
+        if length <= 0:
+            return {}
+        return json.loads(environ['wsgi.input'].read(length))
+
+    @staticmethod
+    def _respond(start_response, status, payload, headers=()):
+        reason = _REASONS.get(status, 'Unknown')
+        if payload is None:
+            start_response(f'{status} {reason}', [('Content-Length', '0'), *headers])
+            return [b'']
+        data = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        start_response(f'{status} {reason}', [
+            ('Content-Type', 'application/json;charset=UTF-8'),
+            ('Content-Length', str(len(data))),
+            *headers,
+        ])
+        return [data]
+
+    def _issue_url(self, issue):
+        return f"{self.base_url}{API_PREFIX}/issue/{issue['id']}"
+
+    # ---- 端点实现 ----
+
+    def _create_issue(self, environ, body):
+        fields = body.get('fields')
+        if not fields or not fields.get('summary'):
+            return 400, {'errors': {'summary': 'You must specify a summary of the issue.'}}
+        issue = self.store.create(fields)
+        return 201, {'id': issue['id'], 'key': issue['key'], 'self': self._issue_url(issue)}
+
+    def _bulk_create_issue(self, environ, body):
+        updates = body.get('issueUpdates')
+        if not isinstance(updates, list) or not updates:
+            return 400, {'errorMessages': ['issueUpdates不能为空']}
+        if len(updates) > self.bulk_limit:
+            return 400, {'errorMessages': [f'单次最多创建 {self.bulk_limit} 个issue，实际 {len(updates)} 个']}
+
+        issues = []
+        errors = []
+        for index, update in enumerate(updates):
+            fields = (update or {}).get('fields')
+            if not fields or not fields.get('summary'):
+                errors.append({
+                    'status': 400,
+                    'elementErrors': {'errorMessages': [],
+                                      'errors': {'summary': 'You must specify a summary of the issue.'}},
+                    'failedElementNumber': index,
+                })
+                continue
+            issue = self.store.create(fields)
+            issues.append({'id': issue['id'], 'key': issue['key'], 'self': self._issue_url(issue)})
+
+        # 任意一个元素创建成功即返回201，全部失败时返回400
+        return (201 if issues else 400), {'issues': issues, 'errors': errors}
+
+    def _get_issue(self, environ, body, issue_key):
+        issue = self.store.get(issue_key)
+        if issue is None:
+            return 404, {'errorMessages': ['Issue Does Not Exist']}
+        return 200, dict(issue, self=self._issue_url(issue))
+
+    def _update_issue(self, environ, body, issue_key):
+        if self.store.update(issue_key, body.get('fields') or {}) is None:
+            return 404, {'errorMessages': ['Issue Does Not Exist']}
+        return 204, None
+
+    def _get_comments(self, environ, body, issue_key):
+        issue = self.store.get(issue_key)
+        if issue is None:
+            return 404, {'errorMessages': ['Issue Does Not Exist']}
+        comments = issue['fields']['comment']
+        return 200, {'startAt': 0, 'maxResults': comments['total'], 'total': comments['total'],
+                     'comments': comments['comments']}
+
+    def _add_comment(self, environ, body, issue_key):
+        if not body.get('body'):
+            return 400, {'errors': {'comment': 'Comment body can not be empty!'}}
+        comment = self.store.add_comment(issue_key, body['body'])
+        if comment is None:
+            return 404, {'errorMessages': ['Issue Does Not Exist']}
+        return 201, comment
+
+    def _get_transitions(self, environ, body, issue_key):
+        if self.store.get(issue_key) is None:
+            return 404, {'errorMessages': ['Issue Does Not Exist']}
+        return 200, {'transitions': DEFAULT_TRANSITIONS}
+
+    def _do_transition(self, environ, body, issue_key):
+        transition_id = (body.get('transition') or {}).get('id')
+        result = self.store.transition(issue_key, transition_id)
+        if result is None:
+            return 404, {'errorMessages': ['Issue Does Not Exist']}
+        if result is False:
+            return 400, {'errorMessages': [f"Transition id '{transition_id}' is not valid for this issue."]}
+        for item in (body.get('update') or {}).get('comment', []):
+            comment_body = (item.get('add') or {}).get('body')
+            if comment_body:
+                self.store.add_comment(issue_key, comment_body)
+        return 204, None
+
+    def _search(self, environ, body):
+        if environ['REQUEST_METHOD'] == 'GET':
+            body = _parse_query(environ.get('QUERY_STRING', ''))
+        jql = body.get('jql') or ''
+        match = self._PROJECT_RE.search(jql)
+        project_key = match.group(1) if match else None
+        descending = 'ASC' not in jql.upper().split('ORDER BY')[-1] if 'ORDER BY' in jql.upper() else True
+
+        try:
+            start_at = int(body.get('startAt', 0))
+            max_results = int(body.get('maxResults', 50))
+        except (TypeError, ValueError):
+            return 400, {'errorMessages': ['startAt/maxResults必须为整数']}
+
+        total, issues = self.store.search(project_key, start_at, max_results, descending)
+        requested_fields = body.get('fields')
+        return 200, {
+            'startAt': start_at,
+            'maxResults': max_results,
+            'total': total,
+            'issues': [_project_fields(issue, requested_fields) for issue in issues],
+        }
+
+    def _get_project(self, environ, body, project_key):
+        return 200, {
+            'id': str(abs(hash(project_key)) % 100000),
+            'key': project_key,
+            'name': f'{project_key} (stub)',
+            'projectTypeKey': 'software',
+            'issueTypes': [{'id': str(i + 1), 'name': name} for i, name in enumerate(DEFAULT_ISSUE_TYPES)],
+        }
+
+    def _get_priorities(self, environ, body):
+        return 200, [{'id': str(i + 1), 'name': name} for i, name in enumerate(DEFAULT_PRIORITIES)]
+
+    # ---- 服务器生命周期 ----
+
+    def _make_server(self):
+        listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        # pywsgi分两次写出响应头和响应体，关闭Nagle算法以免与客户端延迟ACK叠加出约40ms的额外延迟
+        listener.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        listener.bind((self.host, self.port))
+        listener.listen(1024)
+        return pywsgi.WSGIServer(listener, self, log=None, error_log=None)
+
+    def start(self):
+        """在当前进程中后台启动（用于进程内基准测试）"""
+        self._server = self._make_server()
+        self._server.start()
+        # 端口为0时由系统分配
+        self.port = self._server.server_port
+        return self
+
+    def stop(self):
+        if self._server is not None:
+            self._server.stop()
+            self._server = None
+
+    def serve_forever(self):
+        self._server = self._make_server()
+        self._server.serve_forever()
+
+_REASONS = {200: 'OK', 201: 'Created', 204: 'No Content', 400: 'Bad Request',
+            404: 'Not Found', 429: 'Too Many Requests', 500: 'Internal Server Error',
+            503: 'Service Unavailable'}
+
+def _now():
+    return datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%S.000+0000')
+
+def _parse_query(query_string):
+    from urllib.parse import parse_qs
+    return {k: v[0] for k, v in parse_qs(query_string).items()}
+
+def _project_fields(issue, requested_fields):
+    """只返回搜索请求中指定的字段"""
+    if not requested_fields:
+        return issue
+    if isinstance(requested_fields, str):
+        requested_fields = requested_fields.split(',')
+    fields = issue['fields']
+    return {
+        'id': issue['id'],
+        'key': issue['key'],
+        'fields': {name: fields[name] for name in requested_fields if name in fields},
+    }
+
+def load_profiles(path):
+    """从JSON文件加载各端点的延迟/错误分布"""
+    with open(path, encoding='utf-8') as f:
+        data = json.load(f)
+    default = EndpointProfile.from_dict(data.pop('default', {}))
+    return default, {name: EndpointProfile.from_dict(spec) for name, spec in data.items()}
+
+def main():
+    parser = argparse.ArgumentParser(description='Jira REST API 本地替身服务')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--profiles', help='端点延迟/错误分布的JSON文件')
+    parser.add_argument('--latency-ms', type=float, default=0.0, help='所有端点的默认延迟（毫秒）')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='所有端点的默认错误率')
+    parser.add_argument('--bulk-limit', type=int, default=50, help='单次批量创建允许的最大issue数')
+    parser.add_argument('--rate-limit', type=float, default=0.0, help='全局限流速率（请求/秒，0为不限流），超出时返回429')
+    parser.add_argument('--retry-after', type=int, default=1, help='429响应中Retry-After的秒数')
+    args = parser.parse_args()
+
+    default_profile = EndpointProfile(latency_ms=args.latency_ms, error_rate=args.error_rate)
+    profiles = {}
+    if args.profiles:
+        file_default, profiles = load_profiles(args.profiles)
+        if not args.latency_ms and not args.error_rate:
+            default_profile = file_default
+
+    rate_limit = RateLimit(args.rate_limit, retry_after=args.retry_after) if args.rate_limit else None
+    server = JiraStubServer(args.host, args.port, profiles=profiles, default_profile=default_profile,
+                            bulk_limit=args.bulk_limit, rate_limit=rate_limit)
+    print(f'Jira替身服务已启动: {server.base_url}')
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print(f'\n替身服务已停止，共处理 {server.request_count} 个请求')
+        if rate_limit is not None:
+            print(f'其中 {rate_limit.rejected} 个请求因限流返回429')
+
+if __name__ == '__main__':
+    main()
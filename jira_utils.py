@@ -1,647 +1,1117 @@
-"""
-Jira REST API 工具类
-提供SOC安全事件创建、获取、处理记录等功能
-"""
-import json
-import requests
-from faker import Faker
-from config import jira_config
-
-fake = Faker('en_US')
-
-class JiraAPIClient:
-    """Jira API客户端"""
-    
-    def __init__(self):
-        self.config = jira_config
-        self.session = requests.Session()
-        self.session.auth = self.config.get_auth()
-        self.session.headers.update({
-            'Content-Type': 'application/json',
-            'Accept': 'application/json'
-        })
-    
-    def create_issue(self, summary=None, description=None, issue_type=None, project_key=None, priority=None):
-        """
-        创建安全事件
-        
-        Args:
-            summary: 安全事件标题
-            description: 安全事件描述
-            issue_type: 安全事件类型
-            project_key: 项目key
-            priority: 优先级
-            
-        Returns:
-            tuple: (response对象, issue_key或None)
-        """
-        if not summary:
-            summary = SecurityDataGenerator.generate_security_incident_summary()
-        
-        if not description:
-            description = SecurityDataGenerator.generate_security_incident_description()
-        
-        if not issue_type:
-            issue_type = self.config.default_issue_type
-            
-        if not project_key:
-            project_key = self.config.project_key
-        
-        payload = {
-            "fields": {
-                "project": {
-                    "key": project_key
-                },
-                "summary": summary,
-                "description": description,
-                "issuetype": {
-                    "name": issue_type
-                }
-            }
-        }
-        
-        # 添加优先级字段（如果提供）
-        if priority:
-            payload["fields"]["priority"] = {"name": priority}
-        
-        url = f"{self.config.api_url}/issue"
-        
-        try:
-            response = self.session.post(url, data=json.dumps(payload))
-            
-            if response.status_code == 201:
-                issue_data = response.json()
-                return response, issue_data.get('key')
-            else:
-                print(f"创建安全事件失败: {response.status_code} - {response.text}")
-                return response, None
-                
-        except Exception as e:
-            print(f"创建安全事件异常: {str(e)}")
-            raise
-    
-    def get_issue(self, issue_key):
-        """
-        获取安全事件详情
-        
-        Args:
-            issue_key: 安全事件的key
-            
-        Returns:
-            requests.Response: 响应对象
-        """
-        url = f"{self.config.api_url}/issue/{issue_key}"
-        
-        try:
-            response = self.session.get(url)
-            return response
-        except Exception as e:
-            print(f"获取安全事件异常: {str(e)}")
-            raise
-    
-    def add_comment(self, issue_key, comment_body=None):
-        """
-        为安全事件添加处理记录
-        
-        Args:
-            issue_key: 安全事件的key
-            comment_body: 处理记录内容
-            
-        Returns:
-            requests.Response: 响应对象
-        """
-        if not comment_body:
-            comment_body = SecurityDataGenerator.generate_security_comment()
-        
-        payload = {
-            "body": comment_body
-        }
-        
-        url = f"{self.config.api_url}/issue/{issue_key}/comment"
-        
-        try:
-            response = self.session.post(url, data=json.dumps(payload))
-            return response
-        except Exception as e:
-            print(f"添加处理记录异常: {str(e)}")
-            raise
-    
-    def search_issues(self, jql="project = SOC ORDER BY created DESC", max_results=50):
-        """
-        搜索安全事件
-        
-        Args:
-            jql: JQL查询语句
-            max_results: 最大返回结果数
-            
-        Returns:
-            requests.Response: 响应对象
-        """
-        payload = {
-            "jql": jql,
-            "maxResults": max_results,
-            "fields": ["key", "summary", "status", "created", "priority"]
-        }
-        
-        url = f"{self.config.api_url}/search"
-        
-        try:
-            response = self.session.post(url, data=json.dumps(payload))
-            return response
-        except Exception as e:
-            print(f"搜索安全事件异常: {str(e)}")
-            raise
-    
-    def get_project_info(self, project_key=None):
-        """
-        获取项目信息
-        
-        Args:
-            project_key: 项目key
-            
-        Returns:
-            requests.Response: 响应对象
-        """
-        if not project_key:
-            project_key = self.config.project_key
-            
-        url = f"{self.config.api_url}/project/{project_key}"
-        
-        try:
-            response = self.session.get(url)
-            return response
-        except Exception as e:
-            print(f"获取项目信息异常: {str(e)}")
-            raise
-    
-    def update_issue(self, issue_key, fields_to_update):
-        """
-        更新安全事件
-        
-        Args:
-            issue_key: 安全事件的key
-            fields_to_update: 要更新的字段字典
-            
-        Returns:
-            requests.Response: 响应对象
-        """
-        payload = {
-            "fields": fields_to_update
-        }
-        
-        url = f"{self.config.api_url}/issue/{issue_key}"
-        
-        try:
-            response = self.session.put(url, data=json.dumps(payload))
-            return response
-        except Exception as e:
-            print(f"更新安全事件异常: {str(e)}")
-            raise
-    
-    def assign_incident(self, issue_key, assignee):
-        """
-        分配安全事件给分析师
-        
-        Args:
-            issue_key: 安全事件的key
-            assignee: 分析师用户名
-            
-        Returns:
-            requests.Response: 响应对象
-        """
-        payload = {
-            "fields": {
-                "assignee": {
-                    "name": assignee
-                }
-            }
-        }
-        
-        url = f"{self.config.api_url}/issue/{issue_key}"
-        
-        try:
-            response = self.session.put(url, data=json.dumps(payload))
-            return response
-        except Exception as e:
-            print(f"分配安全事件异常: {str(e)}")
-            raise
-    
-    def update_incident_priority(self, issue_key, priority):
-        """
-        更新安全事件优先级
-        
-        Args:
-            issue_key: 安全事件的key
-            priority: 优先级 (Critical, High, Medium, Low)
-            
-        Returns:
-            requests.Response: 响应对象
-        """
-        payload = {
-            "fields": {
-                "priority": {
-                    "name": priority
-                }
-            }
-        }
-        
-        url = f"{self.config.api_url}/issue/{issue_key}"
-        
-        try:
-            response = self.session.put(url, data=json.dumps(payload))
-            return response
-        except Exception as e:
-            print(f"更新事件优先级异常: {str(e)}")
-            raise
-    
-    def transition_incident_status(self, issue_key, transition_id, comment=None):
-        """
-        转换安全事件状态（如：New -> Investigating -> Resolved）
-        
-        Args:
-            issue_key: 安全事件的key
-            transition_id: 状态转换ID
-            comment: 状态转换说明
-            
-        Returns:
-            requests.Response: 响应对象
-        """
-        payload = {
-            "transition": {
-                "id": transition_id
-            }
-        }
-        
-        if comment:
-            payload["update"] = {
-                "comment": [
-                    {
-                        "add": {
-                            "body": comment
-                        }
-                    }
-                ]
-            }
-        
-        url = f"{self.config.api_url}/issue/{issue_key}/transitions"
-        
-        try:
-            response = self.session.post(url, data=json.dumps(payload))
-            return response
-        except Exception as e:
-            print(f"状态转换异常: {str(e)}")
-            raise
-    
-    def create_incident_from_wazuh(self, wazuh_data):
-        """
-        根据Wazuh告警数据创建安全事件
-        
-        Args:
-            wazuh_data: Wazuh告警数据字典
-            
-        Returns:
-            tuple: (response对象, issue_key或None)
-        """
-        # 根据Wazuh数据构造事件标题和描述
-        rule_id = wazuh_data.get('rule_id', 'Unknown')
-        level = wazuh_data.get('level', 0)
-        description = wazuh_data.get('description', 'No description')
-        agent = wazuh_data.get('agent', {})
-        
-        summary = f"Wazuh Alert {rule_id}: {description}"
-        
-        incident_description = f"""
-Wazuh Security Alert
-
-Rule ID: {rule_id}
-Alert Level: {level}
-Description: {description}
-Agent: {agent.get('name', 'Unknown')} ({agent.get('ip', 'Unknown')})
-Timestamp: {wazuh_data.get('timestamp', 'Unknown')}
-
-Raw Alert Data:
-{json.dumps(wazuh_data, indent=2)}
-        """
-        
-        # 根据告警级别设置优先级
-        priority_map = {
-            15: "Critical",
-            12: "High", 
-            10: "High",
-            7: "Medium",
-            5: "Medium", 
-            3: "Low",
-            1: "Low"
-        }
-        
-        priority = priority_map.get(level, "Medium")
-        
-        return self.create_issue(
-            summary=summary.strip(),
-            description=incident_description.strip(),
-            issue_type="Security Incident",
-            priority=priority
-        )
-
-# 生成SOC安全事件测试数据的辅助函数
-class SecurityDataGenerator:
-    """SOC安全事件数据生成器"""
-    
-    # 威胁类型和攻击向量
-    THREAT_TYPES = [
-        "Malware Detection", "Network Intrusion", "Suspicious Login", 
-        "Data Exfiltration", "Phishing Attempt", "Vulnerability Exploit",
-        "Brute Force Attack", "DDoS Attack", "Insider Threat", "APT Activity"
-    ]
-    
-    ATTACK_VECTORS = [
-        "Email", "Web Application", "Network", "Endpoint", "Cloud Services",
-        "Remote Access", "Mobile Device", "IoT Device", "Database", "API"
-    ]
-    
-    IOC_TYPES = [
-        "IP Address", "Domain Name", "File Hash", "URL", "Email Address",
-        "Registry Key", "Process Name", "User Account", "Certificate"
-    ]
-    
-    SEVERITY_LEVELS = ["Critical", "High", "Medium", "Low", "Info"]
-    
-    @staticmethod
-    def generate_security_incident_summary():
-        """生成安全事件标题"""
-        threat_type = fake.random_element(SecurityDataGenerator.THREAT_TYPES)
-        attack_vector = fake.random_element(SecurityDataGenerator.ATTACK_VECTORS)
-        
-        templates = [
-            f"{threat_type} detected via {attack_vector}",
-            f"Suspicious {threat_type} activity on {attack_vector}",
-            f"Alert: {threat_type} targeting {attack_vector}",
-            f"Security Event: {threat_type} through {attack_vector}",
-            f"Incident: Potential {threat_type} using {attack_vector}"
-        ]
-        
-        return fake.random_element(templates)
-    
-    @staticmethod
-    def generate_security_incident_description():
-        """生成安全事件描述"""
-        source_ip = fake.ipv4()
-        dest_ip = fake.ipv4()
-        timestamp = fake.date_time_between(start_date='-7d', end_date='now')
-        user_agent = fake.user_agent()
-        
-        templates = [
-            f"Wazuh Alert Details:\n"
-            f"- Timestamp: {timestamp}\n"
-            f"- Source IP: {source_ip}\n"
-            f"- Destination IP: {dest_ip}\n"
-            f"- User Agent: {user_agent}\n"
-            f"- Rule ID: {fake.random_int(min=1000, max=9999)}\n"
-            f"- Alert Level: {fake.random_int(min=1, max=15)}\n"
-            f"- Description: {fake.sentence()}",
-            
-            f"SIEM Alert Triggered:\n"
-            f"- Event Time: {timestamp}\n"
-            f"- Affected Asset: {fake.hostname()}\n"
-            f"- Source: {source_ip}\n"
-            f"- IOC: {SecurityDataGenerator.generate_ioc()}\n"
-            f"- Risk Score: {fake.random_int(min=1, max=100)}\n"
-            f"- Additional Context: {fake.text(max_nb_chars=100)}",
-            
-            f"Security Event Detected:\n"
-            f"- Detection Time: {timestamp}\n"
-            f"- Endpoint: {fake.hostname()}\n"
-            f"- Process: {fake.file_name()}\n"
-            f"- Command Line: {fake.text(max_nb_chars=80)}\n"
-            f"- Hash: {fake.sha256()}\n"
-            f"- Analyst Notes: Initial triage required"
-        ]
-        
-        return fake.random_element(templates)
-    
-    @staticmethod
-    def generate_security_comment():
-        """生成安全处理记录"""
-        analyst_name = fake.first_name()
-        
-        templates = [
-            f"[{analyst_name}] Initial triage completed. {fake.sentence()} Escalating to L2 for further analysis.",
-            f"[{analyst_name}] Investigation in progress. {fake.sentence()} Checking threat intelligence feeds.",
-            f"[{analyst_name}] False positive confirmed. {fake.sentence()} Updating detection rules to reduce noise.",
-            f"[{analyst_name}] Containment actions taken. {fake.sentence()} Monitoring for additional indicators.",
-            f"[{analyst_name}] Incident resolved. {fake.sentence()} Root cause analysis completed.",
-            f"[{analyst_name}] IOC analysis: {SecurityDataGenerator.generate_ioc()} - {fake.sentence()}",
-            f"[{analyst_name}] Timeline analysis: {fake.sentence()} Event correlation with other incidents ongoing.",
-            f"[{analyst_name}] User behavior analysis: {fake.sentence()} No anomalies detected in recent activity.",
-            f"[{analyst_name}] Network forensics: {fake.sentence()} Packet capture analysis in progress.",
-            f"[{analyst_name}] Malware analysis: {fake.sentence()} Sandbox execution results attached."
-        ]
-        
-        return fake.random_element(templates)
-    
-    @staticmethod
-    def generate_ioc():
-        """生成威胁指标"""
-        ioc_type = fake.random_element(SecurityDataGenerator.IOC_TYPES)
-        
-        ioc_generators = {
-            "IP Address": lambda: fake.ipv4(),
-            "Domain Name": lambda: fake.domain_name(),
-            "File Hash": lambda: fake.sha256(),
-            "URL": lambda: fake.url(),
-            "Email Address": lambda: fake.email(),
-            "Registry Key": lambda: f"HKEY_LOCAL_MACHINE\\{fake.word()}\\{fake.word()}",
-            "Process Name": lambda: f"{fake.word()}.exe",
-            "User Account": lambda: fake.user_name(),
-            "Certificate": lambda: f"CN={fake.company()}, O={fake.company()}"
-        }
-        
-        ioc_value = ioc_generators.get(ioc_type, lambda: fake.word())()
-        return f"{ioc_type}: {ioc_value}"
-    
-    @staticmethod
-    def generate_wazuh_alert_data():
-        """生成Wazuh告警数据格式"""
-        return {
-            "rule_id": fake.random_int(min=1000, max=99999),
-            "level": fake.random_int(min=1, max=15),
-            "description": fake.sentence(),
-            "groups": [fake.word(), fake.word()],
-            "timestamp": fake.date_time_between(start_date='-1d', end_date='now').isoformat(),
-            "agent": {
-                "id": f"{fake.random_int(min=1, max=1000):03d}",
-                "name": fake.hostname(),
-                "ip": fake.ipv4()
-            },
-            "data": {
-                "srcip": fake.ipv4(),
-                "dstip": fake.ipv4(),
-                "srcport": fake.random_int(min=1024, max=65535),
-                "dstport": fake.random_int(min=1, max=1023),
-                "protocol": fake.random_element(["TCP", "UDP", "ICMP"]),
-                "action": fake.random_element(["ALLOW", "DENY", "DROP"])
-            }
-        }
-    
-    @staticmethod
-    def generate_soc_jql_queries():
-        """生成SOC常用的JQL查询语句"""
-        project_key = "SOC"  # 假设SOC项目key
-        
-        queries = [
-            f'project = {project_key} AND priority = "Critical" AND status != "Resolved" ORDER BY created DESC',
-            f'project = {project_key} AND summary ~ "Malware" AND created >= -24h ORDER BY priority DESC',
-            f'project = {project_key} AND assignee = currentUser() AND status = "In Progress" ORDER BY updated DESC',
-            f'project = {project_key} AND labels in ("APT", "targeted-attack") ORDER BY created DESC',
-            f'project = {project_key} AND status = "New" AND created >= -8h ORDER BY priority DESC, created DESC',
-            f'project = {project_key} AND description ~ "phishing" AND created >= -7d ORDER BY created DESC',
-            f'project = {project_key} AND priority in ("Critical", "High") AND assignee is EMPTY ORDER BY created ASC',
-            f'project = {project_key} AND summary ~ "brute.force" AND resolved >= -30d ORDER BY resolved DESC'
-        ]
-        
-        return fake.random_element(queries)
-
-# SOC测试场景辅助类
-class SOCTestScenarios:
-    """SOC测试场景生成器"""
-    
-    def __init__(self, jira_client):
-        self.jira_client = jira_client
-    
-    def simulate_wazuh_batch_alerts(self, batch_size=10):
-        """
-        模拟Wazuh批量告警导入
-        
-        Args:
-            batch_size: 批量大小
-            
-        Returns:
-            list: 创建的安全事件列表
-        """
-        created_incidents = []
-        
-        for i in range(batch_size):
-            wazuh_data = SecurityDataGenerator.generate_wazuh_alert_data()
-            response, issue_key = self.jira_client.create_incident_from_wazuh(wazuh_data)
-            
-            if issue_key:
-                created_incidents.append({
-                    'issue_key': issue_key,
-                    'wazuh_data': wazuh_data,
-                    'response': response
-                })
-        
-        return created_incidents
-    
-    def simulate_shift_handover(self, outgoing_analyst, incoming_analyst, incident_keys):
-        """
-        模拟值班交接场景
-        
-        Args:
-            outgoing_analyst: 交班分析师
-            incoming_analyst: 接班分析师
-            incident_keys: 需要交接的事件列表
-            
-        Returns:
-            list: 交接结果
-        """
-        handover_results = []
-        
-        for incident_key in incident_keys:
-            # 添加交接记录
-            handover_comment = f"Shift handover from {outgoing_analyst} to {incoming_analyst}. " \
-                             f"Current status and investigation notes transferred. " \
-                             f"{fake.sentence()}"
-            
-            comment_response = self.jira_client.add_comment(incident_key, handover_comment)
-            
-            # 重新分配给接班分析师
-            assign_response = self.jira_client.assign_incident(incident_key, incoming_analyst)
-            
-            handover_results.append({
-                'incident_key': incident_key,
-                'comment_response': comment_response,
-                'assign_response': assign_response
-            })
-        
-        return handover_results
-    
-    def simulate_incident_escalation(self, incident_key, from_priority, to_priority, reason=None):
-        """
-        模拟事件升级场景
-        
-        Args:
-            incident_key: 事件key
-            from_priority: 原优先级
-            to_priority: 新优先级
-            reason: 升级原因
-            
-        Returns:
-            dict: 升级结果
-        """
-        if not reason:
-            reason = f"Escalation required due to {fake.sentence()}"
-        
-        # 更新优先级
-        priority_response = self.jira_client.update_incident_priority(incident_key, to_priority)
-        
-        # 添加升级说明
-        escalation_comment = f"Priority escalated from {from_priority} to {to_priority}. " \
-                           f"Reason: {reason} " \
-                           f"Escalation time: {fake.date_time_between(start_date='-1h', end_date='now')}"
-        
-        comment_response = self.jira_client.add_comment(incident_key, escalation_comment)
-        
-        return {
-            'incident_key': incident_key,
-            'priority_response': priority_response,
-            'comment_response': comment_response,
-            'escalation_reason': reason
-        }
-    
-    def generate_realistic_soc_workload(self, num_incidents=50):
-        """
-        生成真实的SOC工作负载数据
-        
-        Args:
-            num_incidents: 要生成的事件数量
-            
-        Returns:
-            dict: 生成的工作负载统计
-        """
-        incident_distribution = {
-            'Critical': int(num_incidents * 0.05),  # 5%
-            'High': int(num_incidents * 0.15),      # 15%
-            'Medium': int(num_incidents * 0.35),    # 35%
-            'Low': int(num_incidents * 0.35),       # 35%
-            'Info': int(num_incidents * 0.10)       # 10%
-        }
-        
-        created_incidents = {
-            'Critical': [],
-            'High': [],
-            'Medium': [],
-            'Low': [],
-            'Info': []
-        }
-        
-        for priority, count in incident_distribution.items():
-            for i in range(count):
-                summary = SecurityDataGenerator.generate_security_incident_summary()
-                description = SecurityDataGenerator.generate_security_incident_description()
-                
-                response, issue_key = self.jira_client.create_issue(
-                    summary=summary,
-                    description=description,
-                    issue_type="Security Incident",
-                    priority=priority
-                )
-                
-                if issue_key:
-                    created_incidents[priority].append(issue_key)
-        
-        return {
-            'total_created': sum(len(incidents) for incidents in created_incidents.values()),
-            'distribution': {k: len(v) for k, v in created_incidents.items()},
-            'incidents': created_incidents
+"""
+Jira REST API 工具类
+提供SOC安全事件创建、获取、处理记录等功能
+"""
+import json
+import os
+import time
+from gevent.pool import Group
+from locust import events
+import requests
+from requests.adapters import HTTPAdapter
+from faker import Faker
+from config import jira_config
+from data_corpus import DataCorpus, CorpusDataGenerator
+import payload_templates
+import derived_stats
+import rate_limit
+from log_utils import logger
+from scenario_executor import ConcurrentExecutor, raise_first_error
+from saturation_monitor import track_group
+from transactions import Transaction, transaction
+
+fake = Faker('en_US')
+
+_shared_session = None
+
+def create_session(pool_size=None, auth=None):
+    """
+    创建带认证信息和有界连接池的requests.Session
+    
+    Args:
+        pool_size: 连接池大小（默认使用API_POOL_SIZE）
+        auth: (用户名, 密钥)（默认使用全局配置的账号）
+        
+    Returns:
+        requests.Session: 会话对象
+    """
+    pool_size = pool_size or jira_config.api_pool_size
+    session = requests.Session()
+    session.auth = auth or jira_config.get_auth()
+    session.headers.update({
+        'Content-Type': 'application/json',
+        'Accept': 'application/json'
+    })
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+def get_shared_session():
+    """获取进程内共享的会话（所有JiraAPIClient共用一个连接池）"""
+    global _shared_session
+    if _shared_session is None:
+        _shared_session = create_session()
+    return _shared_session
+
+class BulkElementError(Exception):
+    """批量创建中单个元素失败"""
+
+class BulkCreateResult:
+    """
+    批量创建结果
+    
+    keys与输入顺序一一对应，创建失败的元素为None；errors为 {元素下标: 错误信息}
+    """
+    
+    def __init__(self, keys, errors, responses, elapsed_ms, chunk_size):
+        self.keys = keys
+        self.errors = errors
+        self.responses = responses
+        self.elapsed_ms = elapsed_ms
+        self.chunk_size = chunk_size
+    
+    @property
+    def created_keys(self):
+        return [key for key in self.keys if key]
+    
+    @property
+    def amortized_ms(self):
+        """均摊到每个issue的耗时（可与单条创建的响应时间直接比较）"""
+        return self.elapsed_ms / len(self.keys) if self.keys else 0.0
+    
+    def response_for(self, index):
+        """第index个元素所在分片的响应"""
+        return self.responses[index // self.chunk_size]
+
+def parse_bulk_create_response(status_code, data, count):
+    """
+    把批量创建的响应映射回请求中的各个元素
+    
+    Jira按请求顺序返回成功创建的issues，失败的元素通过errors[].failedElementNumber（从0开始）标识
+    
+    Args:
+        status_code: HTTP状态码
+        data: 响应JSON（无法解析时传入空字典）
+        count: 本次请求的元素数量
+        
+    Returns:
+        tuple: (与请求顺序对齐的issue_key列表, {元素下标: 错误信息})
+    """
+    errors = {}
+    for error in data.get('errors') or []:
+        index = error.get('failedElementNumber')
+        if not isinstance(index, int) or not 0 <= index < count:
+            continue
+        element_errors = error.get('elementErrors') or {}
+        messages = list((element_errors.get('errors') or {}).values()) + list(element_errors.get('errorMessages') or [])
+        errors[index] = "; ".join(messages) or f"HTTP {error.get('status', status_code)}"
+    
+    if status_code >= 400 and not errors:
+        # 整个请求被拒绝（超出上限、服务端错误等），全部元素记为失败
+        message = "; ".join(data.get('errorMessages') or []) or f"HTTP {status_code}"
+        return [None] * count, {index: message for index in range(count)}
+    
+    created = iter(data.get('issues') or [])
+    keys = []
+    for index in range(count):
+        if index in errors:
+            keys.append(None)
+            continue
+        issue = next(created, None)
+        if issue and issue.get('key'):
+            keys.append(issue['key'])
+        else:
+            keys.append(None)
+            errors[index] = "响应中缺少该元素的创建结果"
+    return keys, errors
+
+def report_bulk_elements(name, elapsed_ms, keys, errors, start_time):
+    """
+    把一次批量请求按元素上报到Locust统计
+    
+    每个元素记为一条BULK类型的派生记录（不计入Aggregated），响应时间为该次请求的均摊耗时，失败元素单独计入失败数
+    """
+    if not keys:
+        return
+    amortized_ms = elapsed_ms / len(keys)
+    for index, key in enumerate(keys):
+        derived_stats.report(
+            "BULK",
+            name,
+            amortized_ms,
+            exception=None if key else BulkElementError(errors.get(index, "创建失败")),
+            start_time=start_time
+        )
+
+# 分页预取的greenlet（计入负载生成器饱和检测的greenlet数）
+_prefetch_greenlets = track_group(Group())
+
+class SearchPageError(Exception):
+    """分页搜索中某一页请求失败"""
+
+class SearchPaginator:
+    """
+    按startAt逐页遍历搜索结果的迭代器，逐个产出issue，内存中最多保留当前页和预取的下一页
+    
+    fetch_page(start_at, max_results) 负责发起一页请求，返回 (状态码, 解析后的响应, 响应字节数)，
+    因此既可以使用JiraAPIClient，也可以使用Locust用户的HTTP客户端。
+    prefetch为True时，在调用方处理当前页的同时由另一个greenlet请求下一页
+    """
+    
+    def __init__(self, fetch_page, page_size=100, max_issues=None, prefetch=False):
+        if page_size < 1:
+            raise ValueError("page_size必须大于0")
+        self.fetch_page = fetch_page
+        self.page_size = page_size
+        self.max_issues = max_issues
+        self.prefetch = prefetch
+        self.pages = 0
+        self.issues = 0
+        self.bytes = 0
+        self.total = None
+    
+    def _fetch(self, start_at):
+        max_results = self.page_size
+        if self.max_issues is not None:
+            max_results = min(max_results, self.max_issues - start_at)
+        status_code, data, length = self.fetch_page(start_at, max_results)
+        self.pages += 1
+        self.bytes += length
+        if status_code != 200:
+            raise SearchPageError(f"分页搜索失败(startAt={start_at}): {status_code}")
+        self.total = data.get('total', 0)
+        return data
+    
+    def _has_more(self, next_start, page_issues):
+        if not page_issues or next_start >= self.total:
+            return False
+        return self.max_issues is None or next_start < self.max_issues
+    
+    def __iter__(self):
+        pending = None
+        try:
+            start_at = 0
+            page = self._fetch(start_at)
+            while True:
+                page_issues = page.get('issues', [])
+                # 服务端可能把maxResults限制得比请求的小，按实际返回的条数前进
+                next_start = start_at + len(page_issues)
+                has_more = self._has_more(next_start, page_issues)
+                if has_more and self.prefetch:
+                    pending = _prefetch_greenlets.spawn(self._fetch, next_start)
+                
+                for issue in page_issues:
+                    self.issues += 1
+                    yield issue
+                page = page_issues = None
+                
+                if not has_more:
+                    return
+                if pending is not None:
+                    page, pending = pending.get(), None
+                else:
+                    page = self._fetch(next_start)
+                start_at = next_start
+        finally:
+            # 调用方提前结束遍历时丢弃预取的页
+            if pending is not None:
+                pending.kill(block=False)
+
+def report_search_scan(name, elapsed_ms, paginator, start_time, exception=None):
+    """把一次完整的分页遍历上报为一条SCAN类型的派生记录（不计入Aggregated，响应大小为所有页的字节数之和）"""
+    derived_stats.report(
+        "SCAN",
+        name,
+        elapsed_ms,
+        response_length=paginator.bytes,
+        exception=exception,
+        start_time=start_time
+    )
+
+class JiraAPIClient:
+    """Jira API客户端"""
+    
+    def __init__(self, session=None):
+        self.config = jira_config
+        # 默认共享进程级连接池，而不是每个客户端各自打开一组连接
+        self.session = session or get_shared_session()
+        self.report_stats = self.config.api_report_stats
+    
+    def _request(self, method, url, name, **kwargs):
+        """
+        发送请求并向Locust上报统计（请求名称、耗时、响应大小）
+        
+        发送前经过进程级速率控制器；收到429时按Retry-After等待后重试，最多RATE_LIMIT_MAX_RETRIES次
+        
+        Args:
+            method: HTTP方法
+            url: 完整URL
+            name: Locust统计中的请求名称
+            
+        Returns:
+            requests.Response: 响应对象（重试用尽时为最后一次的429响应）
+        """
+        for attempt in range(self.config.rate_limit_max_retries + 1):
+            rate_limit.pacer.acquire()
+            response = self._send(method, url, name, **kwargs)
+            if rate_limit.handle_response(method, name, response, url=url) is None:
+                break
+        return response
+    
+    def _send(self, method, url, name, **kwargs):
+        """发送一次请求并上报统计"""
+        start_time = time.time()
+        start = time.perf_counter()
+        response = None
+        try:
+            response = self.session.request(method, url, **kwargs)
+        except Exception as e:
+            if self.report_stats:
+                events.request.fire(
+                    request_type=method,
+                    name=name,
+                    response_time=(time.perf_counter() - start) * 1000,
+                    response_length=0,
+                    response=None,
+                    context={},
+                    exception=e,
+                    start_time=start_time,
+                    url=url
+                )
+            raise
+        
+        if self.report_stats:
+            exception = None
+            if response.status_code >= 400:
+                exception = requests.HTTPError(f"{response.status_code} {response.reason}", response=response)
+            events.request.fire(
+                request_type=method,
+                name=name,
+                response_time=(time.perf_counter() - start) * 1000,
+                response_length=len(response.content),
+                response=response,
+                context={},
+                exception=exception,
+                start_time=start_time,
+                url=url
+            )
+        return response
+    
+    def create_issue(self, summary=None, description=None, issue_type=None, project_key=None, priority=None, name=None):
+        """
+        创建安全事件
+        
+        Args:
+            summary: 安全事件标题
+            description: 安全事件描述
+            issue_type: 安全事件类型
+            project_key: 项目key
+            priority: 优先级
+            name: Locust统计中的请求名称
+            
+        Returns:
+            tuple: (response对象, issue_key或None)
+        """
+        if not summary:
+            summary = data_generator.generate_security_incident_summary()
+        
+        if not description:
+            description = data_generator.generate_security_incident_description()
+        
+        if not issue_type:
+            issue_type = self.config.default_issue_type
+            
+        if not project_key:
+            project_key = self.config.project_key
+        
+        # 固定部分（项目、类型、优先级）已预先编码，只序列化标题和描述
+        payload = payload_templates.create_issue_payload(
+            summary, description, project_key=project_key, issue_type=issue_type, priority=priority
+        )
+        
+        url = f"{self.config.api_url}/issue"
+        
+        try:
+            response = self._request("POST", url, name or "创建安全事件", data=payload)
+            
+            if response.status_code == 201:
+                issue_data = response.json()
+                return response, issue_data.get('key')
+            else:
+                logger.warning("api.create_failed", "创建安全事件失败: {status_code} - {body}",
+                               status_code=response.status_code, body=response.text)
+                return response, None
+                
+        except Exception as e:
+            logger.error("api.create_error", "创建安全事件异常: {error}", error=str(e))
+            raise
+    
+    def create_issues_bulk(self, issues=None, count=None, project_key=None, chunk_size=None, name=None):
+        """
+        通过 /issue/bulk 批量创建安全事件，超过服务端上限时自动分片
+        
+        Args:
+            issues: 元素为字典的列表，包含summary、description，可选issue_type、priority
+            count: 未提供issues时随机生成的数量
+            project_key: 项目key
+            chunk_size: 单次请求的最大issue数（默认使用BULK_CREATE_MAX_ISSUES）
+            name: Locust统计中的请求名称；每个元素的均摊耗时以"<name>(每条)"上报
+            
+        Returns:
+            BulkCreateResult: 按元素对齐的创建结果
+        """
+        if issues is None:
+            issues = [
+                {
+                    'summary': data_generator.generate_security_incident_summary(),
+                    'description': data_generator.generate_security_incident_description()
+                }
+                for i in range(count or self.config.bulk_create_batch_size)
+            ]
+        
+        if not project_key:
+            project_key = self.config.project_key
+        
+        chunk_size = chunk_size or self.config.bulk_create_max_issues
+        name = name or "批量创建安全事件"
+        url = f"{self.config.api_url}/issue/bulk"
+        
+        keys = []
+        errors = {}
+        responses = []
+        elapsed_ms = 0.0
+        
+        for offset in range(0, len(issues), chunk_size):
+            chunk = issues[offset:offset + chunk_size]
+            payload = payload_templates.bulk_create_payload([
+                payload_templates.create_issue_payload(
+                    issue['summary'],
+                    issue['description'],
+                    project_key=project_key,
+                    issue_type=issue.get('issue_type') or self.config.default_issue_type,
+                    priority=issue.get('priority')
+                )
+                for issue in chunk
+            ])
+            
+            start_time = time.time()
+            start = time.perf_counter()
+            try:
+                response = self._request("POST", url, name, data=payload)
+            except Exception as e:
+                logger.error("api.bulk_create_error", "批量创建安全事件异常: {error}", error=str(e))
+                raise
+            chunk_ms = (time.perf_counter() - start) * 1000
+            
+            try:
+                data = response.json()
+            except ValueError:
+                data = {}
+            chunk_keys, chunk_errors = parse_bulk_create_response(response.status_code, data, len(chunk))
+            
+            if chunk_errors:
+                logger.warning("api.bulk_create_failed", "批量创建部分失败: {failed}/{total} - {error}",
+                               failed=len(chunk_errors), total=len(chunk),
+                               error=next(iter(chunk_errors.values())))
+            if self.report_stats:
+                report_bulk_elements(f"{name}(每条)", chunk_ms, chunk_keys, chunk_errors, start_time)
+            
+            keys.extend(chunk_keys)
+            errors.update({offset + index: message for index, message in chunk_errors.items()})
+            responses.append(response)
+            elapsed_ms += chunk_ms
+        
+        return BulkCreateResult(keys, errors, responses, elapsed_ms, chunk_size)
+    
+    def get_issue(self, issue_key, name=None):
+        """
+        获取安全事件详情
+        
+        Args:
+            issue_key: 安全事件的key
+            name: Locust统计中的请求名称
+            
+        Returns:
+            requests.Response: 响应对象
+        """
+        url = f"{self.config.api_url}/issue/{issue_key}"
+        
+        try:
+            response = self._request("GET", url, name or "获取安全事件")
+            return response
+        except Exception as e:
+            logger.error("api.get_error", "获取安全事件异常: {error}", error=str(e))
+            raise
+    
+    def add_comment(self, issue_key, comment_body=None, name=None):
+        """
+        为安全事件添加处理记录
+        
+        Args:
+            issue_key: 安全事件的key
+            comment_body: 处理记录内容
+            name: Locust统计中的请求名称
+            
+        Returns:
+            requests.Response: 响应对象
+        """
+        if not comment_body:
+            comment_body = data_generator.generate_security_comment()
+        
+        payload = payload_templates.comment_payload(comment_body)
+        
+        url = f"{self.config.api_url}/issue/{issue_key}/comment"
+        
+        try:
+            response = self._request("POST", url, name or "添加处理记录", data=payload)
+            return response
+        except Exception as e:
+            logger.error("api.comment_error", "添加处理记录异常: {error}", error=str(e))
+            raise
+    
+    def search_issues(self, jql="project = SOC ORDER BY created DESC", max_results=50, name=None, start_at=0,
+                      fields=None):
+        """
+        搜索安全事件
+        
+        Args:
+            jql: JQL查询语句
+            max_results: 最大返回结果数
+            name: Locust统计中的请求名称
+            start_at: 结果的起始偏移
+            fields: 返回的字段列表
+            
+        Returns:
+            requests.Response: 响应对象
+        """
+        payload = {
+            "jql": jql,
+            "startAt": start_at,
+            "maxResults": max_results,
+            "fields": fields or ["key", "summary", "status", "created", "priority"]
+        }
+        
+        url = f"{self.config.api_url}/search"
+        
+        try:
+            response = self._request("POST", url, name or "搜索安全事件", data=payload_templates.dumps(payload))
+            return response
+        except Exception as e:
+            logger.error("api.search_error", "搜索安全事件异常: {error}", error=str(e))
+            raise
+    
+    def iter_search_issues(self, jql, page_size=100, max_issues=None, prefetch=False, fields=None, name=None):
+        """
+        分页遍历搜索结果
+        
+        Args:
+            jql: JQL查询语句
+            page_size: 每页的issue数
+            max_issues: 最多遍历的issue数（None为全部）
+            prefetch: 是否在处理当前页时预取下一页
+            fields: 返回的字段列表
+            name: Locust统计中每页请求的名称
+            
+        Returns:
+            SearchPaginator: 逐个产出issue的迭代器，遍历结束后可读取pages、bytes、total
+        """
+        name = name or "分页搜索安全事件"
+        
+        def fetch_page(start_at, max_results):
+            response = self.search_issues(jql, max_results, name=name, start_at=start_at, fields=fields)
+            data = response.json() if response.status_code == 200 else {}
+            return response.status_code, data, len(response.content)
+        
+        return SearchPaginator(fetch_page, page_size, max_issues, prefetch)
+    
+    def get_project_info(self, project_key=None, name=None):
+        """
+        获取项目信息
+        
+        Args:
+            project_key: 项目key
+            name: Locust统计中的请求名称
+            
+        Returns:
+            requests.Response: 响应对象
+        """
+        if not project_key:
+            project_key = self.config.project_key
+            
+        url = f"{self.config.api_url}/project/{project_key}"
+        
+        try:
+            response = self._request("GET", url, name or "获取项目信息")
+            return response
+        except Exception as e:
+            logger.error("api.project_error", "获取项目信息异常: {error}", error=str(e))
+            raise
+    
+    def get_priorities(self, name=None):
+        """
+        获取Jira中定义的全部优先级
+        
+        Args:
+            name: Locust统计中的请求名称
+            
+        Returns:
+            requests.Response: 响应对象
+        """
+        url = f"{self.config.api_url}/priority"
+        
+        try:
+            response = self._request("GET", url, name or "获取优先级列表")
+            return response
+        except Exception as e:
+            logger.error("api.priority_list_error", "获取优先级列表异常: {error}", error=str(e))
+            raise
+    
+    def get_transitions(self, issue_key, name=None):
+        """
+        获取安全事件当前可用的状态转换
+        
+        Args:
+            issue_key: 安全事件的key
+            name: Locust统计中的请求名称
+            
+        Returns:
+            requests.Response: 响应对象
+        """
+        url = f"{self.config.api_url}/issue/{issue_key}/transitions"
+        
+        try:
+            response = self._request("GET", url, name or "获取状态转换")
+            return response
+        except Exception as e:
+            logger.error("api.transition_list_error", "获取状态转换列表异常: {error}", error=str(e))
+            raise
+    
+    def update_issue(self, issue_key, fields_to_update, name=None):
+        """
+        更新安全事件
+        
+        Args:
+            issue_key: 安全事件的key
+            fields_to_update: 要更新的字段字典
+            name: Locust统计中的请求名称
+            
+        Returns:
+            requests.Response: 响应对象
+        """
+        payload = {
+            "fields": fields_to_update
+        }
+        
+        url = f"{self.config.api_url}/issue/{issue_key}"
+        
+        try:
+            response = self._request("PUT", url, name or "更新安全事件", data=payload_templates.dumps(payload))
+            return response
+        except Exception as e:
+            logger.error("api.update_error", "更新安全事件异常: {error}", error=str(e))
+            raise
+    
+    def assign_incident(self, issue_key, assignee, name=None):
+        """
+        分配安全事件给分析师
+        
+        Args:
+            issue_key: 安全事件的key
+            assignee: 分析师用户名
+            name: Locust统计中的请求名称
+            
+        Returns:
+            requests.Response: 响应对象
+        """
+        payload = payload_templates.assign_payload(assignee)
+        
+        url = f"{self.config.api_url}/issue/{issue_key}"
+        
+        try:
+            response = self._request("PUT", url, name or "分配安全事件", data=payload)
+            return response
+        except Exception as e:
+            logger.error("api.assign_error", "分配安全事件异常: {error}", error=str(e))
+            raise
+    
+    def update_incident_priority(self, issue_key, priority, name=None):
+        """
+        更新安全事件优先级
+        
+        Args:
+            issue_key: 安全事件的key
+            priority: 优先级 (Critical, High, Medium, Low)
+            name: Locust统计中的请求名称
+            
+        Returns:
+            requests.Response: 响应对象
+        """
+        payload = payload_templates.priority_payload(priority)
+        
+        url = f"{self.config.api_url}/issue/{issue_key}"
+        
+        try:
+            response = self._request("PUT", url, name or "更新事件优先级", data=payload)
+            return response
+        except Exception as e:
+            logger.error("api.priority_error", "更新事件优先级异常: {error}", error=str(e))
+            raise
+    
+    def transition_incident_status(self, issue_key, transition_id, comment=None, name=None):
+        """
+        转换安全事件状态（如：New -> Investigating -> Resolved）
+        
+        Args:
+            issue_key: 安全事件的key
+            transition_id: 状态转换ID
+            comment: 状态转换说明
+            name: Locust统计中的请求名称
+            
+        Returns:
+            requests.Response: 响应对象
+        """
+        payload = payload_templates.transition_payload(transition_id, comment)
+        
+        url = f"{self.config.api_url}/issue/{issue_key}/transitions"
+        
+        try:
+            response = self._request("POST", url, name or "状态转换", data=payload)
+            return response
+        except Exception as e:
+            logger.error("api.transition_error", "状态转换异常: {error}", error=str(e))
+            raise
+    
+    def create_incident_from_wazuh(self, wazuh_data, issue_type=None, name=None):
+        """
+        根据Wazuh告警数据创建安全事件
+        
+        Args:
+            wazuh_data: Wazuh告警数据字典
+            issue_type: 安全事件类型（默认Security Incident）
+            name: Locust统计中的请求名称
+            
+        Returns:
+            tuple: (response对象, issue_key或None)
+        """
+        fields = self.wazuh_incident_fields(wazuh_data)
+        if issue_type:
+            fields['issue_type'] = issue_type
+        return self.create_issue(**fields, name=name)
+    
+    @staticmethod
+    def wazuh_incident_fields(wazuh_data):
+        """
+        把Wazuh告警数据转换为安全事件字段（单条创建和批量创建共用）
+        
+        Args:
+            wazuh_data: Wazuh告警数据字典
+            
+        Returns:
+            dict: summary、description、issue_type、priority
+        """
+        # 根据Wazuh数据构造事件标题和描述
+        rule_id = wazuh_data.get('rule_id', 'Unknown')
+        level = wazuh_data.get('level', 0)
+        description = wazuh_data.get('description', 'No description')
+        agent = wazuh_data.get('agent', {})
+        
+        summary = f"Wazuh Alert {rule_id}: {description}"
+        
+        incident_description = f"""
+Wazuh Security Alert
+
+Rule ID: {rule_id}
+Alert Level: {level}
+Description: {description}
+Agent: {agent.get('name', 'Unknown')} ({agent.get('ip', 'Unknown')})
+Timestamp: {wazuh_data.get('timestamp', 'Unknown')}
+
+Raw Alert Data:
+{json.dumps(wazuh_data, indent=2)}
+        """
+        
+        # 根据告警级别设置优先级
+        priority_map = {
+            15: "Critical",
+            12: "High", 
+            10: "High",
+            7: "Medium",
+            5: "Medium", 
+            3: "Low",
+            1: "Low"
+        }
+        
+        priority = priority_map.get(level, "Medium")
+        
+        return {
+            'summary': summary.strip(),
+            'description': incident_description.strip(),
+            'issue_type': "Security Incident",
+            'priority': priority
+        }
+
+# 生成SOC安全事件测试数据的辅助函数
+class SecurityDataGenerator:
+    """SOC安全事件数据生成器"""
+    
+    # 威胁类型和攻击向量
+    THREAT_TYPES = [
+        "Malware Detection", "Network Intrusion", "Suspicious Login", 
+        "Data Exfiltration", "Phishing Attempt", "Vulnerability Exploit",
+        "Brute Force Attack", "DDoS Attack", "Insider Threat", "APT Activity"
+    ]
+    
+    ATTACK_VECTORS = [
+        "Email", "Web Application", "Network", "Endpoint", "Cloud Services",
+        "Remote Access", "Mobile Device", "IoT Device", "Database", "API"
+    ]
+    
+    IOC_TYPES = [
+        "IP Address", "Domain Name", "File Hash", "URL", "Email Address",
+        "Registry Key", "Process Name", "User Account", "Certificate"
+    ]
+    
+    SEVERITY_LEVELS = ["Critical", "High", "Medium", "Low", "Info"]
+    
+    @staticmethod
+    def generate_security_incident_summary():
+        """生成安全事件标题"""
+        threat_type = fake.random_element(SecurityDataGenerator.THREAT_TYPES)
+        attack_vector = fake.random_element(SecurityDataGenerator.ATTACK_VECTORS)
+        
+        templates = [
+            f"{threat_type} detected via {attack_vector}",
+            f"Suspicious {threat_type} activity on {attack_vector}",
+            f"Alert: {threat_type} targeting {attack_vector}",
+            f"Security Event: {threat_type} through {attack_vector}",
+            f"Incident: Potential {threat_type} using {attack_vector}"
+        ]
+        
+        return fake.random_element(templates)
+    
+    @staticmethod
+    def generate_security_incident_description():
+        """生成安全事件描述"""
+        source_ip = fake.ipv4()
+        dest_ip = fake.ipv4()
+        timestamp = fake.date_time_between(start_date='-7d', end_date='now')
+        user_agent = fake.user_agent()
+        
+        templates = [
+            f"Wazuh Alert Details:\n"
+            f"- Timestamp: {timestamp}\n"
+            f"- Source IP: {source_ip}\n"
+            f"- Destination IP: {dest_ip}\n"
+            f"- User Agent: {user_agent}\n"
+            f"- Rule ID: {fake.random_int(min=1000, max=9999)}\n"
+            f"- Alert Level: {fake.random_int(min=1, max=15)}\n"
+            f"- Description: {fake.sentence()}",
+            
+            f"SIEM Alert Triggered:\n"
+            f"- Event Time: {timestamp}\n"
+            f"- Affected Asset: {fake.hostname()}\n"
+            f"- Source: {source_ip}\n"
+            f"- IOC: {SecurityDataGenerator.generate_ioc()}\n"
+            f"- Risk Score: {fake.random_int(min=1, max=100)}\n"
+            f"- Additional Context: {fake.text(max_nb_chars=100)}",
+            
+            f"Security Event Detected:\n"
+            f"- Detection Time: {timestamp}\n"
+            f"- Endpoint: {fake.hostname()}\n"
+            f"- Process: {fake.file_name()}\n"
+            f"- Command Line: {fake.text(max_nb_chars=80)}\n"
+            f"- Hash: {fake.sha256()}\n"
+            f"- Analyst Notes: Initial triage required"
+        ]
+        
+        return fake.random_element(templates)
+    
+    @staticmethod
+    def generate_security_comment():
+        """生成安全处理记录"""
+        analyst_name = fake.first_name()
+        
+        templates = [
+            f"[{analyst_name}] Initial triage completed. {fake.sentence()} Escalating to L2 for further analysis.",
+            f"[{analyst_name}] Investigation in progress. {fake.sentence()} Checking threat intelligence feeds.",
+            f"[{analyst_name}] False positive confirmed. {fake.sentence()} Updating detection rules to reduce noise.",
+            f"[{analyst_name}] Containment actions taken. {fake.sentence()} Monitoring for additional indicators.",
+            f"[{analyst_name}] Incident resolved. {fake.sentence()} Root cause analysis completed.",
+            f"[{analyst_name}] IOC analysis: {SecurityDataGenerator.generate_ioc()} - {fake.sentence()}",
+            f"[{analyst_name}] Timeline analysis: {fake.sentence()} Event correlation with other incidents ongoing.",
+            f"[{analyst_name}] User behavior analysis: {fake.sentence()} No anomalies detected in recent activity.",
+            f"[{analyst_name}] Network forensics: {fake.sentence()} Packet capture analysis in progress.",
+            f"[{analyst_name}] Malware analysis: {fake.sentence()} Sandbox execution results attached."
+        ]
+        
+        return fake.random_element(templates)
+    
+    @staticmethod
+    def generate_ioc():
+        """生成威胁指标"""
+        ioc_type = fake.random_element(SecurityDataGenerator.IOC_TYPES)
+        
+        ioc_generators = {
+            "IP Address": lambda: fake.ipv4(),
+            "Domain Name": lambda: fake.domain_name(),
+            "File Hash": lambda: fake.sha256(),
+            "URL": lambda: fake.url(),
+            "Email Address": lambda: fake.email(),
+            "Registry Key": lambda: f"HKEY_LOCAL_MACHINE\\{fake.word()}\\{fake.word()}",
+            "Process Name": lambda: f"{fake.word()}.exe",
+            "User Account": lambda: fake.user_name(),
+            "Certificate": lambda: f"CN={fake.company()}, O={fake.company()}"
+        }
+        
+        ioc_value = ioc_generators.get(ioc_type, lambda: fake.word())()
+        return f"{ioc_type}: {ioc_value}"
+    
+    @staticmethod
+    def generate_wazuh_alert_data():
+        """生成Wazuh告警数据格式"""
+        return {
+            "rule_id": fake.random_int(min=1000, max=99999),
+            "level": fake.random_int(min=1, max=15),
+            "description": fake.sentence(),
+            "groups": [fake.word(), fake.word()],
+            "timestamp": fake.date_time_between(start_date='-1d', end_date='now').isoformat(),
+            "agent": {
+                "id": f"{fake.random_int(min=1, max=1000):03d}",
+                "name": fake.hostname(),
+                "ip": fake.ipv4()
+            },
+            "data": {
+                "srcip": fake.ipv4(),
+                "dstip": fake.ipv4(),
+                "srcport": fake.random_int(min=1024, max=65535),
+                "dstport": fake.random_int(min=1, max=1023),
+                "protocol": fake.random_element(["TCP", "UDP", "ICMP"]),
+                "action": fake.random_element(["ALLOW", "DENY", "DROP"])
+            }
+        }
+    
+    @staticmethod
+    def generate_soc_jql_queries():
+        """生成SOC常用的JQL查询语句"""
+        project_key = jira_config.project_key
+        
+        queries = [
+            f'project = {project_key} AND priority = "Critical" AND status != "Resolved" ORDER BY created DESC',
+            f'project = {project_key} AND summary ~ "Malware" AND created >= -24h ORDER BY priority DESC',
+            f'project = {project_key} AND assignee = currentUser() AND status = "In Progress" ORDER BY updated DESC',
+            f'project = {project_key} AND labels in ("APT", "targeted-attack") ORDER BY created DESC',
+            f'project = {project_key} AND status = "New" AND created >= -8h ORDER BY priority DESC, created DESC',
+            f'project = {project_key} AND description ~ "phishing" AND created >= -7d ORDER BY created DESC',
+            f'project = {project_key} AND priority in ("Critical", "High") AND assignee is EMPTY ORDER BY created ASC',
+            f'project = {project_key} AND summary ~ "brute.force" AND resolved >= -30d ORDER BY resolved DESC'
+        ]
+        
+        return fake.random_element(queries)
+
+def _select_data_generator():
+    """根据配置选择数据生成器：预生成语料库或实时Faker"""
+    corpus_path = jira_config.data_corpus_path
+    if not corpus_path:
+        return SecurityDataGenerator
+    if not os.path.exists(corpus_path):
+        logger.warning("corpus.missing", "语料库文件 {path} 不存在，使用实时Faker生成数据", path=corpus_path)
+        return SecurityDataGenerator
+    return CorpusDataGenerator(DataCorpus(corpus_path))
+
+# 请求路径上使用的数据生成器（语料库模式下不调用Faker）
+data_generator = _select_data_generator()
+
+# SOC测试场景辅助类
+class SOCTestScenarios:
+    """SOC测试场景生成器"""
+    
+    # 真实SOC工作负载中各优先级事件的占比
+    INCIDENT_DISTRIBUTION = {
+        'Critical': 0.05,
+        'High': 0.15,
+        'Medium': 0.35,
+        'Low': 0.35,
+        'Info': 0.10
+    }
+    
+    def __init__(self, jira_client, concurrency=None):
+        """
+        Args:
+            jira_client: JiraAPIClient实例
+            concurrency: 批量场景的最大并发调用数（默认使用SCENARIO_CONCURRENCY，1为顺序执行）
+        """
+        self.jira_client = jira_client
+        self.executor = ConcurrentExecutor(concurrency or jira_config.scenario_concurrency)
+    
+    def simulate_wazuh_batch_alerts(self, batch_size=10, bulk=False):
+        """
+        模拟Wazuh批量告警导入
+        
+        Args:
+            batch_size: 批量大小
+            bulk: 是否通过 /issue/bulk 一次性推送（与SIEM集成的实际行为一致）
+            
+        Returns:
+            list: 创建的安全事件列表（每项包含该次调用的耗时latency_ms，批量模式下为均摊耗时）
+        """
+        created_incidents = []
+        
+        alerts = [data_generator.generate_wazuh_alert_data() for i in range(batch_size)]
+        
+        if bulk:
+            result = self.jira_client.create_issues_bulk(
+                [self.jira_client.wazuh_incident_fields(alert) for alert in alerts]
+            )
+            for index, issue_key in enumerate(result.keys):
+                if issue_key:
+                    created_incidents.append({
+                        'issue_key': issue_key,
+                        'wazuh_data': alerts[index],
+                        'response': result.response_for(index),
+                        'latency_ms': result.amortized_ms
+                    })
+            return created_incidents
+        
+        results = self.executor.run(self.jira_client.create_incident_from_wazuh, alerts)
+        raise_first_error(results)
+        
+        for result in results:
+            response, issue_key = result.value
+            
+            if issue_key:
+                created_incidents.append({
+                    'issue_key': issue_key,
+                    'wazuh_data': result.item,
+                    'response': response,
+                    'latency_ms': result.latency_ms
+                })
+        
+        return created_incidents
+    
+    def simulate_shift_handover(self, outgoing_analyst, incoming_analyst, incident_keys):
+        """
+        模拟值班交接场景
+        
+        Args:
+            outgoing_analyst: 交班分析师
+            incoming_analyst: 接班分析师
+            incident_keys: 需要交接的事件列表
+            
+        Returns:
+            list: 交接结果（每项包含该事件交接的总耗时latency_ms，同时上报为TXN统计"值班交接"）
+        """
+        def handover(incident_key):
+            # 每个事件的交接作为一个事务（事务按greenlet跟踪，需在执行器的池中开启）
+            with Transaction("值班交接"):
+                # 添加交接记录
+                handover_comment = f"Shift handover from {outgoing_analyst} to {incoming_analyst}. " \
+                                 f"Current status and investigation notes transferred. " \
+                                 f"{fake.sentence()}"
+                
+                comment_response = self.jira_client.add_comment(incident_key, handover_comment)
+                
+                # 重新分配给接班分析师
+                assign_response = self.jira_client.assign_incident(incident_key, incoming_analyst)
+            
+            return comment_response, assign_response
+        
+        # 同一事件的评论和分配按顺序执行，不同事件之间并发
+        results = self.executor.run(handover, incident_keys)
+        raise_first_error(results)
+        
+        handover_results = []
+        for result in results:
+            comment_response, assign_response = result.value
+            handover_results.append({
+                'incident_key': result.item,
+                'comment_response': comment_response,
+                'assign_response': assign_response,
+                'latency_ms': result.latency_ms
+            })
+        
+        return handover_results
+    
+    @transaction("事件升级")
+    def simulate_incident_escalation(self, incident_key, from_priority, to_priority, reason=None):
+        """
+        模拟事件升级场景（更新优先级与升级说明上报为一个TXN统计"事件升级"）
+        
+        Args:
+            incident_key: 事件key
+            from_priority: 原优先级
+            to_priority: 新优先级
+            reason: 升级原因
+            
+        Returns:
+            dict: 升级结果
+        """
+        if not reason:
+            reason = f"Escalation required due to {fake.sentence()}"
+        
+        # 更新优先级
+        priority_response = self.jira_client.update_incident_priority(incident_key, to_priority)
+        
+        # 添加升级说明
+        escalation_comment = f"Priority escalated from {from_priority} to {to_priority}. " \
+                           f"Reason: {reason} " \
+                           f"Escalation time: {fake.date_time_between(start_date='-1h', end_date='now')}"
+        
+        comment_response = self.jira_client.add_comment(incident_key, escalation_comment)
+        
+        return {
+            'incident_key': incident_key,
+            'priority_response': priority_response,
+            'comment_response': comment_response,
+            'escalation_reason': reason
+        }
+    
+    @classmethod
+    def incident_distribution(cls, num_incidents):
+        """按INCIDENT_DISTRIBUTION计算各优先级的事件数量"""
+        return {priority: int(num_incidents * ratio) for priority, ratio in cls.INCIDENT_DISTRIBUTION.items()}
+    
+    def generate_realistic_soc_workload(self, num_incidents=50, distribution=None, raise_errors=True):
+        """
+        生成真实的SOC工作负载数据
+        
+        Args:
+            num_incidents: 要生成的事件数量
+            distribution: 各优先级的事件数量（默认按INCIDENT_DISTRIBUTION由num_incidents计算）
+            raise_errors: 为False时不抛出创建异常，返回已创建的部分结果（errors为各异常的信息）
+            
+        Returns:
+            dict: 生成的工作负载统计（latencies_ms为每次创建调用的耗时）
+        """
+        incident_distribution = distribution or self.incident_distribution(num_incidents)
+        
+        created_incidents = {priority: [] for priority in incident_distribution}
+        
+        def create(priority):
+            summary = data_generator.generate_security_incident_summary()
+            description = data_generator.generate_security_incident_description()
+            
+            response, issue_key = self.jira_client.create_issue(
+                summary=summary,
+                description=description,
+                issue_type="Security Incident",
+                priority=priority
+            )
+            return issue_key
+        
+        priorities = [priority for priority, count in incident_distribution.items() for i in range(count)]
+        results = self.executor.run(create, priorities)
+        if raise_errors:
+            raise_first_error(results)
+        
+        for result in results:
+            if result.value:
+                created_incidents[result.item].append(result.value)
+        
+        return {
+            'total_created': sum(len(incidents) for incidents in created_incidents.values()),
+            'distribution': {k: len(v) for k, v in created_incidents.items()},
+            'incidents': created_incidents,
+            'latencies_ms': [result.latency_ms for result in results],
+            'errors': [str(result.error) for result in results if result.error is not None]
         }
\ No newline at end of file
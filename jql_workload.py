@@ -0,0 +1,159 @@
+"""
+JQL查询负载模型
+从JSON文件加载带权重的JQL查询模板，每次搜索按权重选择一个模板并用参数生成器填充，
+每个模板使用独立的统计名称，便于区分是哪类查询（全文检索 ~、assignee is EMPTY、ORDER BY priority 等）拖慢了搜索。
+
+文件格式（参见 jql_workload.example.json）:
+    {
+      "params": {"window": {"type": "date", "min": 1, "max": 7, "unit": "d"}},
+      "templates": [
+        {"name": "未分配高优先级", "weight": 3,
+         "jql": "project = {project} AND priority in ({priorities}) AND assignee is EMPTY ORDER BY priority DESC",
+         "params": {"priorities": {"type": "choice", "values": ["Critical", "High"], "count": 2}}}
+      ]
+    }
+
+模板中的 {project} 固定替换为PROJECT_KEY；params可写在顶层（所有模板共享）或模板内（覆盖同名的顶层参数）。
+参数类型:
+    choice:  从values中随机取count个（默认1个）不重复的值，quote为true（默认）时加双引号，以逗号分隔
+    text:    从terms中随机取一个词，转义其中的双引号（用于 summary ~ "{term}"）
+    date:    相对时间，-N加单位，N在[min, max]之间，unit默认d（如 -3d）
+    integer: [min, max]之间的整数
+"""
+import json
+import random
+from itertools import accumulate
+
+import payload_templates
+
+DEFAULT_FIELDS = ["key", "summary", "status", "created"]
+DEFAULT_MAX_RESULTS = 20
+
+
+def _choice(spec):
+    values = spec["values"]
+    count = int(spec.get("count", 1))
+    quote = spec.get("quote", True)
+    if not values or not 1 <= count <= len(values):
+        raise ValueError(f"choice参数的count必须在1到{len(values)}之间")
+
+    def generate():
+        picked = random.sample(values, count) if count > 1 else [random.choice(values)]
+        return ", ".join(f'"{value}"' if quote else str(value) for value in picked)
+    return generate
+
+
+def _text(spec):
+    terms = spec["terms"]
+    if not terms:
+        raise ValueError("text参数的terms不能为空")
+    return lambda: random.choice(terms).replace('"', '\\"')
+
+
+def _date(spec):
+    low, high = int(spec.get("min", 1)), int(spec.get("max", 7))
+    unit = spec.get("unit", "d")
+    if unit not in ("m", "h", "d", "w"):
+        raise ValueError(f"date参数不支持的单位: {unit}")
+    return lambda: f"-{random.randint(low, high)}{unit}"
+
+
+def _integer(spec):
+    low, high = int(spec["min"]), int(spec["max"])
+    return lambda: str(random.randint(low, high))
+
+
+PARAM_TYPES = {
+    "choice": _choice,
+    "text": _text,
+    "date": _date,
+    "integer": _integer,
+}
+
+
+def build_generator(name, spec):
+    """按参数定义创建生成器（无参数函数，返回填入JQL的字符串）"""
+    try:
+        factory = PARAM_TYPES[spec["type"]]
+    except KeyError:
+        raise ValueError(f"JQL参数 {name} 的类型必须为: {', '.join(PARAM_TYPES)}") from None
+    try:
+        return factory(spec)
+    except (KeyError, TypeError, ValueError) as e:
+        raise ValueError(f"JQL参数 {name} 定义错误: {e}") from None
+
+
+class JqlTemplate:
+    """一个带权重的JQL查询模板"""
+
+    def __init__(self, name, jql, weight=1.0, params=None, project_key="", max_results=DEFAULT_MAX_RESULTS,
+                 fields=None, stat_name=None):
+        if weight <= 0:
+            raise ValueError(f"JQL模板 {name} 的权重必须大于0")
+        self.name = name
+        self.jql = jql
+        self.weight = weight
+        self.params = params or {}
+        self.project_key = project_key
+        self.max_results = max_results
+        self.fields = fields or DEFAULT_FIELDS
+        self.stat_name = stat_name or f"搜索Issues[{name}]"
+        # 加载时渲染一次，尽早发现模板中未定义的参数
+        self.render()
+
+    def render(self):
+        """生成一条JQL"""
+        values = {name: generate() for name, generate in self.params.items()}
+        values["project"] = self.project_key
+        try:
+            return self.jql.format_map(values)
+        except KeyError as e:
+            raise ValueError(f"JQL模板 {self.name} 使用了未定义的参数: {e.args[0]}") from None
+
+    def payload(self):
+        """生成 /rest/api/2/search 的请求体"""
+        return payload_templates.dumps({
+            "jql": self.render(),
+            "maxResults": self.max_results,
+            "fields": self.fields
+        })
+
+
+class JqlWorkload:
+    """按权重选择查询模板"""
+
+    def __init__(self, templates):
+        if not templates:
+            raise ValueError("JQL负载中至少需要一个模板")
+        self.templates = templates
+        self._cum_weights = list(accumulate(template.weight for template in templates))
+
+    def choose(self):
+        return random.choices(self.templates, cum_weights=self._cum_weights)[0]
+
+    @classmethod
+    def from_spec(cls, spec, project_key):
+        shared = spec.get("params", {})
+        templates = []
+        for item in spec.get("templates", []):
+            param_specs = {**shared, **item.get("params", {})}
+            templates.append(JqlTemplate(
+                name=item["name"],
+                jql=item["jql"],
+                weight=float(item.get("weight", 1)),
+                params={name: build_generator(name, param) for name, param in param_specs.items()},
+                project_key=project_key,
+                max_results=int(item.get("max_results", DEFAULT_MAX_RESULTS)),
+                fields=item.get("fields"),
+                stat_name=item.get("stat_name"),
+            ))
+        return cls(templates)
+
+    @classmethod
+    def load(cls, path, project_key):
+        with open(path, encoding="utf-8") as f:
+            spec = json.load(f)
+        try:
+            return cls.from_spec(spec, project_key)
+        except KeyError as e:
+            raise ValueError(f"JQL负载文件 {path} 中的模板缺少字段: {e.args[0]}") from None
@@ -0,0 +1,337 @@
+"""
+SOC流量模式的负载曲线（LoadTestShape）
+阶梯加压、告警风暴突发、长时间浸泡、带交接班高峰的昼夜曲线，以及按SLO自动寻找容量的搜索曲线，
+参数来自 LOAD_SHAPE / SHAPE_PARAMS。
+
+每个阶段指定用户数、启动速率和本阶段启动的用户类型。Locust切换用户类型时只影响新启动的用户，
+减少用户时后启动的先停止，因此突发阶段叠加的用户会在突发结束时最先被移除。
+
+locustfile.py只在设置了LOAD_SHAPE时定义对应的子类（Locust会自动使用locustfile中的任意LoadTestShape），
+并通过user_class_map把 JiraUser / JiraHeavyUser / JiraReadOnlyUser 映射到当前HTTP客户端的具体用户类。
+"""
+import math
+from abc import abstractmethod
+from collections import namedtuple
+
+from locust import LoadTestShape
+
+from capacity_search import CapacitySearch, Slo, measure, print_report, snapshot, write_csv
+from config import jira_config
+from log_utils import logger
+
+# 一个阶段: 结束时间（秒，从测试开始算）、用户数、启动速率、本阶段启动的用户类名
+Stage = namedtuple("Stage", ["end_time", "users", "spawn_rate", "user_classes"])
+
+
+def parse_shape_params(spec):
+    """解析 'step_users=10;steps=5;classes=JiraUser+JiraReadOnlyUser' 格式的曲线参数"""
+    params = {}
+    for item in spec.split(';'):
+        item = item.strip()
+        if not item:
+            continue
+        key, sep, value = item.partition('=')
+        if not sep:
+            raise ValueError(f"SHAPE_PARAMS格式错误: {item}")
+        params[key.strip()] = value.strip()
+    return params
+
+
+class SocLoadShape(LoadTestShape):
+    """SOC负载曲线基类：参数 = defaults + SHAPE_PARAMS，子类实现tick"""
+
+    # 形如 {'JiraUser': JiraUser}，由locustfile中的子类提供
+    user_class_map = {}
+
+    defaults = {}
+
+    def __init__(self, params=None):
+        super().__init__()
+        overrides = parse_shape_params(jira_config.shape_params) if params is None else params
+        unknown = set(overrides) - set(self.defaults)
+        if unknown:
+            raise ValueError(f"{type(self).__name__} 不支持的参数: {', '.join(sorted(unknown))}")
+        self.params = {**self.defaults, **overrides}
+        self.spawn_rate = jira_config.shape_spawn_rate
+
+    def number(self, key):
+        return float(self.params[key])
+
+    def classes(self, key):
+        return [name for name in str(self.params[key]).split('+') if name]
+
+    def resolve_user_classes(self, names):
+        """把类名映射为本次运行中实际参与调度的用户类；都不可用时返回None（使用全部用户类）"""
+        active = set(self.runner.user_classes) if self.runner is not None else None
+        resolved = []
+        for name in names:
+            user_class = self.user_class_map.get(name)
+            if user_class is None:
+                raise ValueError(f"未知的用户类: {name}")
+            if active is None or user_class in active:
+                resolved.append(user_class)
+        return resolved or None
+
+
+class TimelineLoadShape(SocLoadShape):
+    """按运行时间给出当前阶段的曲线，子类实现stage_at"""
+
+    @abstractmethod
+    def stage_at(self, run_time):
+        """返回run_time时刻的阶段，结束时返回None"""
+
+    def tick(self):
+        stage = self.stage_at(self.get_run_time())
+        if stage is None:
+            return None
+        return stage.users, stage.spawn_rate, self.resolve_user_classes(stage.user_classes)
+
+
+class StagedLoadShape(TimelineLoadShape):
+    """由固定阶段列表描述的曲线"""
+
+    def __init__(self, params=None):
+        super().__init__(params)
+        self.stages = self.build_stages()
+
+    @abstractmethod
+    def build_stages(self):
+        """返回按结束时间排列的阶段列表"""
+
+    def stage_at(self, run_time):
+        for stage in self.stages:
+            if run_time < stage.end_time:
+                return stage
+        return None
+
+
+class StepLoadShape(StagedLoadShape):
+    """阶梯加压：每隔step_seconds增加step_users个用户，从第heavy_from_step级开始加入重负载用户"""
+
+    defaults = {
+        'start_users': 10,
+        'step_users': 10,
+        'step_seconds': 120,
+        'steps': 5,
+        'heavy_from_step': 4,
+        'classes': 'JiraUser+JiraReadOnlyUser',
+        'heavy_classes': 'JiraUser+JiraHeavyUser',
+    }
+
+    def build_stages(self):
+        stages = []
+        for step in range(int(self.number('steps'))):
+            classes = self.classes('heavy_classes' if step + 1 >= self.number('heavy_from_step') else 'classes')
+            stages.append(Stage(
+                end_time=(step + 1) * self.number('step_seconds'),
+                users=int(self.number('start_users') + step * self.number('step_users')),
+                spawn_rate=self.spawn_rate,
+                user_classes=classes,
+            ))
+        return stages
+
+
+class SpikeLoadShape(StagedLoadShape):
+    """告警风暴：基线负载上周期性叠加大量重负载用户（大量创建事件），随后回落观察恢复"""
+
+    defaults = {
+        'base_users': 20,
+        'spike_users': 100,
+        'warmup_seconds': 300,
+        'spike_seconds': 120,
+        'recovery_seconds': 300,
+        'spikes': 3,
+        'spike_spawn_rate': 50,
+        'base_classes': 'JiraUser+JiraReadOnlyUser',
+        'spike_classes': 'JiraHeavyUser',
+    }
+
+    def build_stages(self):
+        base_users = int(self.number('base_users'))
+        base_classes = self.classes('base_classes')
+        time = self.number('warmup_seconds')
+        stages = [Stage(time, base_users, self.spawn_rate, base_classes)]
+        for _ in range(int(self.number('spikes'))):
+            time += self.number('spike_seconds')
+            stages.append(Stage(time, int(self.number('spike_users')), self.number('spike_spawn_rate'),
+                                self.classes('spike_classes')))
+            time += self.number('recovery_seconds')
+            # 回落时按风暴的速率停止用户，后启动的重负载用户最先被移除
+            stages.append(Stage(time, base_users, self.number('spike_spawn_rate'), base_classes))
+        return stages
+
+
+class SoakLoadShape(StagedLoadShape):
+    """浸泡测试：在ramp_seconds内升到目标用户数，长时间保持，用于发现泄漏和性能退化"""
+
+    defaults = {
+        'users': 50,
+        'ramp_seconds': 300,
+        'hold_seconds': 4 * 3600,
+        'classes': 'JiraUser+JiraReadOnlyUser',
+    }
+
+    def build_stages(self):
+        users = int(self.number('users'))
+        ramp_seconds = self.number('ramp_seconds')
+        spawn_rate = users / ramp_seconds if ramp_seconds > 0 else self.spawn_rate
+        return [Stage(ramp_seconds + self.number('hold_seconds'), users, max(spawn_rate, 0.01),
+                      self.classes('classes'))]
+
+
+class DiurnalLoadShape(TimelineLoadShape):
+    """
+    SOC昼夜曲线：用户数随模拟时钟按余弦曲线变化（凌晨最低、下午最高），
+    每次交接班（handover_hours）后的handover_minutes内叠加交接用户（批量评论、重新分配）
+
+    seconds_per_hour可以压缩时间，例如60表示用24分钟跑完一天
+    """
+
+    defaults = {
+        'night_users': 10,
+        'day_users': 60,
+        'handover_users': 30,
+        'hours': 24,
+        'start_hour': 0,
+        'seconds_per_hour': 3600,
+        'peak_hour': 15,
+        'handover_hours': '7+15+23',
+        'handover_minutes': 30,
+        'night_classes': 'JiraReadOnlyUser+JiraUser',
+        'day_classes': 'JiraUser+JiraReadOnlyUser',
+        'handover_classes': 'JiraUser+JiraHeavyUser',
+    }
+
+    def clock(self, run_time):
+        """run_time对应的模拟时钟（小时，0-24）"""
+        return (self.number('start_hour') + run_time / self.number('seconds_per_hour')) % 24
+
+    def activity(self, hour):
+        """0到1之间的活跃度，peak_hour最高，相隔12小时最低"""
+        return 0.5 + 0.5 * math.cos(2 * math.pi * (hour - self.number('peak_hour')) / 24)
+
+    def in_handover(self, hour):
+        window = self.number('handover_minutes') / 60
+        return any(0 <= (hour - float(start)) % 24 < window for start in self.classes('handover_hours'))
+
+    def stage_at(self, run_time):
+        end_time = self.number('hours') * self.number('seconds_per_hour')
+        if run_time >= end_time:
+            return None
+
+        hour = self.clock(run_time)
+        activity = self.activity(hour)
+        users = self.number('night_users') + (self.number('day_users') - self.number('night_users')) * activity
+        if self.in_handover(hour):
+            users += self.number('handover_users')
+            classes = self.classes('handover_classes')
+        elif activity < 0.25:
+            classes = self.classes('night_classes')
+        else:
+            classes = self.classes('day_classes')
+        return Stage(end_time, int(round(users)), self.spawn_rate, classes)
+
+
+class CapacitySearchShape(SocLoadShape):
+    """
+    容量搜索：按p95_ms和error_rate组成的SLO自动调整用户数（指数扩大后二分，见capacity_search.py），
+    每个探测点在用户启动完成并预热warmup_seconds后测量step_seconds；窗口内请求少于min_requests时延长测量（最多4倍）。
+    搜索结束后测试停止，打印延迟曲线和满足SLO的最高吞吐，CAPACITY_CSV_PATH非空时导出CSV
+    """
+
+    defaults = {
+        'start_users': 10,
+        'max_users': 500,
+        'growth': 2,
+        'precision': 5,
+        'warmup_seconds': 15,
+        'step_seconds': 60,
+        'min_requests': 100,
+        'p95_ms': 1000,
+        'error_rate': 0.01,
+        'classes': 'JiraUser',
+    }
+
+    def __init__(self, params=None):
+        super().__init__(params)
+        self.slo = Slo(self.number('p95_ms'), self.number('error_rate'))
+        self.search = CapacitySearch(int(self.number('start_users')), int(self.number('max_users')),
+                                     int(self.number('precision')), self.number('growth'))
+        self._target = None
+        self._changed_at = 0.0
+        self._ready_at = None
+        self._window = None
+        self._reported = False
+
+    def tick(self):
+        if self.search.done:
+            self.report()
+            return None
+        if not self._reported and self._target is None and self.runner is not None:
+            # 测试被提前停止时也输出已测得的曲线
+            self.runner.environment.events.quitting.add_listener(lambda **kwargs: self.report())
+
+        run_time = self.get_run_time()
+        target = self.search.users
+        if target != self._target:
+            self._target, self._changed_at = target, run_time
+            self._ready_at = self._window = None
+
+        if self._window is None:
+            if self._ready_at is None and self._spawned(target, run_time):
+                self._ready_at = run_time + self.number('warmup_seconds')
+            if self._ready_at is not None and run_time >= self._ready_at:
+                self._window = (run_time, snapshot(self.runner.stats))
+        else:
+            start_time, start = self._window
+            duration = run_time - start_time
+            if duration >= self.number('step_seconds'):
+                end = snapshot(self.runner.stats)
+                if end.requests - start.requests >= self.number('min_requests') \
+                        or duration >= 4 * self.number('step_seconds'):
+                    self._record(measure(start, end, target, duration, self.slo))
+                    if self.search.done:
+                        self.report()
+                        return None
+                    target = self.search.users
+
+        return target, self.spawn_rate, self.resolve_user_classes(self.classes('classes'))
+
+    def _spawned(self, target, run_time):
+        """用户数已达到目标（启动异常时以预计启动时间的两倍加10秒为上限）"""
+        if self.runner is None or self.runner.user_count == target:
+            return True
+        return run_time - self._changed_at >= 2 * abs(target - (self.runner.user_count or 0)) / self.spawn_rate + 10
+
+    def _record(self, probe):
+        self.search.record(probe)
+        logger.info("capacity.probe",
+                    "容量搜索: {users} 个用户，{rps:.1f} req/s，p95 {p95}ms，错误率 {error_rate:.2%}，{result}",
+                    users=probe.users, rps=probe.rps, p95=probe.p95_ms, error_rate=probe.error_rate,
+                    result="满足SLO" if probe.passed else "不满足SLO")
+
+    def report(self):
+        if self._reported or not self.search.probes:
+            return
+        self._reported = True
+        print_report(self.search, self.slo)
+        if jira_config.capacity_csv_path:
+            with open(jira_config.capacity_csv_path, 'w', newline='', encoding='utf-8') as f:
+                write_csv(self.search, f)
+
+
+SHAPES = {
+    'step': StepLoadShape,
+    'spike': SpikeLoadShape,
+    'soak': SoakLoadShape,
+    'diurnal': DiurnalLoadShape,
+    'capacity': CapacitySearchShape,
+}
+
+
+def get_shape_class(name):
+    """按LOAD_SHAPE名称返回负载曲线类"""
+    try:
+        return SHAPES[name]
+    except KeyError:
+        raise ValueError(f"不支持的LOAD_SHAPE: {name}（可选: {', '.join(SHAPES)}）") from None
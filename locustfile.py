@@ -1,292 +1,857 @@
-"""
-Jira性能测试 - Locust测试脚本
-主要测试issue的创建和评论功能
-"""
-import random
-from locust import HttpUser, task, between
-from jira_utils import JiraAPIClient, TestDataGenerator
-from config import jira_config
-
-class JiraUser(HttpUser):
-    """Jira用户行为模拟"""
-    
-    # 等待时间设置（秒）
-    wait_time = between(jira_config.min_wait_time, jira_config.max_wait_time)
-    
-    def on_start(self):
-        """每个用户开始时执行的初始化操作"""
-        try:
-            # 验证配置
-            jira_config.validate_config()
-            
-            # 初始化Jira API客户端
-            self.jira_client = JiraAPIClient()
-            
-            # 设置Locust的HTTP客户端基础URL和认证
-            self.client.base_url = jira_config.base_url
-            self.client.auth = jira_config.get_auth()
-            self.client.headers.update({
-                'Content-Type': 'application/json',
-                'Accept': 'application/json'
-            })
-            
-            # 存储创建的issue keys，用于后续操作
-            self.created_issues = []
-            
-            # 验证连接
-            self._verify_connection()
-            
-            print(f"用户初始化完成，目标Jira: {jira_config.base_url}")
-            
-        except Exception as e:
-            print(f"用户初始化失败: {str(e)}")
-            raise
-    
-    def _verify_connection(self):
-        """验证Jira连接"""
-        try:
-            response = self.jira_client.get_project_info()
-            if response.status_code != 200:
-                raise Exception(f"无法连接到项目 {jira_config.project_key}: {response.status_code}")
-            print(f"成功连接到项目: {jira_config.project_key}")
-        except Exception as e:
-            print(f"连接验证失败: {str(e)}")
-            raise
-    
-    @task(5)
-    def create_issue(self):
-        """创建issue任务（权重5，执行频率较高）"""
-        try:
-            summary = TestDataGenerator.generate_issue_summary()
-            description = TestDataGenerator.generate_issue_description()
-            
-            # 使用Locust的HTTP客户端进行请求，以便统计性能指标
-            payload = {
-                "fields": {
-                    "project": {
-                        "key": jira_config.project_key
-                    },
-                    "summary": summary,
-                    "description": description,
-                    "issuetype": {
-                        "name": jira_config.default_issue_type
-                    }
-                }
-            }
-            
-            with self.client.post(
-                "/rest/api/2/issue",
-                json=payload,
-                name="创建Issue",
-                catch_response=True
-            ) as response:
-                if response.status_code == 201:
-                    issue_data = response.json()
-                    issue_key = issue_data.get('key')
-                    if issue_key:
-                        self.created_issues.append(issue_key)
-                        response.success()
-                        print(f"✓ 成功创建issue: {issue_key}")
-                    else:
-                        response.failure("创建issue成功但未返回key")
-                else:
-                    response.failure(f"创建issue失败: {response.status_code}")
-                    
-        except Exception as e:
-            print(f"✗ 创建issue异常: {str(e)}")
-    
-    @task(3)
-    def add_comment_to_existing_issue(self):
-        """为已存在的issue添加评论（权重3）"""
-        if not self.created_issues:
-            # 如果没有创建过issue，先搜索一些现有的
-            self._search_existing_issues()
-        
-        if self.created_issues:
-            issue_key = random.choice(self.created_issues)
-            comment_body = TestDataGenerator.generate_comment()
-            
-            try:
-                payload = {
-                    "body": comment_body
-                }
-                
-                with self.client.post(
-                    f"/rest/api/2/issue/{issue_key}/comment",
-                    json=payload,
-                    name="添加评论",
-                    catch_response=True
-                ) as response:
-                    if response.status_code == 201:
-                        response.success()
-                        print(f"✓ 成功为 {issue_key} 添加评论")
-                    else:
-                        response.failure(f"添加评论失败: {response.status_code}")
-                        
-            except Exception as e:
-                print(f"✗ 添加评论异常: {str(e)}")
-        else:
-            print("没有可用的issue来添加评论")
-    
-    @task(2)
-    def get_issue_details(self):
-        """获取issue详情（权重2）"""
-        if not self.created_issues:
-            self._search_existing_issues()
-        
-        if self.created_issues:
-            issue_key = random.choice(self.created_issues)
-            
-            try:
-                with self.client.get(
-                    f"/rest/api/2/issue/{issue_key}",
-                    name="获取Issue详情",
-                    catch_response=True
-                ) as response:
-                    if response.status_code == 200:
-                        response.success()
-                        print(f"✓ 成功获取 {issue_key} 详情")
-                    else:
-                        response.failure(f"获取issue详情失败: {response.status_code}")
-                        
-            except Exception as e:
-                print(f"✗ 获取issue详情异常: {str(e)}")
-    
-    @task(1)
-    def search_issues(self):
-        """搜索issues（权重1，执行频率较低）"""
-        try:
-            jql_queries = [
-                f"project = {jira_config.project_key} ORDER BY created DESC",
-                f"project = {jira_config.project_key} AND status = 'To Do' ORDER BY created DESC",
-                f"project = {jira_config.project_key} AND created >= -7d ORDER BY created DESC",
-                f"project = {jira_config.project_key} AND summary ~ 'test*' ORDER BY created DESC"
-            ]
-            
-            jql = random.choice(jql_queries)
-            payload = {
-                "jql": jql,
-                "maxResults": 20,
-                "fields": ["key", "summary", "status", "created"]
-            }
-            
-            with self.client.post(
-                "/rest/api/2/search",
-                json=payload,
-                name="搜索Issues",
-                catch_response=True
-            ) as response:
-                if response.status_code == 200:
-                    search_data = response.json()
-                    issues_found = len(search_data.get('issues', []))
-                    response.success()
-                    print(f"✓ 搜索完成，找到 {issues_found} 个issues")
-                    
-                    # 更新可用的issue列表
-                    for issue in search_data.get('issues', []):
-                        issue_key = issue.get('key')
-                        if issue_key and issue_key not in self.created_issues:
-                            self.created_issues.append(issue_key)
-                    
-                else:
-                    response.failure(f"搜索issues失败: {response.status_code}")
-                    
-        except Exception as e:
-            print(f"✗ 搜索issues异常: {str(e)}")
-    
-    @task(1)
-    def update_issue_description(self):
-        """更新issue描述（权重1）"""
-        if not self.created_issues:
-            self._search_existing_issues()
-        
-        if self.created_issues:
-            issue_key = random.choice(self.created_issues)
-            new_description = f"[更新] {TestDataGenerator.generate_issue_description()}"
-            
-            try:
-                payload = {
-                    "fields": {
-                        "description": new_description
-                    }
-                }
-                
-                with self.client.put(
-                    f"/rest/api/2/issue/{issue_key}",
-                    json=payload,
-                    name="更新Issue",
-                    catch_response=True
-                ) as response:
-                    if response.status_code == 204:
-                        response.success()
-                        print(f"✓ 成功更新 {issue_key} 描述")
-                    else:
-                        response.failure(f"更新issue失败: {response.status_code}")
-                        
-            except Exception as e:
-                print(f"✗ 更新issue异常: {str(e)}")
-    
-    def _search_existing_issues(self):
-        """搜索现有issues以填充issue列表"""
-        try:
-            response = self.jira_client.search_issues(
-                jql=f"project = {jira_config.project_key} ORDER BY created DESC",
-                max_results=10
-            )
-            
-            if response.status_code == 200:
-                search_data = response.json()
-                for issue in search_data.get('issues', []):
-                    issue_key = issue.get('key')
-                    if issue_key and issue_key not in self.created_issues:
-                        self.created_issues.append(issue_key)
-                        
-                print(f"搜索到 {len(self.created_issues)} 个可用issues")
-            else:
-                print(f"搜索现有issues失败: {response.status_code}")
-                
-        except Exception as e:
-            print(f"搜索现有issues异常: {str(e)}")
-
-class JiraHeavyUser(JiraUser):
-    """重负载Jira用户（更频繁的操作）"""
-    
-    # 更短的等待时间
-    wait_time = between(0.5, 2)
-    
-    @task(10)
-    def create_multiple_issues(self):
-        """批量创建issues"""
-        batch_size = random.randint(2, 5)
-        for i in range(batch_size):
-            self.create_issue()
-
-class JiraReadOnlyUser(JiraUser):
-    """只读用户（只进行查询操作）"""
-    
-    wait_time = between(1, 3)
-    
-    @task(8)
-    def get_issue_details(self):
-        """获取issue详情（重写为更高权重）"""
-        super().get_issue_details()
-    
-    @task(5)
-    def search_issues(self):
-        """搜索issues（重写为更高权重）"""
-        super().search_issues()
-    
-    @task(0)
-    def create_issue(self):
-        """禁用创建issue"""
-        pass
-    
-    @task(0)
-    def add_comment_to_existing_issue(self):
-        """禁用添加评论"""
-        pass
-    
-    @task(0)
-    def update_issue_description(self):
-        """禁用更新issue"""
-        pass
\ No newline at end of file
+"""
+Jira性能测试 - Locust测试脚本
+主要测试issue的创建和评论功能
+"""
+import random
+import re
+import time
+import gevent
+from gevent.pool import Pool
+from locust import HttpUser, User, SequentialTaskSet, task, between, constant, events
+from locust.exception import StopUser
+from locust.contrib.fasthttp import FastHttpUser
+from jira_utils import data_generator, parse_bulk_create_response, report_bulk_elements, SearchPaginator, \
+    report_search_scan, JiraAPIClient, SecurityDataGenerator
+from bootstrap import worker_bootstrap
+from issue_pool import issue_pool, setup_worker_sharing
+from hdr_histogram import setup_hdr_recording
+from derived_stats import setup_derived_stats
+from saturation_monitor import setup_saturation_monitor, track_group
+from credential_pool import acquire_credential, release_credential
+import rate_limit
+import load_shapes
+from arrival_rate import ArrivalSchedule, arrival_context, parse_arrival_rates, run_at_intended, \
+    setup_intended_latency_reporting
+from log_replay import get_process_feed
+from jql_workload import JqlWorkload
+from transactions import transaction
+from response_parsing import LAZY_PARSING, search_result, created_issue_key, consume_status_only
+from log_utils import logger
+import payload_templates
+from config import jira_config
+
+# 根据配置选择HTTP客户端实现，未选中的用户层级标记为abstract，不参与调度
+USE_FAST_HTTP = jira_config.http_client == 'fast'
+
+# 根据配置选择负载模型：closed为按等待时间循环执行任务的用户，open为按到达率发起操作的用户，replay为回放访问日志的用户
+USE_CLOSED_MODEL = jira_config.load_model == 'closed'
+USE_OPEN_MODEL = jira_config.load_model == 'open'
+USE_REPLAY = jira_config.load_model == 'replay'
+
+# SOC分析师用户只在ANALYST_USERS=True时参与调度（封闭模型），不改变默认的用户组合
+USE_ANALYST = jira_config.analyst_users
+
+# 未配置JQL_WORKLOAD_PATH时搜索任务使用的JQL查询（请求体预先编码）
+SEARCH_PAYLOADS = [
+    payload_templates.dumps({
+        "jql": jql,
+        "maxResults": 20,
+        "fields": ["key", "summary", "status", "created"]
+    })
+    for jql in [
+        f"project = {jira_config.project_key} ORDER BY created DESC",
+        f"project = {jira_config.project_key} AND status = 'To Do' ORDER BY created DESC",
+        f"project = {jira_config.project_key} AND created >= -7d ORDER BY created DESC",
+        f"project = {jira_config.project_key} AND summary ~ 'test*' ORDER BY created DESC"
+    ]
+]
+
+# JQL负载模型：按权重选择参数化查询模板，每个模板单独统计
+JQL_WORKLOAD = JqlWorkload.load(jira_config.jql_workload_path, jira_config.project_key) \
+    if jira_config.jql_workload_path else None
+
+# 回放日志JQL中的项目条件（替换为当前PROJECT_KEY）
+_PROJECT_CLAUSE_RE = re.compile(r'\bproject\s*=\s*("[^"]*"|\'[^\']*\'|[\w-]+)', re.IGNORECASE)
+
+@events.init.add_listener
+def on_locust_init(environment, **kwargs):
+    """Locust初始化：记录派生统计，按需在worker之间共享issue key池、记录HDR直方图、检测负载生成器饱和，汇总限流情况"""
+    setup_derived_stats(environment)
+    if jira_config.issue_pool_shared:
+        setup_worker_sharing(environment)
+    if jira_config.hdr_enabled:
+        setup_hdr_recording(environment)
+    if jira_config.saturation_monitor:
+        setup_saturation_monitor(environment)
+    rate_limit.setup_rate_limit_reporting(environment)
+    if not USE_CLOSED_MODEL:
+        setup_intended_latency_reporting(environment)
+
+class JiraUserBase(User):
+    """Jira用户行为模拟（与HTTP客户端实现无关）"""
+    
+    abstract = True
+    
+    # 目标Jira地址（FastHttpUser在构造时即需要host）
+    host = jira_config.base_url
+    
+    # 等待时间设置（秒）
+    wait_time = between(jira_config.min_wait_time, jira_config.max_wait_time)
+    
+    def on_start(self):
+        """每个用户开始时执行的初始化操作"""
+        try:
+            # 配置校验、项目元数据和API客户端由worker级启动阶段提供，每个进程只执行一次
+            self.metadata = worker_bootstrap.get()
+            self.jira_client = self.metadata.client
+            
+            # 领取本用户的Jira身份（配置CREDENTIALS_FILE时来自凭据池），设置Locust的HTTP客户端基础URL和认证
+            self.credential = acquire_credential(self.environment)
+            if self.credential.cookies is not None:
+                self.jira_client = self.credential.api_client()
+            self._configure_http_client()
+            # 所有请求经过进程级速率控制器：遵守Retry-After，启用RATE_LIMIT_PACING时按AIMD控制发送速率
+            rate_limit.install(self.client)
+            
+            logger.debug("user.started", "用户初始化完成，目标Jira: {base_url}", base_url=jira_config.base_url)
+            
+        except Exception as e:
+            logger.error("user.start_error", "用户初始化失败: {error}", error=str(e))
+            raise
+    
+    def on_stop(self):
+        release_credential(self.environment, getattr(self, 'credential', None))
+    
+    def _configure_http_client(self):
+        """配置Locust HTTP客户端的基础URL；客户端混入类在此之上设置认证头和Cookie"""
+        self.client.base_url = jira_config.base_url
+    
+    @task(5)
+    def create_issue(self):
+        """创建issue任务（权重5，执行频率较高）"""
+        try:
+            summary = data_generator.generate_security_incident_summary()
+            description = data_generator.generate_security_incident_description()
+            
+            # 使用Locust的HTTP客户端进行请求，以便统计性能指标
+            payload = payload_templates.create_issue_payload(
+                summary, description, issue_type=self.metadata.issue_type
+            )
+            
+            with self.client.post(
+                "/rest/api/2/issue",
+                data=payload,
+                name="创建Issue",
+                catch_response=True
+            ) as response:
+                if response.status_code == 201:
+                    issue_key = created_issue_key(response)
+                    if issue_key:
+                        issue_pool.add(issue_key)
+                        response.success()
+                        logger.debug("issue.created", "✓ 成功创建issue: {issue_key}", issue_key=issue_key)
+                    else:
+                        response.failure("创建issue成功但未返回key")
+                else:
+                    response.failure(f"创建issue失败: {response.status_code}")
+                    
+        except Exception as e:
+            logger.error("issue.create_error", "✗ 创建issue异常: {error}", error=str(e))
+    
+    @task(3)
+    def add_comment_to_existing_issue(self):
+        """为已存在的issue添加评论（权重3）"""
+        issue_key = self._pick_issue_key()
+        
+        if issue_key:
+            comment_body = data_generator.generate_security_comment()
+            
+            try:
+                payload = payload_templates.comment_payload(comment_body)
+                
+                with self.client.post(
+                    f"/rest/api/2/issue/{issue_key}/comment",
+                    data=payload,
+                    name="添加评论",
+                    catch_response=True
+                ) as response:
+                    if response.status_code == 201:
+                        response.success()
+                        logger.debug("comment.added", "✓ 成功为 {issue_key} 添加评论", issue_key=issue_key)
+                    else:
+                        if response.status_code == 404:
+                            # issue已被删除，从共享池中移除
+                            issue_pool.discard(issue_key)
+                        response.failure(f"添加评论失败: {response.status_code}")
+                        
+            except Exception as e:
+                logger.error("comment.add_error", "✗ 添加评论异常: {error}", error=str(e))
+        else:
+            logger.warning("comment.no_issue", "没有可用的issue来添加评论")
+    
+    @task(2)
+    def get_issue_details(self):
+        """获取issue详情（权重2）"""
+        issue_key = self._pick_issue_key()
+        
+        if issue_key:
+            
+            try:
+                # 只检查状态码：lazy模式下不缓冲、不解析issue详情（含评论和变更历史）
+                with self.client.get(
+                    f"/rest/api/2/issue/{issue_key}",
+                    name="获取Issue详情",
+                    catch_response=True,
+                    stream=LAZY_PARSING
+                ) as response:
+                    consume_status_only(response)
+                    if response.status_code == 200:
+                        response.success()
+                        logger.debug("issue.fetched", "✓ 成功获取 {issue_key} 详情", issue_key=issue_key)
+                    else:
+                        if response.status_code == 404:
+                            # issue已被删除，从共享池中移除
+                            issue_pool.discard(issue_key)
+                        response.failure(f"获取issue详情失败: {response.status_code}")
+                        
+            except Exception as e:
+                logger.error("issue.fetch_error", "✗ 获取issue详情异常: {error}", error=str(e))
+    
+    @task(1)
+    def search_issues(self):
+        """搜索issues（权重1，执行频率较低）"""
+        try:
+            if JQL_WORKLOAD is not None:
+                template = JQL_WORKLOAD.choose()
+                payload, name = template.payload(), template.stat_name
+            else:
+                # 查询语句固定，请求体在模块加载时已预先编码
+                payload, name = random.choice(SEARCH_PAYLOADS), "搜索Issues"
+            
+            with self.client.post(
+                "/rest/api/2/search",
+                data=payload,
+                name=name,
+                catch_response=True
+            ) as response:
+                if response.status_code == 200:
+                    search_data = search_result(response)
+                    issues_found = len(search_data.get('issues', []))
+                    response.success()
+                    logger.debug("search.completed", "✓ 搜索完成，找到 {count} 个issues", count=issues_found)
+                    
+                    # 更新共享issue池
+                    issue_pool.add_many(
+                        issue['key'] for issue in search_data.get('issues', []) if issue.get('key')
+                    )
+                    
+                else:
+                    response.failure(f"搜索issues失败: {response.status_code}")
+                    
+        except Exception as e:
+            logger.error("search.error", "✗ 搜索issues异常: {error}", error=str(e))
+    
+    @task(1)
+    def update_issue_description(self):
+        """更新issue描述（权重1）"""
+        issue_key = self._pick_issue_key()
+        
+        if issue_key:
+            new_description = f"[更新] {data_generator.generate_security_incident_description()}"
+            
+            try:
+                payload = payload_templates.update_description_payload(new_description)
+                
+                with self.client.put(
+                    f"/rest/api/2/issue/{issue_key}",
+                    data=payload,
+                    name="更新Issue",
+                    catch_response=True
+                ) as response:
+                    if response.status_code == 204:
+                        response.success()
+                        logger.debug("issue.updated", "✓ 成功更新 {issue_key} 描述", issue_key=issue_key)
+                    else:
+                        if response.status_code == 404:
+                            # issue已被删除，从共享池中移除
+                            issue_pool.discard(issue_key)
+                        response.failure(f"更新issue失败: {response.status_code}")
+                        
+            except Exception as e:
+                logger.error("issue.update_error", "✗ 更新issue异常: {error}", error=str(e))
+    
+    def _pick_issue_key(self):
+        """从共享issue池中随机取一个key，池为空时先搜索一些现有的"""
+        issue_key = issue_pool.sample()
+        if issue_key is None:
+            self._search_existing_issues()
+            issue_key = issue_pool.sample()
+        return issue_key
+    
+    def _search_existing_issues(self):
+        """搜索现有issues以预热共享issue池（同一时刻只允许一个用户执行）"""
+        if not issue_pool.refill_lock.acquire(blocking=False):
+            # 其他用户正在预热，等待其完成后直接复用结果
+            with issue_pool.refill_lock:
+                return
+        
+        try:
+            response = self.jira_client.search_issues(
+                jql=f"project = {jira_config.project_key} ORDER BY created DESC",
+                max_results=10
+            )
+            
+            if response.status_code == 200:
+                search_data = response.json()
+                issue_pool.add_many(
+                    issue['key'] for issue in search_data.get('issues', []) if issue.get('key')
+                )
+                        
+                logger.info("pool.refilled", "搜索到 {count} 个可用issues", count=len(issue_pool))
+            else:
+                logger.warning("pool.refill_failed", "搜索现有issues失败: {status_code}", status_code=response.status_code)
+                
+        except Exception as e:
+            logger.error("pool.refill_error", "搜索现有issues异常: {error}", error=str(e))
+        finally:
+            issue_pool.refill_lock.release()
+
+class JiraHeavyUserBase(JiraUserBase):
+    """重负载Jira用户（更频繁的操作）"""
+    
+    abstract = True
+    
+    # 更短的等待时间
+    wait_time = between(0.5, 2)
+    
+    @task(10)
+    @transaction("连续创建Issues")
+    def create_multiple_issues(self):
+        """批量创建issues（逐个创建，整体记为一个事务）"""
+        batch_size = random.randint(2, 5)
+        for i in range(batch_size):
+            self.create_issue()
+    
+    @task(5)
+    @transaction("批量创建Issues(整批)")
+    def create_issues_bulk(self):
+        """通过 /issue/bulk 批量创建issues（超过服务端上限时分片，逐个元素统计成功/失败，所有分片记为一个事务）"""
+        batch_size = jira_config.bulk_create_batch_size
+        chunk_size = jira_config.bulk_create_max_issues
+        
+        for offset in range(0, batch_size, chunk_size):
+            count = min(chunk_size, batch_size - offset)
+            payload = payload_templates.bulk_create_payload([
+                payload_templates.create_issue_payload(
+                    data_generator.generate_security_incident_summary(),
+                    data_generator.generate_security_incident_description(),
+                    issue_type=self.metadata.issue_type
+                )
+                for i in range(count)
+            ])
+            
+            try:
+                start_time = time.time()
+                start = time.perf_counter()
+                with self.client.post(
+                    "/rest/api/2/issue/bulk",
+                    data=payload,
+                    name="批量创建Issues",
+                    catch_response=True
+                ) as response:
+                    elapsed_ms = (time.perf_counter() - start) * 1000
+                    try:
+                        data = response.json()
+                    except ValueError:
+                        data = {}
+                    keys, errors = parse_bulk_create_response(response.status_code, data, count)
+                    
+                    # 部分元素失败时请求本身仍记为成功，失败元素在"(每条)"统计中单独计数
+                    if any(keys):
+                        response.success()
+                    else:
+                        response.failure(f"批量创建issue失败: {response.status_code}")
+                
+                report_bulk_elements("批量创建Issues(每条)", elapsed_ms, keys, errors, start_time)
+                issue_pool.add_many(key for key in keys if key)
+                logger.debug("issue.bulk_created", "✓ 批量创建 {created}/{total} 个issues",
+                            created=count - len(errors), total=count)
+                
+            except Exception as e:
+                logger.error("issue.bulk_create_error", "✗ 批量创建issues异常: {error}", error=str(e))
+
+class JiraReadOnlyUserBase(JiraUserBase):
+    """只读用户（只进行查询操作）"""
+    
+    abstract = True
+    
+    wait_time = between(1, 3)
+    
+    @task(8)
+    def get_issue_details(self):
+        """获取issue详情（重写为更高权重）"""
+        super().get_issue_details()
+    
+    @task(5)
+    def search_issues(self):
+        """搜索issues（重写为更高权重）"""
+        super().search_issues()
+    
+    @task(1)
+    def export_search_results(self):
+        """
+        深度分页导出：按startAt逐页读取搜索结果，分别统计每页与整次遍历的耗时
+        
+        每攒满一页的行就写出一次，写出耗时EXPORT_PROCESS_MS（导出端写文件/推送下游的I/O），
+        SEARCH_PREFETCH=True时下一页的请求与写出重叠
+        """
+        jql = f"project = {jira_config.project_key} ORDER BY created DESC"
+        
+        def fetch_page(start_at, max_results):
+            payload = payload_templates.dumps({
+                "jql": jql,
+                "startAt": start_at,
+                "maxResults": max_results,
+                "fields": ["key", "summary", "status", "created"]
+            })
+            with self.client.post(
+                "/rest/api/2/search",
+                data=payload,
+                name="导出Issues(每页)",
+                catch_response=True
+            ) as response:
+                if response.status_code == 200:
+                    response.success()
+                    return response.status_code, search_result(response), len(response.content or b"")
+                response.failure(f"导出分页失败: {response.status_code}")
+                return response.status_code, {}, len(response.content or b"")
+        
+        paginator = SearchPaginator(fetch_page, jira_config.export_page_size, jira_config.export_max_issues,
+                                    prefetch=jira_config.search_prefetch)
+        start_time = time.time()
+        start = time.perf_counter()
+        exception = None
+        try:
+            rows = []
+            for issue in paginator:
+                fields = issue.get('fields') or {}
+                rows.append((issue.get('key'), fields.get('summary'), (fields.get('status') or {}).get('name'),
+                             fields.get('created')))
+                if len(rows) >= paginator.page_size:
+                    self._write_export_rows(rows)
+                    rows = []
+            if rows:
+                self._write_export_rows(rows)
+        except Exception as e:
+            exception = e
+            logger.error("search.export_error", "✗ 导出issues异常: {error}", error=str(e))
+        
+        report_search_scan("导出Issues", (time.perf_counter() - start) * 1000, paginator, start_time, exception)
+        if exception is None:
+            logger.debug("search.exported", "✓ 导出 {count}/{total} 个issues，共 {pages} 页",
+                        count=paginator.issues, total=paginator.total, pages=paginator.pages)
+    
+    def _write_export_rows(self, rows):
+        """模拟导出端写出一批行（让出事件循环，预取的请求在此期间进行）"""
+        if jira_config.export_process_ms > 0:
+            gevent.sleep(jira_config.export_process_ms / 1000)
+    
+    @task(0)
+    def create_issue(self):
+        """禁用创建issue"""
+        pass
+    
+    @task(0)
+    def add_comment_to_existing_issue(self):
+        """禁用添加评论"""
+        pass
+    
+    @task(0)
+    def update_issue_description(self):
+        """禁用更新issue"""
+        pass
+
+class IncidentLifecycle(SequentialTaskSet):
+    """
+    SOC分析师处理一个安全事件的完整生命周期（按顺序执行，完成后从接收新告警重新开始）:
+    接收Wazuh告警创建事件 -> 分诊评论 -> 分配 -> 升级优先级 -> 按ANALYST_WORKFLOW依次转换状态 -> 解决
+    
+    通过JiraAPIClient的工作流操作发送请求，每一步使用独立的统计名称；任何一步失败时放弃当前事件，从头开始。
+    状态转换ID来自worker级缓存，缺少时用当前事件发现一次（同一目标状态每个进程只发现一次）
+    """
+    
+    def on_start(self):
+        self.metadata = self.user.metadata
+        self.jira_client = self.user.jira_client
+        self.issue_key = None
+        self.priority = None
+        workflow = [status.strip() for status in jira_config.analyst_workflow.split(',') if status.strip()]
+        self.work_statuses, self.resolve_status = workflow[:-1], workflow[-1]
+    
+    def _check(self, response, step):
+        """请求失败时记录日志并放弃当前事件（JiraAPIClient已把失败计入统计）"""
+        if response.status_code >= 400:
+            logger.warning("lifecycle.step_failed", "✗ 事件生命周期 {step} 失败: {issue_key} {status_code}",
+                           step=step, issue_key=self.issue_key, status_code=response.status_code)
+            self.interrupt()
+    
+    @task
+    def ingest_alert(self):
+        """接收Wazuh告警并创建安全事件"""
+        issue_type = "Security Incident" if "Security Incident" in self.metadata.issue_types \
+            else self.metadata.issue_type
+        alert = data_generator.generate_wazuh_alert_data()
+        response, issue_key = self.jira_client.create_incident_from_wazuh(
+            alert, issue_type=issue_type, name="事件生命周期: 接收告警"
+        )
+        if not issue_key:
+            self._check(response, "接收告警")
+            self.interrupt()
+        self.issue_key = issue_key
+        self.priority = JiraAPIClient.wazuh_incident_fields(alert)['priority']
+        issue_pool.add(issue_key)
+    
+    @task
+    def triage_comment(self):
+        """分诊：记录初步分析"""
+        response = self.jira_client.add_comment(self.issue_key, data_generator.generate_security_comment(),
+                                           name="事件生命周期: 分诊评论")
+        self._check(response, "分诊评论")
+    
+    @task
+    def assign(self):
+        """分配给分析师（ANALYST_ASSIGNEE，未配置时为当前用户的身份）"""
+        assignee = jira_config.analyst_assignee or self.user.credential.username
+        response = self.jira_client.assign_incident(self.issue_key, assignee, name="事件生命周期: 分配")
+        self._check(response, "分配")
+    
+    @task
+    def escalate_priority(self):
+        """把优先级提高一级（项目的优先级列表按从高到低排列）"""
+        priorities = self.metadata.priorities or SecurityDataGenerator.SEVERITY_LEVELS
+        index = priorities.index(self.priority) if self.priority in priorities else len(priorities)
+        self.priority = priorities[max(index - 1, 0)]
+        response = self.jira_client.update_incident_priority(self.issue_key, self.priority,
+                                                        name="事件生命周期: 升级优先级")
+        self._check(response, "升级优先级")
+    
+    @task
+    @transaction("事件生命周期: 处理")
+    def work_incident(self):
+        """依次转换到ANALYST_WORKFLOW中除最后一个以外的状态（连续的状态转换记为一个事务）"""
+        for status in self.work_statuses:
+            self._transition(status, f"事件生命周期: 状态转换[{status}]")
+    
+    @task
+    def resolve(self):
+        """转换到ANALYST_WORKFLOW的最后一个状态并附上处理结论"""
+        self._transition(self.resolve_status, "事件生命周期: 解决", data_generator.generate_security_comment())
+        logger.debug("lifecycle.completed", "✓ 事件生命周期完成: {issue_key}", issue_key=self.issue_key)
+    
+    def _transition(self, status, name, comment=None):
+        transition_id = self.metadata.find_transition(status, self.issue_key)
+        if transition_id is None:
+            logger.warning("lifecycle.transition_missing", "✗ 找不到到达 {status} 的状态转换", status=status)
+            self.interrupt()
+        response = self.jira_client.transition_incident_status(self.issue_key, transition_id, comment, name=name)
+        self._check(response, name)
+
+class JiraAnalystUserBase(JiraUserBase):
+    """SOC分析师用户：循环处理安全事件的完整生命周期"""
+    
+    abstract = True
+
+# UserMeta总会合并父类的任务权重，这里在类创建后覆盖：分析师用户只运行事件生命周期
+JiraAnalystUserBase.tasks = [IncidentLifecycle]
+
+class JiraScheduledUserBase(JiraUserBase):
+    """
+    按计划时间发起操作的用户（开放模型、日志回放）的公共部分
+    
+    操作在有界greenlet池中执行，不等待之前的操作完成；池满时调度等待空位，
+    等待时间计入从计划开始时间算起的响应时间（QUEUED类型的统计）
+    """
+    
+    abstract = True
+    
+    wait_time = constant(0)
+    
+    _operation_pool = None
+    _schedulers = ()
+    
+    def on_start(self):
+        super().on_start()
+        self._operation_pool = track_group(Pool(jira_config.arrival_max_inflight))
+        self._schedulers = []
+    
+    def context(self):
+        return arrival_context()
+    
+    def _spawn_at(self, intended_start, operation, *args):
+        """在池中执行操作（池满时阻塞），落后的操作在有空位后按原计划时间立即补发"""
+        self._operation_pool.spawn(run_at_intended, operation, intended_start, *args)
+    
+    def on_stop(self):
+        gevent.killall(self._schedulers, block=False)
+        if self._operation_pool is not None:
+            self._operation_pool.kill(block=False)
+        super().on_stop()
+
+class JiraArrivalRateUserBase(JiraScheduledUserBase):
+    """开放模型用户：按ARRIVAL_RATES为每类操作生成计划到达时间，到点即发起，每类操作由一个调度greenlet驱动"""
+    
+    abstract = True
+    
+    def on_start(self):
+        super().on_start()
+        self.arrival_rates = parse_arrival_rates(jira_config.arrival_rates)
+        unknown = [name for name in self.arrival_rates if not callable(getattr(self, name, None))]
+        if unknown:
+            raise ValueError(f"ARRIVAL_RATES中存在未知的操作: {', '.join(unknown)}")
+    
+    def drive_arrivals(self):
+        """启动各类操作的调度greenlet并一直运行到用户停止"""
+        self._schedulers = [
+            gevent.spawn(self._schedule_arrivals, getattr(self, name), rate)
+            for name, rate in self.arrival_rates.items()
+        ]
+        gevent.joinall(self._schedulers, raise_error=True)
+    
+    def _schedule_arrivals(self, operation, rate):
+        schedule = ArrivalSchedule(rate, jira_config.arrival_distribution)
+        while True:
+            intended_start = schedule.next()
+            delay = intended_start - time.time()
+            if delay > 0:
+                gevent.sleep(delay)
+            self._spawn_at(intended_start, operation)
+
+# UserMeta总会合并父类的任务权重，这里在类创建后覆盖：开放模型用户只运行一个长期任务，操作由调度greenlet发起
+JiraArrivalRateUserBase.tasks = [JiraArrivalRateUserBase.drive_arrivals]
+
+def _fit_text(text, size):
+    """把文本截断或重复到指定长度（按回放日志中的请求体大小还原请求体）"""
+    if size <= 0:
+        return text[:1]
+    return (text * (size // len(text) + 1))[:size]
+
+class JiraReplayUserBase(JiraScheduledUserBase):
+    """
+    日志回放用户：从REPLAY_LOG流式读取录制的请求，按原始（或按REPLAY_SPEED缩放的）时间间隔重新发起
+    
+    同一进程内的回放用户共享一个数据源，每条记录只会被其中一个用户发起；分布式运行时各worker按行号分片。
+    请求名称与封闭模型任务一致，issue key从共享issue池中选取（日志中的key在测试环境中通常不存在），
+    搜索请求使用日志中的JQL，其中的项目替换为PROJECT_KEY
+    """
+    
+    abstract = True
+    
+    def on_start(self):
+        super().on_start()
+        self.replay_feed = get_process_feed(
+            self.environment, jira_config.replay_log, jira_config.replay_speed, jira_config.replay_loop
+        )
+    
+    def drive_replay(self):
+        """按计划时间依次发起分到的记录，日志读完（且不循环）后等待进行中的操作完成并停止本用户"""
+        while True:
+            item = self.replay_feed.next()
+            if item is None:
+                break
+            scheduled, operation, entry = item
+            delay = scheduled - time.time()
+            if delay > 0:
+                gevent.sleep(delay)
+            self._spawn_at(scheduled, getattr(self, f"_replay_{operation}"), entry)
+        
+        self._operation_pool.join()
+        logger.info("replay.finished", "回放结束: 发起 {issued} 条记录，跳过 {unmapped} 条无法映射的记录",
+                    issued=self.replay_feed.issued, unmapped=self.replay_feed.unmapped)
+        raise StopUser()
+    
+    def _replay_request(self, method, url, name, expected_status, data=None, issue_key=None, status_only=False):
+        """发起一条回放请求并按状态码判定成功/失败，返回响应（异常时返回None）"""
+        try:
+            with self.client.request(method, url, data=data, name=name, catch_response=True,
+                                     stream=status_only and LAZY_PARSING) as response:
+                if status_only:
+                    consume_status_only(response)
+                if response.status_code == expected_status:
+                    response.success()
+                else:
+                    if response.status_code == 404 and issue_key:
+                        # issue已被删除，从共享池中移除
+                        issue_pool.discard(issue_key)
+                    response.failure(f"回放{name}失败: {response.status_code}")
+                return response
+        except Exception as e:
+            logger.error("replay.error", "✗ 回放{name}异常: {error}", name=name, error=str(e))
+            return None
+    
+    def _replay_issue_request(self, method, path, name, expected_status, data=None, status_only=False):
+        issue_key = self._pick_issue_key()
+        if not issue_key:
+            logger.warning("replay.no_issue", "没有可用的issue，跳过回放{name}", name=name)
+            return None
+        return self._replay_request(method, f"/rest/api/2/issue/{issue_key}{path}", name, expected_status,
+                                    data=data, issue_key=issue_key, status_only=status_only)
+    
+    def _issue_payload(self, body_size=None):
+        summary = data_generator.generate_security_incident_summary()
+        description = data_generator.generate_security_incident_description()
+        if body_size:
+            overhead = len(payload_templates.create_issue_payload(summary, "", issue_type=self.metadata.issue_type))
+            description = _fit_text(description, body_size - overhead)
+        return payload_templates.create_issue_payload(summary, description, issue_type=self.metadata.issue_type)
+    
+    def _replay_create_issue(self, entry):
+        response = self._replay_request("POST", "/rest/api/2/issue", "创建Issue", 201,
+                                        data=self._issue_payload(entry.body_size))
+        if response is not None and response.status_code == 201:
+            issue_key = created_issue_key(response)
+            if issue_key:
+                issue_pool.add(issue_key)
+    
+    def _replay_create_issues_bulk(self, entry):
+        single = self._issue_payload()
+        count = jira_config.bulk_create_batch_size
+        if entry.body_size:
+            # 日志中只有请求体大小，按单条issue的大小估算条数
+            count = round(entry.body_size / (len(single) + 1))
+        count = min(max(count, 1), jira_config.bulk_create_max_issues)
+        payload = payload_templates.bulk_create_payload([single] + [self._issue_payload() for i in range(count - 1)])
+        response = self._replay_request("POST", "/rest/api/2/issue/bulk", "批量创建Issues", 201, data=payload)
+        if response is not None and response.status_code == 201:
+            issue_pool.add_many(issue['key'] for issue in response.json().get('issues', []) if issue.get('key'))
+    
+    def _replay_add_comment(self, entry):
+        comment_body = data_generator.generate_security_comment()
+        if entry.body_size:
+            comment_body = _fit_text(comment_body, entry.body_size - len(payload_templates.comment_payload("")))
+        self._replay_issue_request("POST", "/comment", "添加评论", 201,
+                                   data=payload_templates.comment_payload(comment_body))
+    
+    def _replay_get_issue(self, entry):
+        self._replay_issue_request("GET", "", "获取Issue详情", 200, status_only=True)
+    
+    def _replay_update_issue(self, entry):
+        description = f"[更新] {data_generator.generate_security_incident_description()}"
+        if entry.body_size:
+            description = _fit_text(
+                description, entry.body_size - len(payload_templates.update_description_payload(""))
+            )
+        self._replay_issue_request("PUT", "", "更新Issue", 204,
+                                   data=payload_templates.update_description_payload(description))
+    
+    def _replay_get_transitions(self, entry):
+        self._replay_issue_request("GET", "/transitions", "获取状态转换", 200)
+    
+    def _replay_do_transition(self, entry):
+        transition_ids = list(self.metadata.transitions.values())
+        if not transition_ids:
+            issue_key = self._pick_issue_key()
+            if issue_key:
+                transition_ids = list(self.metadata.discover_transitions(issue_key).values())
+        if not transition_ids:
+            logger.warning("replay.no_transition", "没有可用的状态转换，跳过回放状态转换")
+            return
+        self._replay_issue_request("POST", "/transitions", "状态转换", 204,
+                                   data=payload_templates.transition_payload(random.choice(transition_ids)))
+    
+    def _replay_search(self, entry):
+        if entry.jql:
+            jql = _PROJECT_CLAUSE_RE.sub(f"project = {jira_config.project_key}", entry.jql)
+            payload = payload_templates.dumps({
+                "jql": jql,
+                "maxResults": 20,
+                "fields": ["key", "summary", "status", "created"]
+            })
+        else:
+            payload = random.choice(SEARCH_PAYLOADS)
+        response = self._replay_request("POST", "/rest/api/2/search", "搜索Issues", 200, data=payload)
+        if response is not None and response.status_code == 200:
+            issue_pool.add_many(
+                issue['key'] for issue in search_result(response).get('issues', []) if issue.get('key')
+            )
+
+JiraReplayUserBase.tasks = [JiraReplayUserBase.drive_replay]
+
+class RequestsClientMixin:
+    """基于python-requests的HttpSession配置"""
+    
+    def _configure_http_client(self):
+        super()._configure_http_client()
+        # 使用身份预先编码的Authorization头，不再由HTTPBasicAuth在每次请求时重新编码
+        self.client.headers.update({
+            'Content-Type': 'application/json',
+            'Accept': 'application/json',
+            'Authorization': self.credential.auth_header
+        })
+        if self.credential.cookies is not None:
+            self.client.cookies = self.credential.cookies
+
+class FastHttpClientMixin:
+    """基于geventhttpclient的FastHttpSession配置"""
+    
+    default_headers = {
+        'Content-Type': 'application/json',
+        'Accept': 'application/json'
+    }
+    
+    def _configure_http_client(self):
+        super()._configure_http_client()
+        # FastHttpSession每次请求都会重新编码auth元组，这里使用身份预先计算的Authorization头
+        self.client.auth_header = self.credential.auth_header
+        if self.credential.cookies is not None:
+            self.client.cookiejar = self.client.client.cookiejar = self.credential.cookies
+
+# python-requests客户端用户（HTTP_CLIENT=requests，默认）
+class JiraUser(RequestsClientMixin, JiraUserBase, HttpUser):
+    """Jira用户行为模拟"""
+    abstract = USE_FAST_HTTP or not USE_CLOSED_MODEL
+
+class JiraHeavyUser(RequestsClientMixin, JiraHeavyUserBase, HttpUser):
+    """重负载Jira用户（更频繁的操作）"""
+    abstract = USE_FAST_HTTP or not USE_CLOSED_MODEL
+
+class JiraReadOnlyUser(RequestsClientMixin, JiraReadOnlyUserBase, HttpUser):
+    """只读用户（只进行查询操作）"""
+    abstract = USE_FAST_HTTP or not USE_CLOSED_MODEL
+
+class JiraAnalystUser(RequestsClientMixin, JiraAnalystUserBase, HttpUser):
+    """SOC分析师用户（事件生命周期，ANALYST_USERS=True）"""
+    abstract = USE_FAST_HTTP or not USE_CLOSED_MODEL or not USE_ANALYST
+
+class JiraArrivalRateUser(RequestsClientMixin, JiraArrivalRateUserBase, HttpUser):
+    """开放模型用户（LOAD_MODEL=open）"""
+    abstract = USE_FAST_HTTP or not USE_OPEN_MODEL
+
+class JiraReplayUser(RequestsClientMixin, JiraReplayUserBase, HttpUser):
+    """日志回放用户（LOAD_MODEL=replay）"""
+    abstract = USE_FAST_HTTP or not USE_REPLAY
+
+# geventhttpclient客户端用户（HTTP_CLIENT=fast），任务权重与成功/失败判定完全一致
+class JiraFastUser(FastHttpClientMixin, JiraUserBase, FastHttpUser):
+    """Jira用户行为模拟（FastHttpUser）"""
+    abstract = not USE_FAST_HTTP or not USE_CLOSED_MODEL
+
+class JiraFastHeavyUser(FastHttpClientMixin, JiraHeavyUserBase, FastHttpUser):
+    """重负载Jira用户（FastHttpUser）"""
+    abstract = not USE_FAST_HTTP or not USE_CLOSED_MODEL
+
+class JiraFastReadOnlyUser(FastHttpClientMixin, JiraReadOnlyUserBase, FastHttpUser):
+    """只读用户（FastHttpUser）"""
+    abstract = not USE_FAST_HTTP or not USE_CLOSED_MODEL
+
+class JiraFastAnalystUser(FastHttpClientMixin, JiraAnalystUserBase, FastHttpUser):
+    """SOC分析师用户（FastHttpUser，ANALYST_USERS=True）"""
+    abstract = not USE_FAST_HTTP or not USE_CLOSED_MODEL or not USE_ANALYST
+
+class JiraFastArrivalRateUser(FastHttpClientMixin, JiraArrivalRateUserBase, FastHttpUser):
+    """开放模型用户（FastHttpUser，LOAD_MODEL=open）"""
+    abstract = not USE_FAST_HTTP or not USE_OPEN_MODEL
+
+class JiraFastReplayUser(FastHttpClientMixin, JiraReplayUserBase, FastHttpUser):
+    """日志回放用户（FastHttpUser，LOAD_MODEL=replay）"""
+    abstract = not USE_FAST_HTTP or not USE_REPLAY
+
+# 负载曲线（LOAD_SHAPE）：只在配置时定义，Locust会自动使用locustfile中的LoadTestShape子类
+if jira_config.load_shape:
+    class JiraLoadShape(load_shapes.get_shape_class(jira_config.load_shape)):
+        """按LOAD_SHAPE选择的负载曲线"""
+        user_class_map = {
+            'JiraUser': JiraFastUser if USE_FAST_HTTP else JiraUser,
+            'JiraHeavyUser': JiraFastHeavyUser if USE_FAST_HTTP else JiraHeavyUser,
+            'JiraReadOnlyUser': JiraFastReadOnlyUser if USE_FAST_HTTP else JiraReadOnlyUser,
+            'JiraAnalystUser': JiraFastAnalystUser if USE_FAST_HTTP else JiraAnalystUser,
+        }
\ No newline at end of file
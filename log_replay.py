@@ -0,0 +1,201 @@
+"""
+访问日志回放
+从磁盘逐行流式读取录制的Jira请求日志（不整体载入内存），把每条记录映射到现有的请求类型，
+按原始（或缩放后的）时间间隔重新发起。分布式运行时按行号在各worker之间分片。
+
+支持两种日志格式（可混用，.gz文件自动解压）:
+    JSON Lines: {"timestamp": "2026-03-02T09:15:02.120Z", "method": "POST", "path": "/rest/api/2/search",
+                 "jql": "project = SOC AND status = Open", "body_size": 180}
+    Jira/Tomcat访问日志: 10.0.0.5 555x1x1 alice [02/Mar/2026:09:15:02 +0000] "GET /rest/api/2/issue/SOC-1 HTTP/1.1" 200 ...
+"""
+import gzip
+import json
+import re
+import time
+from collections import namedtuple
+from datetime import datetime
+from urllib.parse import parse_qs, urlsplit
+
+from locust.runners import WorkerRunner
+
+ReplayEntry = namedtuple("ReplayEntry", ["timestamp", "method", "path", "jql", "body_size"])
+
+_ACCESS_LOG_RE = re.compile(r'^\S+ \S+ \S+ \[([^\]]+)\] "(\S+) (\S+)[^"]*"')
+_ACCESS_LOG_TIME = "%d/%b/%Y:%H:%M:%S %z"
+
+# (方法, 路径正则, 操作) —— 操作名对应回放用户中的处理方法
+OPERATIONS = [
+    ("POST", re.compile(r"^/rest/api/2/issue/?$"), "create_issue"),
+    ("POST", re.compile(r"^/rest/api/2/issue/bulk/?$"), "create_issues_bulk"),
+    ("POST", re.compile(r"^/rest/api/2/issue/[^/]+/comment/?$"), "add_comment"),
+    ("GET", re.compile(r"^/rest/api/2/issue/[^/]+/transitions/?$"), "get_transitions"),
+    ("POST", re.compile(r"^/rest/api/2/issue/[^/]+/transitions/?$"), "do_transition"),
+    ("GET", re.compile(r"^/rest/api/2/issue/[^/]+/?$"), "get_issue"),
+    ("PUT", re.compile(r"^/rest/api/2/issue/[^/]+/?$"), "update_issue"),
+    ("GET", re.compile(r"^/rest/api/2/search/?$"), "search"),
+    ("POST", re.compile(r"^/rest/api/2/search/?$"), "search"),
+]
+
+
+def parse_timestamp(value):
+    """解析Unix时间戳（秒）、ISO 8601或访问日志格式的时间"""
+    if isinstance(value, (int, float)):
+        return float(value)
+    value = value.strip()
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    if value.endswith("Z"):
+        value = value[:-1] + "+00:00"
+    try:
+        return datetime.fromisoformat(value).timestamp()
+    except ValueError:
+        return datetime.strptime(value, _ACCESS_LOG_TIME).timestamp()
+
+
+def parse_line(line):
+    """
+    解析一行日志
+
+    Returns:
+        ReplayEntry或None（空行、无法解析的行）
+    """
+    line = line.strip()
+    if not line:
+        return None
+    try:
+        if line.startswith("{"):
+            record = json.loads(line)
+            path = record["path"]
+            jql = record.get("jql")
+            body_size = record.get("body_size")
+            timestamp = parse_timestamp(record["timestamp"])
+            method = record["method"]
+        else:
+            match = _ACCESS_LOG_RE.match(line)
+            if not match:
+                return None
+            timestamp = parse_timestamp(match.group(1))
+            method, path = match.group(2), match.group(3)
+            jql = None
+            body_size = None
+    except (KeyError, ValueError, TypeError):
+        return None
+
+    # GET搜索的JQL在查询字符串中
+    parts = urlsplit(path)
+    if parts.query and not jql:
+        jql = (parse_qs(parts.query).get("jql") or [None])[0]
+    return ReplayEntry(timestamp, method.upper(), parts.path, jql, body_size)
+
+
+def classify(entry):
+    """返回记录对应的操作名，无法映射时返回None"""
+    for method, pattern, operation in OPERATIONS:
+        if entry.method == method and pattern.match(entry.path):
+            return operation
+    return None
+
+
+def _open(path):
+    if path.endswith(".gz"):
+        return gzip.open(path, "rt", encoding="utf-8", errors="replace")
+    return open(path, encoding="utf-8", errors="replace")
+
+
+def iter_entries(path, shard_index=0, shard_count=1):
+    """逐行读取日志，只解析属于本分片的行（行号 % shard_count == shard_index）"""
+    with _open(path) as f:
+        for line_number, line in enumerate(f):
+            if line_number % shard_count != shard_index:
+                continue
+            entry = parse_line(line)
+            if entry is not None:
+                yield entry
+
+
+def first_timestamp(path):
+    """日志中第一条可解析记录的时间，作为所有分片共同的时间基准"""
+    for entry in iter_entries(path):
+        return entry.timestamp
+    return None
+
+
+class ReplayFeed:
+    """
+    进程内共享的回放数据源
+
+    每条记录的计划发起时间 = 回放开始时间 + (记录时间 - 日志起始时间) / speed；speed为0时不等待。
+    访问日志按请求完成时间写入，记录之间可能轻微乱序，计划时间不早于上一条记录，避免把乱序误算为排队延迟
+    """
+
+    def __init__(self, path, shard_index=0, shard_count=1, speed=1.0, loop=False):
+        if speed < 0:
+            raise ValueError("REPLAY_SPEED不能为负数")
+        self.path = path
+        self.shard_index = shard_index
+        self.shard_count = max(shard_count, 1)
+        self.speed = speed
+        self.loop = loop
+        self.base_timestamp = first_timestamp(path)
+        if self.base_timestamp is None:
+            raise ValueError(f"回放日志中没有可解析的记录: {path}")
+        self.start_time = None
+        self.last_scheduled = None
+        self.issued = 0
+        self.unmapped = 0
+        self._entries = None
+
+    def _restart(self):
+        self._entries = iter_entries(self.path, self.shard_index, self.shard_count)
+        self.start_time = self.last_scheduled = time.time()
+
+    def next(self):
+        """
+        返回下一条可映射的记录
+
+        Returns:
+            tuple: (计划发起时间, 操作名, ReplayEntry)，日志读完且不循环时返回None
+        """
+        if self._entries is None:
+            self._restart()
+        while True:
+            entry = next(self._entries, None)
+            if entry is None:
+                if not self.loop:
+                    return None
+                self._restart()
+                continue
+            operation = classify(entry)
+            if operation is None:
+                self.unmapped += 1
+                continue
+            self.issued += 1
+            if self.speed:
+                scheduled = self.start_time + (entry.timestamp - self.base_timestamp) / self.speed
+                scheduled = self.last_scheduled = max(scheduled, self.last_scheduled)
+            else:
+                scheduled = time.time()
+            return scheduled, operation, entry
+
+
+_process_feed = None
+
+
+def get_process_feed(environment, path, speed=1.0, loop=False):
+    """
+    返回本进程共享的回放数据源（同一worker上的多个回放用户从同一个数据源取记录）
+
+    分片数取master的 --expect-workers，分片序号为worker_index；单机运行时读取全部记录
+    """
+    global _process_feed
+    if _process_feed is None:
+        runner = environment.runner
+        shard_index, shard_count = 0, 1
+        if isinstance(runner, WorkerRunner):
+            options = environment.parsed_options
+            shard_count = getattr(options, 'expect_workers', 1) or 1
+            shard_index = max(runner.worker_index, 0) % shard_count
+        _process_feed = ReplayFeed(path, shard_index, shard_count, speed, loop)
+    return _process_feed
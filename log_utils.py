@@ -0,0 +1,191 @@
+"""
+采样、缓冲的结构化日志
+替代请求路径上的print()：按级别和事件采样过滤，日志先进入内存缓冲区，
+由后台greenlet定期批量格式化，再交给gevent线程池写出，任务和事件循环都不会阻塞在stdout/文件写入上。
+每个请求一条的成功日志使用DEBUG级别，默认的INFO级别下请求路径上不产生日志。
+"""
+import atexit
+import json
+import random
+import sys
+import time
+from collections import deque
+
+import gevent
+
+from config import jira_config
+
+LEVELS = {'DEBUG': 10, 'INFO': 20, 'WARNING': 30, 'ERROR': 40, 'OFF': 100}
+LEVEL_NAMES = {value: name for name, value in LEVELS.items()}
+
+
+def parse_sample_rates(spec):
+    """解析 'issue.created=0.01,comment.added=0.1' 格式的采样率配置"""
+    rates = {}
+    for item in spec.split(','):
+        item = item.strip()
+        if not item:
+            continue
+        event, sep, rate = item.partition('=')
+        if not sep:
+            raise ValueError(f"LOG_SAMPLE_RATES格式错误: {item}")
+        rate = float(rate)
+        if not 0.0 <= rate <= 1.0:
+            raise ValueError(f"采样率必须在0到1之间: {item}")
+        rates[event.strip()] = rate
+    return rates
+
+
+class EventLogger:
+    """
+    事件日志记录器
+
+    每条日志由事件名、消息模板和字段组成；消息在后台写出时才格式化，
+    被级别或采样过滤掉的日志几乎没有开销。
+    """
+
+    def __init__(self, level='INFO', sample_rates=None, default_sample_rate=1.0,
+                 console=True, jsonl_path=None, flush_interval=1.0, buffer_size=10000):
+        if level.upper() not in LEVELS:
+            raise ValueError(f"不支持的日志级别: {level}")
+        self.level = LEVELS[level.upper()]
+        self.sample_rates = sample_rates or {}
+        self.default_sample_rate = default_sample_rate
+        self.console = console
+        self.flush_interval = flush_interval
+        self.dropped = 0
+        self.format_errors = 0
+
+        # 缓冲区满时丢弃最旧的日志，而不是阻塞请求
+        self._buffer = deque(maxlen=buffer_size)
+        self._jsonl = open(jsonl_path, 'a', encoding='utf-8') if jsonl_path else None
+        self._flusher = None
+        # 线程池中正在进行的写入（线程无法被kill，关闭前需要等待它结束）
+        self._pending_write = None
+
+    def log(self, level, event, message, **fields):
+        if level < self.level:
+            return
+        rate = self.sample_rates.get(event, self.default_sample_rate)
+        if rate < 1.0 and random.random() >= rate:
+            return
+
+        buffer = self._buffer
+        if len(buffer) == buffer.maxlen:
+            self.dropped += 1
+        buffer.append((time.time(), level, event, message, fields))
+
+        if self._flusher is None:
+            self._flusher = gevent.spawn(self._flush_loop)
+
+    def debug(self, event, message, **fields):
+        self.log(10, event, message, **fields)
+
+    def info(self, event, message, **fields):
+        self.log(20, event, message, **fields)
+
+    def warning(self, event, message, **fields):
+        self.log(30, event, message, **fields)
+
+    def error(self, event, message, **fields):
+        self.log(40, event, message, **fields)
+
+    def _flush_loop(self):
+        try:
+            while True:
+                gevent.sleep(self.flush_interval)
+                self.flush(threaded=True)
+        finally:
+            # 循环意外退出时，下一条日志会重新启动写出greenlet
+            self._flusher = None
+
+    def _format(self, message, fields):
+        """格式化一条日志；模板与字段不匹配时计数并保留原始模板和字段，不影响同批的其他日志"""
+        if not fields:
+            return message
+        try:
+            return message.format(**fields)
+        except Exception:
+            self.format_errors += 1
+            return f"{message} {fields!r}"
+
+    def flush(self, threaded=False):
+        """
+        把缓冲区中的日志一次性写出
+
+        Args:
+            threaded: 在gevent线程池中执行写入（后台greenlet使用），避免阻塞事件循环
+        """
+        buffer = self._buffer
+        if not buffer:
+            return
+        records = [buffer.popleft() for _ in range(len(buffer))]
+
+        console = None
+        if self.console:
+            lines = []
+            for timestamp, level, event, message, fields in records:
+                clock = time.strftime('%H:%M:%S', time.localtime(timestamp))
+                lines.append(f"{clock} {LEVEL_NAMES[level]:<7} {self._format(message, fields)}\n")
+            console = ''.join(lines)
+
+        jsonl = None
+        if self._jsonl is not None:
+            lines = []
+            for timestamp, level, event, message, fields in records:
+                record = {
+                    'ts': round(timestamp, 6),
+                    'level': LEVEL_NAMES[level],
+                    'event': event,
+                    'message': self._format(message, fields),
+                }
+                record.update(fields)
+                lines.append(json.dumps(record, ensure_ascii=False, default=str) + '\n')
+            jsonl = ''.join(lines)
+
+        if threaded:
+            self._pending_write = gevent.get_hub().threadpool.spawn(self._write, console, jsonl)
+            self._pending_write.get()
+        else:
+            self._write(console, jsonl)
+
+    def _write(self, console, jsonl):
+        if console:
+            sys.stdout.write(console)
+            sys.stdout.flush()
+        if jsonl and self._jsonl is not None:
+            self._jsonl.write(jsonl)
+            self._jsonl.flush()
+
+    def close(self):
+        if self._flusher is not None:
+            self._flusher.kill(block=True)
+            self._flusher = None
+        # kill只结束等待结果的greenlet，已经交给线程池的写入仍在进行：等它写完再在本线程写出剩余日志并关闭文件
+        if self._pending_write is not None:
+            self._pending_write.wait()
+            self._pending_write = None
+        self.flush()
+        if self.dropped:
+            sys.stdout.write(f"日志缓冲区溢出，共丢弃 {self.dropped} 条日志\n")
+        if self.format_errors:
+            sys.stdout.write(f"日志格式化失败 {self.format_errors} 条（已按原始模板输出）\n")
+        if self._jsonl is not None:
+            self._jsonl.close()
+            self._jsonl = None
+
+
+def _create_logger():
+    return EventLogger(
+        level=jira_config.log_level,
+        sample_rates=parse_sample_rates(jira_config.log_sample_rates),
+        default_sample_rate=jira_config.log_default_sample_rate,
+        console=jira_config.log_console,
+        jsonl_path=jira_config.log_jsonl_path or None,
+        flush_interval=jira_config.log_flush_interval,
+    )
+
+
+# 进程级日志记录器
+logger = _create_logger()
+atexit.register(logger.close)
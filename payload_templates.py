@@ -0,0 +1,165 @@
+"""
+预序列化的请求体模板
+把请求体中固定不变的部分（项目key、issue类型、优先级等）预先编码为bytes，
+每次请求只序列化可变字段并拼接，避免反复构造嵌套字典和完整的json.dumps
+"""
+import json
+from functools import lru_cache
+
+from config import jira_config
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _select_json_backend(name):
+    """选择JSON后端: auto（优先orjson）、orjson 或 json"""
+    if name == 'orjson' and orjson is None:
+        raise ValueError("JSON_BACKEND=orjson 但未安装orjson，请执行 pip install orjson")
+    if name in ('auto', 'orjson') and orjson is not None:
+        return 'orjson', orjson.dumps, orjson.loads
+    if name not in ('auto', 'json', 'orjson'):
+        raise ValueError(f"不支持的JSON_BACKEND: {name}")
+
+    def dumps(obj):
+        return json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+    return 'json', dumps, json.loads
+
+
+JSON_BACKEND, dumps, loads = _select_json_backend(jira_config.json_backend)
+
+
+class Field:
+    """模板中的可变字段占位符"""
+
+    def __init__(self, name):
+        self.name = name
+        self.token = f"__tpl_{name}__"
+
+
+class PayloadTemplate:
+    """
+    请求体模板
+
+    用嵌套字典描述请求体，可变位置放置Field占位符；构造时整体序列化一次，
+    按占位符切分为固定的bytes片段，render时只编码可变字段并拼接。
+    """
+
+    def __init__(self, structure):
+        fields = []
+        encoded = dumps(_replace_fields(structure, fields))
+
+        self.fields = [field.name for field in fields]
+        self._chunks = []
+        for field in fields:
+            marker = dumps(field.token)
+            head, sep, encoded = encoded.partition(marker)
+            if not sep:
+                raise ValueError(f"模板中找不到字段占位符: {field.name}")
+            self._chunks.append(head)
+        self._chunks.append(encoded)
+
+    def render(self, *values):
+        """按字段声明顺序传入可变值，返回请求体bytes"""
+        if len(values) != len(self.fields):
+            raise ValueError(f"模板需要{len(self.fields)}个字段 {self.fields}，实际传入{len(values)}个")
+        chunks = self._chunks
+        parts = [chunks[0]]
+        for i, value in enumerate(values):
+            parts.append(dumps(value))
+            parts.append(chunks[i + 1])
+        return b"".join(parts)
+
+
+def _replace_fields(node, fields):
+    """把Field占位符替换为唯一token字符串，并按出现顺序记录字段"""
+    if isinstance(node, Field):
+        fields.append(node)
+        return node.token
+    if isinstance(node, dict):
+        return {key: _replace_fields(value, fields) for key, value in node.items()}
+    if isinstance(node, list):
+        return [_replace_fields(value, fields) for value in node]
+    return node
+
+
+@lru_cache(maxsize=64)
+def create_issue_template(project_key, issue_type, priority=None):
+    """创建issue的请求体模板，可变字段: summary, description"""
+    structure = {
+        "fields": {
+            "project": {
+                "key": project_key
+            },
+            "summary": Field("summary"),
+            "description": Field("description"),
+            "issuetype": {
+                "name": issue_type
+            }
+        }
+    }
+    if priority:
+        structure["fields"]["priority"] = {"name": priority}
+    return PayloadTemplate(structure)
+
+
+COMMENT_TEMPLATE = PayloadTemplate({"body": Field("body")})
+
+UPDATE_DESCRIPTION_TEMPLATE = PayloadTemplate({"fields": {"description": Field("description")}})
+
+TRANSITION_COMMENT_TEMPLATE = PayloadTemplate({
+    "transition": {"id": Field("transition_id")},
+    "update": {"comment": [{"add": {"body": Field("comment")}}]}
+})
+
+
+def create_issue_payload(summary, description, project_key=None, issue_type=None, priority=None):
+    """创建issue的请求体"""
+    template = create_issue_template(
+        project_key or jira_config.project_key,
+        issue_type or jira_config.default_issue_type,
+        priority
+    )
+    return template.render(summary, description)
+
+
+def bulk_create_payload(issue_payloads):
+    """批量创建issue的请求体：单条创建请求体即为issueUpdates的元素，直接拼接"""
+    return b'{"issueUpdates":[' + b",".join(issue_payloads) + b"]}"
+
+
+def comment_payload(body):
+    """添加评论的请求体"""
+    return COMMENT_TEMPLATE.render(body)
+
+
+def update_description_payload(description):
+    """更新issue描述的请求体"""
+    return UPDATE_DESCRIPTION_TEMPLATE.render(description)
+
+
+@lru_cache(maxsize=256)
+def assign_payload(assignee):
+    """分配issue的请求体（完全固定，按分析师缓存）"""
+    return dumps({"fields": {"assignee": {"name": assignee}}})
+
+
+@lru_cache(maxsize=16)
+def priority_payload(priority):
+    """更新优先级的请求体（完全固定，按优先级缓存）"""
+    return dumps({"fields": {"priority": {"name": priority}}})
+
+
+def transition_payload(transition_id, comment=None):
+    """状态转换的请求体"""
+    if comment:
+        return TRANSITION_COMMENT_TEMPLATE.render(transition_id, comment)
+    return _transition_only_payload(transition_id)
+
+
+@lru_cache(maxsize=64)
+def _transition_only_payload(transition_id):
+    return dumps({"transition": {"id": transition_id}})
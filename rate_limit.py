@@ -0,0 +1,247 @@
+"""
+限流（429）处理与自适应发送速率
+Jira Cloud按用户/租户限流，超限时返回429并在Retry-After中给出需要等待的秒数。
+不处理429时，用户会在下一轮迭代立即重试，测到的只是"收集429的速度"。这里在每个worker（单机运行时为本进程）上:
+
+    - 每个429额外上报一条THROTTLE类型的派生统计（名称与原请求一致，响应时间为遵守的等待时间，不计入Aggregated），
+      原请求本身仍按失败统计一次
+    - 遵守Retry-After：本进程的所有请求暂停到等待结束（缺少该头时等待RATE_LIMIT_DEFAULT_RETRY_AFTER秒）
+    - RATE_LIMIT_PACING=True时，所有请求先从共享令牌桶取令牌；速率按AIMD调整：
+      被限流时乘以RATE_LIMIT_DECREASE（同一轮限流只降一次），速率成为瓶颈且请求成功时每秒增加RATE_LIMIT_INCREASE
+
+测试结束时各worker第一次被限流以来的平均速率之和即为Jira限流下可持续的吞吐估计。
+"""
+import time
+from email.utils import parsedate_to_datetime
+
+import gevent
+from locust.runners import MasterRunner, WorkerRunner
+
+import derived_stats
+from config import jira_config
+from log_utils import logger
+
+THROTTLE_STATUS = 429
+
+
+def parse_retry_after(value, default=1.0, maximum=60.0):
+    """
+    解析Retry-After头（秒数或HTTP日期）
+
+    Returns:
+        float: 需要等待的秒数（限制在[0, maximum]之间，缺失或无法解析时为default）
+    """
+    if not value:
+        return default
+    try:
+        seconds = float(value)
+    except ValueError:
+        try:
+            seconds = parsedate_to_datetime(value).timestamp() - time.time()
+        except (TypeError, ValueError):
+            return default
+    return min(max(seconds, 0.0), maximum)
+
+
+class AimdPacer:
+    """
+    进程内共享的令牌桶发送速率控制器
+
+    pacing为False时只负责遵守Retry-After（暂停所有请求），不限制速率
+    """
+
+    def __init__(self, pacing=False, initial_rate=10.0, min_rate=0.5, max_rate=100.0, increase=1.0,
+                 decrease=0.5, burst=5, default_retry_after=1.0, max_retry_after=60.0):
+        if not 0 < decrease < 1:
+            raise ValueError("RATE_LIMIT_DECREASE必须在0到1之间")
+        if not 0 < min_rate <= initial_rate <= max_rate:
+            raise ValueError("限流速率必须满足 0 < RATE_LIMIT_MIN_RPS <= RATE_LIMIT_INITIAL_RPS <= RATE_LIMIT_MAX_RPS")
+        self.pacing = pacing
+        self.rate = float(initial_rate)
+        self.min_rate = float(min_rate)
+        self.max_rate = float(max_rate)
+        self.increase = float(increase)
+        self.decrease = float(decrease)
+        self.burst = max(float(burst), 1.0)
+        self.default_retry_after = default_retry_after
+        self.max_retry_after = max_retry_after
+        self.throttled = 0
+        self.paused_seconds = 0.0
+        self.lowest_rate = self.rate
+        self._tokens = self.burst
+        self._last_refill = time.monotonic()
+        self._last_increase = self._last_refill
+        self._paused_until = 0.0
+        self._cooldown_until = 0.0
+        self._limited = False
+        # 第一次被限流后速率的时间积分（AIMD锯齿的平均值即为限流下可持续的速率）
+        self._rate_integral = 0.0
+        self._integral_start = None
+        self._last_change = self._last_refill
+
+    def _set_rate(self, rate, now):
+        if self._integral_start is not None:
+            self._rate_integral += self.rate * (now - self._last_change)
+        self._last_change = now
+        self.rate = rate
+
+    def average_rate(self):
+        """第一次被限流以来的时间加权平均速率，尚未被限流时为当前速率"""
+        now = time.monotonic()
+        if self._integral_start is None or now <= self._integral_start:
+            return self.rate
+        integral = self._rate_integral + self.rate * (now - self._last_change)
+        return integral / (now - self._integral_start)
+
+    def acquire(self):
+        """发送请求前调用：等待Retry-After暂停结束，启用速率控制时再等待一个令牌"""
+        while True:
+            now = time.monotonic()
+            if now < self._paused_until:
+                gevent.sleep(self._paused_until - now)
+                continue
+            if not self.pacing:
+                return
+            self._tokens = min(self.burst, self._tokens + (now - self._last_refill) * self.rate)
+            self._last_refill = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return
+            # 令牌不足说明速率正在限制发送，之后的成功响应可以继续加速
+            self._limited = True
+            gevent.sleep((1 - self._tokens) / self.rate)
+
+    def on_success(self):
+        """收到非429响应：速率成为瓶颈时按经过的时间线性加速"""
+        now = time.monotonic()
+        elapsed, self._last_increase = now - self._last_increase, now
+        if self.pacing and self._limited and now >= self._cooldown_until:
+            self._set_rate(min(self.max_rate, self.rate + self.increase * elapsed), now)
+            self._limited = False
+
+    def on_throttled(self, retry_after):
+        """
+        收到429：暂停所有请求直到Retry-After结束，并乘性降速
+
+        并发中的请求可能同时收到429，冷却期（暂停结束前）内只降速一次
+        """
+        now = time.monotonic()
+        self.throttled += 1
+        resume = now + retry_after
+        if resume > self._paused_until:
+            self.paused_seconds += resume - max(self._paused_until, now)
+            self._paused_until = resume
+        if self.pacing and now >= self._cooldown_until:
+            if self._integral_start is None:
+                self._integral_start = self._last_change = now
+            self._set_rate(max(self.min_rate, self.rate * self.decrease), now)
+            self.lowest_rate = min(self.lowest_rate, self.rate)
+            self._tokens = 0.0
+            self._cooldown_until = resume
+            logger.info("ratelimit.decrease", "收到429，发送速率降至 {rate:.2f}/s，暂停 {retry_after:.1f}s",
+                        rate=self.rate, retry_after=retry_after)
+
+    def state(self):
+        return {
+            "pacing": self.pacing,
+            "rate": round(self.rate, 3),
+            "average_rate": round(self.average_rate(), 3),
+            "lowest_rate": round(self.lowest_rate, 3),
+            "throttled": self.throttled,
+            "paused_seconds": round(self.paused_seconds, 3),
+        }
+
+
+def _create_pacer():
+    return AimdPacer(
+        pacing=jira_config.rate_limit_pacing,
+        initial_rate=jira_config.rate_limit_initial_rps,
+        min_rate=jira_config.rate_limit_min_rps,
+        max_rate=jira_config.rate_limit_max_rps,
+        increase=jira_config.rate_limit_increase,
+        decrease=jira_config.rate_limit_decrease,
+        burst=jira_config.rate_limit_burst,
+        default_retry_after=jira_config.rate_limit_default_retry_after,
+        max_retry_after=jira_config.rate_limit_max_retry_after,
+    )
+
+
+# 进程级速率控制器（同一worker上的所有用户和JiraAPIClient共享）
+pacer = _create_pacer()
+
+
+def handle_response(method, name, response, pacer=pacer, url=None):
+    """
+    根据响应状态更新速率控制器，429时上报THROTTLE派生统计
+
+    Returns:
+        float或None: 429时为遵守的等待秒数，否则为None
+    """
+    if response is None or response.status_code != THROTTLE_STATUS:
+        if response is not None:
+            pacer.on_success()
+        return None
+    retry_after = parse_retry_after(response.headers.get("Retry-After"), pacer.default_retry_after,
+                                    pacer.max_retry_after)
+    pacer.on_throttled(retry_after)
+    derived_stats.report("THROTTLE", name or method, retry_after * 1000, start_time=time.time(), url=url)
+    return retry_after
+
+
+def install(client, pacer=pacer):
+    """
+    为Locust用户的HTTP客户端（HttpSession/FastHttpSession）加上速率控制
+
+    两种会话的get/post等方法都经由实例的request方法发送，这里替换为：先取令牌，再发送，最后按响应状态调整速率
+    """
+    send = client.request
+
+    def request(method, url, name=None, **kwargs):
+        pacer.acquire()
+        response = send(method, url, name=name, **kwargs)
+        handle_response(method, name or url, response, pacer, url=url)
+        return response
+
+    client.request = request
+
+
+def setup_rate_limit_reporting(environment, pacer=pacer):
+    """
+    worker随统计上报速率控制器的状态；master/单机在测试结束时打印各来源的速率与限流次数，
+    速率控制启用时各来源限流后平均速率之和为可持续吞吐的估计
+    """
+    runner = environment.runner
+    events = environment.events
+
+    if isinstance(runner, WorkerRunner):
+        def on_report_to_master(client_id, data):
+            data["rate_limit"] = pacer.state()
+
+        events.report_to_master.add_listener(on_report_to_master)
+        return
+
+    states = {}
+    if isinstance(runner, MasterRunner):
+        def on_worker_report(client_id, data):
+            if "rate_limit" in data:
+                states[client_id] = data["rate_limit"]
+
+        events.worker_report.add_listener(on_worker_report)
+
+    def on_quitting(environment, **kwargs):
+        sources = states if isinstance(runner, MasterRunner) else {"local": pacer.state()}
+        if not any(state["throttled"] or state["pacing"] for state in sources.values()):
+            return
+        for source, state in sorted(sources.items()):
+            logger.info("ratelimit.summary", "限流({source}): 429 {throttled} 次，遵守Retry-After暂停 {paused:.1f}s",
+                        source=source, throttled=state["throttled"], paused=state["paused_seconds"])
+            if state["pacing"]:
+                logger.info("ratelimit.rate",
+                            "发送速率({source}): 当前 {rate:.2f}/s，限流后平均 {average:.2f}/s，最低 {lowest:.2f}/s",
+                            source=source, rate=state["rate"], average=state["average_rate"],
+                            lowest=state["lowest_rate"])
+        if any(state["pacing"] for state in sources.values()):
+            logger.info("ratelimit.sustainable", "限流下可持续的发送速率估计: {rate:.2f}/s",
+                        rate=sum(state["average_rate"] for state in sources.values()))
+
+    events.quitting.add_listener(on_quitting)
@@ -0,0 +1,109 @@
+"""
+响应体的选择性解析
+大多数任务只需要响应中的少数字段（搜索结果的issue key、总数）或者只关心状态码，
+对完整的搜索结果/issue详情（含评论、变更历史）执行json解析会消耗可观的负载生成器CPU。
+
+RESPONSE_PARSING=lazy 时:
+    - 搜索、创建只在原始字节上用正则提取issue key和total，不构建完整的对象树；
+      搜索结果中嵌套了其他issue的key（parent、subtasks、issuelinks等）时退回完整解析
+    - 只关心状态码的请求以stream模式发送，分块读取并丢弃响应体（不缓冲整个响应，不解析），只统计字节数
+
+注意: stream模式下Locust记录的响应时间截止到收到响应头，不包含下载响应体的时间。
+"""
+import re
+
+from config import jira_config
+from payload_templates import loads
+
+PARSING_MODES = ("full", "lazy")
+
+# 是否启用选择性解析（RESPONSE_PARSING=lazy）
+LAZY_PARSING = jira_config.response_parsing == "lazy"
+
+# 形如 "key": "SOC-123" 的字段；项目、状态等对象的key不含 -数字，不会被匹配
+_ISSUE_KEY_RE = re.compile(rb'"key"\s*:\s*"([A-Z][A-Z0-9_]*-\d+)"')
+# 搜索响应中startAt、maxResults、total位于issues数组之前，取第一个匹配即为顶层的值
+_TOTAL_RE = re.compile(rb'"total"\s*:\s*(\d+)')
+_START_AT_RE = re.compile(rb'"startAt"\s*:\s*(\d+)')
+_MAX_RESULTS_RE = re.compile(rb'"maxResults"\s*:\s*(\d+)')
+
+DRAIN_CHUNK_SIZE = 64 * 1024
+
+
+def extract_issue_keys(body):
+    """从响应体字节中提取所有issue key（按出现顺序）"""
+    return [key.decode('ascii') for key in _ISSUE_KEY_RE.findall(body or b"")]
+
+
+def extract_issue_key(body):
+    """提取响应体中的第一个issue key（创建issue的响应），没有时返回None"""
+    match = _ISSUE_KEY_RE.search(body or b"")
+    return match.group(1).decode('ascii') if match else None
+
+
+def _first_int(pattern, body):
+    match = pattern.search(body)
+    return int(match.group(1)) if match else None
+
+
+def search_summary(body):
+    """
+    搜索响应的精简视图
+
+    正则匹配到的key数必须等于按startAt、maxResults、total推算的本页issue数；
+    issue的字段中嵌套了其他issue（parent、subtasks、issuelinks等）时两者不一致，改为完整解析取顶层issues的key
+
+    Returns:
+        dict: {"total": 总数, "issues": [{"key": ...}, ...]}，与完整解析结果中这两部分的结构一致
+    """
+    body = body or b""
+    total = _first_int(_TOTAL_RE, body)
+    start_at = _first_int(_START_AT_RE, body)
+    max_results = _first_int(_MAX_RESULTS_RE, body)
+    keys = extract_issue_keys(body)
+    if None not in (total, start_at, max_results) and len(keys) == min(max_results, max(total - start_at, 0)):
+        return {"total": total, "issues": [{"key": key} for key in keys]}
+
+    data = loads(body) if body else {}
+    return {
+        "total": data.get("total", 0),
+        "issues": [{"key": issue.get("key")} for issue in data.get("issues", [])],
+    }
+
+
+def search_result(response):
+    """按RESPONSE_PARSING解析搜索响应：lazy时只提取total和issue key"""
+    if LAZY_PARSING:
+        return search_summary(response.content)
+    return response.json()
+
+
+def created_issue_key(response):
+    """按RESPONSE_PARSING取出创建issue响应中的key"""
+    if LAZY_PARSING:
+        return extract_issue_key(response.content)
+    return response.json().get('key')
+
+
+def drain_response(response, chunk_size=DRAIN_CHUNK_SIZE):
+    """
+    分块读取并丢弃stream模式响应的响应体，使连接可以被复用
+
+    FastHttpSession在catch_response模式下总会缓冲响应体（locust.contrib.fasthttp.ResponseContextManager在构造时
+    读取response.content，stream参数只影响统计），此时直接返回已缓冲的长度
+
+    Returns:
+        int: 响应体字节数
+    """
+    if not hasattr(response, 'iter_content'):
+        return len(response.content or b"")
+    return sum(len(chunk) for chunk in response.iter_content(chunk_size))
+
+
+def consume_status_only(response):
+    """
+    只关心状态码的请求在with块中调用：lazy时读取并丢弃stream模式的响应体，
+    把实际字节数写回本次请求的统计（stream模式下Locust无法得到准确的响应大小）
+    """
+    if LAZY_PARSING:
+        response.request_meta["response_length"] = drain_response(response)
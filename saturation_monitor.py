@@ -0,0 +1,314 @@
+"""
+负载生成器饱和检测
+负载生成器自身的CPU跑满时，gevent事件循环无法按时调度greenlet，记录到的响应时间里混入了本机的调度延迟，
+看起来像是Jira变慢了。这里在每个worker（或单机进程）上按固定间隔采样:
+
+    - 事件循环延迟: sleep(interval) 实际多睡了多久
+    - 进程CPU占用（psutil，Locust的依赖）
+    - greenlet数（用户greenlet、Locust runner的后台greenlet和登记的辅助greenlet池）与用户数
+
+worker随统计一起把采样发给master；master/单机在Web UI的 /saturation-ui 页面（在Locust页面上增加Saturation标签）、
+/saturation（JSON）和 /saturation/csv 提供各来源的采样，
+测试结束时打印每个来源的汇总，超过阈值的采样比例大于SATURATION_TOLERANCE时标记为饱和，
+SATURATION_FAIL=True时以退出码3结束，提示本次结果受负载生成器瓶颈影响。
+"""
+import csv
+import io
+import sys
+import time
+import weakref
+from collections import namedtuple
+
+import gevent
+import psutil
+from flask import render_template_string
+from locust.runners import MasterRunner, WorkerRunner
+
+from config import jira_config
+from log_utils import logger
+
+# 负载生成器饱和时的进程退出码
+SATURATION_EXIT_CODE = 3
+
+Sample = namedtuple("Sample", ["timestamp", "loop_lag_ms", "cpu_percent", "greenlets", "users"])
+
+CSV_HEADER = ["Source", "Timestamp", "Loop Lag (ms)", "CPU (%)", "Greenlets", "Users"]
+
+
+# 测试代码自己的greenlet池（分页预取、并发执行器、计划操作池），由track_group登记，池被回收后自动移除
+_helper_groups = weakref.WeakSet()
+
+
+def track_group(group):
+    """登记一个gevent Group/Pool，其中存活的greenlet计入采样的greenlet数"""
+    _helper_groups.add(group)
+    return group
+
+
+def count_greenlets(runner):
+    """
+    用户greenlet + runner的后台greenlet + 登记的辅助greenlet
+
+    只读取各个Group的大小，不遍历gc跟踪的对象：在大堆上扫描一次要上百毫秒，而且会阻塞被检测的事件循环
+    """
+    return len(runner.user_greenlets) + len(runner.greenlet) + sum(len(group) for group in list(_helper_groups))
+
+
+class SaturationMonitor:
+    """按来源（worker id或local）保存采样，并在本进程上运行采样greenlet"""
+
+    def __init__(self, interval=1.0, lag_threshold_ms=50.0, cpu_threshold=90.0):
+        self.interval = interval
+        self.lag_threshold_ms = lag_threshold_ms
+        self.cpu_threshold = cpu_threshold
+        self.samples = {}
+        self._pending = []
+        self._sampler = None
+        self._saturated = False
+        self._process = psutil.Process()
+
+    def is_saturated(self, sample):
+        return sample.loop_lag_ms > self.lag_threshold_ms or sample.cpu_percent > self.cpu_threshold
+
+    def record(self, source, sample):
+        self.samples.setdefault(source, []).append(sample)
+
+    def start(self, runner, source="local"):
+        if self._sampler is None:
+            self._sampler = gevent.spawn(self._run, runner, source)
+
+    def stop(self):
+        if self._sampler is not None:
+            self._sampler.kill(block=False)
+            self._sampler = None
+
+    def reset(self, **kwargs):
+        self.samples = {}
+        self._pending = []
+
+    def _run(self, runner, source):
+        # 第一次调用cpu_percent只建立基准
+        self._process.cpu_percent()
+        while True:
+            start = time.perf_counter()
+            gevent.sleep(self.interval)
+            lag_ms = max((time.perf_counter() - start - self.interval) * 1000, 0.0)
+            sample = Sample(time.time(), round(lag_ms, 3), self._process.cpu_percent(), count_greenlets(runner),
+                            runner.user_count)
+            self.record(source, sample)
+            self._pending.append(list(sample))
+            self._warn_on_transition(source, sample)
+
+    def _warn_on_transition(self, source, sample):
+        """进入/退出饱和状态时各记录一次日志，避免每个采样都刷屏"""
+        saturated = self.is_saturated(sample)
+        if saturated and not self._saturated:
+            logger.warning("saturation.detected",
+                           "⚠ 负载生成器饱和({source}): 事件循环延迟 {lag:.1f}ms，CPU {cpu:.0f}%",
+                           source=source, lag=sample.loop_lag_ms, cpu=sample.cpu_percent)
+        elif self._saturated and not saturated:
+            logger.info("saturation.recovered", "负载生成器恢复({source})", source=source)
+        self._saturated = saturated
+
+    def drain_pending(self):
+        """取出自上次上报以来的采样（worker上报用）"""
+        pending, self._pending = self._pending, []
+        return pending
+
+    def summary(self):
+        """
+        每个来源的汇总
+
+        Returns:
+            list: 每项为 dict(source, samples, saturated, saturated_ratio, max_lag_ms, p95_lag_ms, mean_cpu, max_cpu,
+                  max_greenlets)
+        """
+        rows = []
+        for source, samples in sorted(self.samples.items()):
+            if not samples:
+                continue
+            lags = sorted(sample.loop_lag_ms for sample in samples)
+            saturated = sum(1 for sample in samples if self.is_saturated(sample))
+            rows.append({
+                "source": source,
+                "samples": len(samples),
+                "saturated": saturated,
+                "saturated_ratio": saturated / len(samples),
+                "max_lag_ms": lags[-1],
+                "p95_lag_ms": lags[min(int(len(lags) * 0.95), len(lags) - 1)],
+                "mean_cpu": sum(sample.cpu_percent for sample in samples) / len(samples),
+                "max_cpu": max(sample.cpu_percent for sample in samples),
+                "max_greenlets": max(sample.greenlets for sample in samples),
+            })
+        return rows
+
+    def saturated_sources(self, tolerance):
+        return [row["source"] for row in self.summary() if row["saturated_ratio"] > tolerance]
+
+    def write_csv(self, out):
+        writer = csv.writer(out)
+        writer.writerow(CSV_HEADER)
+        for source, samples in sorted(self.samples.items()):
+            for sample in samples:
+                writer.writerow([source, f"{sample.timestamp:.3f}", sample.loop_lag_ms,
+                                 sample.cpu_percent, sample.greenlets, sample.users])
+
+    def print_summary(self, tolerance, out=sys.stdout):
+        rows = self.summary()
+        if not rows:
+            return
+        out.write(f"负载生成器饱和检测（事件循环延迟阈值 {self.lag_threshold_ms:g}ms，CPU阈值 {self.cpu_threshold:g}%）\n")
+        out.write(f"{'Source':<40} {'samples':>8} {'p95 lag':>9} {'max lag':>9} {'avg CPU':>8} {'max CPU':>8} "
+                  f"{'greenlets':>9} {'saturated':>10}\n")
+        for row in rows:
+            flag = " ⚠" if row["saturated_ratio"] > tolerance else ""
+            out.write(f"{row['source']:<40} {row['samples']:>8} {row['p95_lag_ms']:>9.1f} {row['max_lag_ms']:>9.1f} "
+                      f"{row['mean_cpu']:>8.1f} {row['max_cpu']:>8.1f} {row['max_greenlets']:>9} "
+                      f"{row['saturated_ratio']:>10.1%}{flag}\n")
+        out.flush()
+
+
+# 在Locust的index.html上增加Saturation标签，每2秒从 /saturation 刷新各来源的最新采样和汇总
+SATURATION_TEMPLATE = """{% extends "index.html" %}
+{% block extended_tabs %}
+<li><a href="#">Saturation</a></li>
+{% endblock extended_tabs %}
+{% block extended_panes %}
+<div style="display:none;">
+    <p id="saturation_thresholds"></p>
+    <table id="saturation" class="stats">
+        <thead>
+            <tr>
+                <th class="stats_label">Source</th>
+                <th class="stats_label numeric">Loop Lag (ms)</th>
+                <th class="stats_label numeric">CPU (%)</th>
+                <th class="stats_label numeric">Greenlets</th>
+                <th class="stats_label numeric">Users</th>
+                <th class="stats_label numeric">p95 Lag (ms)</th>
+                <th class="stats_label numeric">Max Lag (ms)</th>
+                <th class="stats_label numeric">Max CPU (%)</th>
+                <th class="stats_label numeric">Saturated</th>
+            </tr>
+        </thead>
+        <tbody>
+        </tbody>
+    </table>
+    <p><a href="./saturation/csv">Download saturation CSV</a></p>
+</div>
+{% endblock extended_panes %}
+{% block extended_script %}
+<script type="text/javascript">
+    function updateSaturation() {
+        $.get("./saturation", function (data) {
+            $("#saturation_thresholds").text("Loop lag threshold " + data.lag_threshold_ms + " ms, CPU threshold "
+                + data.cpu_threshold + " %");
+            var tbody = $("#saturation tbody").empty();
+            $.each(data.summary, function (i, row) {
+                var latest = data.latest[row.source] || {};
+                var cells = [row.source, latest.loop_lag_ms, latest.cpu_percent, latest.greenlets, latest.users,
+                             row.p95_lag_ms.toFixed(1), row.max_lag_ms.toFixed(1), row.max_cpu.toFixed(1),
+                             (row.saturated_ratio * 100).toFixed(1) + "%"];
+                var tr = $("<tr>");
+                $.each(cells, function (j, value) {
+                    $("<td>").addClass(j ? "numeric" : "").text(value === undefined ? "" : value).appendTo(tr);
+                });
+                tbody.append(tr);
+            });
+        }).always(function () {
+            setTimeout(updateSaturation, 2000);
+        });
+    }
+    updateSaturation();
+</script>
+{% endblock extended_script %}
+"""
+
+
+def _create_monitor():
+    return SaturationMonitor(jira_config.saturation_interval, jira_config.saturation_lag_ms,
+                             jira_config.saturation_cpu_percent)
+
+
+# 进程级饱和检测器
+saturation_monitor = _create_monitor()
+
+
+def setup_saturation_monitor(environment, monitor=saturation_monitor):
+    """
+    把饱和检测接入Locust事件
+
+    worker: 测试期间采样，每次向master上报统计时附带新采样
+    master: 按worker id合并采样
+    单机: 本进程采样
+    master/单机: 提供Web路由，测试结束时打印汇总、导出CSV，并按配置设置退出码
+    """
+    runner = environment.runner
+    events = environment.events
+
+    events.test_start.add_listener(monitor.reset)
+    if isinstance(runner, WorkerRunner):
+        events.test_start.add_listener(lambda **kwargs: monitor.start(runner, runner.client_id))
+        events.test_stop.add_listener(lambda **kwargs: monitor.stop())
+
+        def on_report_to_master(client_id, data):
+            pending = monitor.drain_pending()
+            if pending:
+                data["saturation_samples"] = pending
+
+        events.report_to_master.add_listener(on_report_to_master)
+        return
+
+    if isinstance(runner, MasterRunner):
+        def on_worker_report(client_id, data):
+            for sample in data.get("saturation_samples", ()):
+                monitor.record(client_id, Sample(*sample))
+
+        events.worker_report.add_listener(on_worker_report)
+    else:
+        events.test_start.add_listener(lambda **kwargs: monitor.start(runner))
+        events.test_stop.add_listener(lambda **kwargs: monitor.stop())
+
+    web_ui = environment.web_ui
+    if web_ui is not None:
+        @web_ui.app.route("/saturation-ui")
+        @web_ui.auth_required_if_enabled
+        def saturation_ui():
+            web_ui.update_template_args()
+            return render_template_string(SATURATION_TEMPLATE, **web_ui.template_args)
+
+        @web_ui.app.route("/saturation")
+        @web_ui.auth_required_if_enabled
+        def saturation_summary():
+            return {
+                "lag_threshold_ms": monitor.lag_threshold_ms,
+                "cpu_threshold": monitor.cpu_threshold,
+                "summary": monitor.summary(),
+                "latest": {source: samples[-1]._asdict() for source, samples in monitor.samples.items() if samples},
+            }
+
+        @web_ui.app.route("/saturation/csv")
+        @web_ui.auth_required_if_enabled
+        def saturation_csv():
+            out = io.StringIO()
+            monitor.write_csv(out)
+            return out.getvalue(), 200, {
+                "Content-Type": "text/csv",
+                "Content-Disposition": "attachment; filename=saturation.csv",
+            }
+
+    def on_quitting(environment, **kwargs):
+        tolerance = jira_config.saturation_tolerance
+        monitor.print_summary(tolerance)
+        if jira_config.saturation_csv_path:
+            with open(jira_config.saturation_csv_path, 'w', newline='', encoding='utf-8') as f:
+                monitor.write_csv(f)
+
+        saturated = monitor.saturated_sources(tolerance)
+        if saturated:
+            logger.warning("saturation.result",
+                           "⚠ 负载生成器在测试期间饱和: {sources}，响应时间中包含本机调度延迟，结果不能完全归因于Jira",
+                           sources=", ".join(saturated))
+            if jira_config.saturation_fail:
+                environment.process_exit_code = SATURATION_EXIT_CODE
+
+    events.quitting.add_listener(on_quitting)
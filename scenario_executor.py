@@ -0,0 +1,86 @@
+"""
+SOC批量场景的并发执行引擎
+在有界的greenlet池中并发执行API调用并记录每次调用的耗时，
+使批量告警等场景模拟真实的突发流量，而不是逐个往返
+"""
+import time
+
+from gevent.pool import Pool
+
+from saturation_monitor import track_group
+
+
+class CallResult:
+    """单次调用的结果"""
+
+    __slots__ = ('item', 'value', 'latency_ms', 'error')
+
+    def __init__(self, item, value, latency_ms, error=None):
+        self.item = item
+        self.value = value
+        self.latency_ms = latency_ms
+        self.error = error
+
+    @property
+    def ok(self):
+        return self.error is None
+
+
+class ConcurrentExecutor:
+    """
+    有界并发执行器
+
+    concurrency为1时在当前greenlet中顺序执行，与普通循环一致：第一个调用抛出异常后不再执行后续调用。
+    并发执行时已提交的调用都会执行完（其他元素的请求仍会发往Jira），之后由raise_first_error抛出第一个异常
+    """
+
+    def __init__(self, concurrency=1):
+        if concurrency < 1:
+            raise ValueError("并发数必须大于等于1")
+        self.concurrency = concurrency
+
+    def run(self, func, items):
+        """
+        对每个元素执行func(item)
+
+        Args:
+            func: 要执行的函数
+            items: 输入元素列表
+
+        Returns:
+            list: 按输入顺序排列的CallResult列表（顺序执行时在第一个异常处停止，只包含已执行的调用）
+        """
+        items = list(items)
+        if self.concurrency == 1 or len(items) <= 1:
+            results = []
+            for item in items:
+                result = _timed_call(func, item)
+                results.append(result)
+                if result.error is not None:
+                    break
+            return results
+
+        pool = track_group(Pool(min(self.concurrency, len(items))))
+        return pool.map(lambda item: _timed_call(func, item), items)
+
+
+def _timed_call(func, item):
+    start = time.perf_counter()
+    try:
+        value = func(item)
+        error = None
+    except Exception as e:
+        value = None
+        error = e
+    return CallResult(item, value, (time.perf_counter() - start) * 1000, error)
+
+
+def raise_first_error(results):
+    """
+    按输入顺序重新抛出第一个异常
+
+    顺序执行时结果在该异常处截止，与普通循环的语义一致；并发执行时其余调用在此之前已全部完成
+    """
+    for result in results:
+        if result.error is not None:
+            raise result.error
@@ -0,0 +1,250 @@
+"""
+Jira测试数据预填充工具
+在容量测试前向Jira批量写入安全事件：按优先级分布切分为多个分片，由进程池并行执行，
+每个进程内再用SOCTestScenarios.generate_realistic_soc_workload并发创建。
+进度写入本地checkpoint文件，中断后重新运行同一命令即可从中断处继续。
+按Ctrl+C时不再开始新的分片，等待执行中的分片完成并记录实际创建的数量后退出（再次按Ctrl+C强制退出）。
+
+用法:
+    python seed_jira.py --total 200000 --processes 8 --concurrency 20
+    python seed_jira.py --checkpoint seed_checkpoint.json          # 继续上次中断的填充
+    python seed_jira.py --total 50000 --restart                    # 忽略已有checkpoint重新开始
+
+注意: 父进程只负责调度和写checkpoint，不导入locust/gevent（gevent的monkey patch会使multiprocessing的进程池挂起），
+API客户端只在工作进程中创建。
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import signal
+import sys
+import time
+from datetime import datetime
+
+from config import jira_config
+
+CHECKPOINT_VERSION = 1
+DEFAULT_TOTAL = 1000
+
+# 工作进程内的场景实例与停止标志（由_init_worker创建）
+_scenarios = None
+_stop_event = None
+
+
+def _init_worker(concurrency, stop_event):
+    """工作进程初始化：创建独立连接池的API客户端；忽略Ctrl+C，由父进程通过stop_event通知停止"""
+    global _scenarios, _stop_event
+    from jira_utils import JiraAPIClient, SOCTestScenarios, create_session
+
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    _stop_event = stop_event
+
+    jira_config.validate_config()
+    client = JiraAPIClient(session=create_session(pool_size=concurrency))
+    # 没有Locust运行环境，不需要上报请求统计
+    client.report_stats = False
+    _scenarios = SOCTestScenarios(client, concurrency=concurrency)
+
+
+def _plan(total):
+    """按SOCTestScenarios的优先级分布计算各优先级的目标数量（在工作进程中执行）"""
+    return _scenarios.incident_distribution(total)
+
+
+def _seed_shard(shard):
+    """
+    执行一个分片
+
+    Args:
+        shard: (优先级, 数量)
+
+    Returns:
+        tuple: (优先级, 成功数, 失败数, 错误信息或None)；已请求停止时不执行，成功数和失败数均为0
+    """
+    priority, count = shard
+    if _stop_event.is_set():
+        return priority, 0, 0, None
+    # 单个创建失败不会中断分片，只把实际创建的数量计入进度，未创建的部分下次运行时重试
+    result = _scenarios.generate_realistic_soc_workload(distribution={priority: count}, raise_errors=False)
+    created = result['distribution'][priority]
+    return priority, created, count - created, result['errors'][0] if result['errors'] else None
+
+
+def build_shards(remaining, batch_size):
+    """
+    把各优先级的剩余数量切分为分片，并在优先级之间交错排列，
+    使任意时刻中断时已创建的数据都大致符合目标分布
+    """
+    queues = {
+        priority: [min(batch_size, count - offset) for offset in range(0, count, batch_size)]
+        for priority, count in remaining.items() if count > 0
+    }
+    shards = []
+    while queues:
+        for priority in list(queues):
+            shards.append((priority, queues[priority].pop(0)))
+            if not queues[priority]:
+                del queues[priority]
+    return shards
+
+
+class Checkpoint:
+    """填充进度（每完成一个分片原子地写入一次）"""
+
+    def __init__(self, path, project_key, target, created=None, failed=None, elapsed_s=0.0):
+        self.path = path
+        self.project_key = project_key
+        self.target = target
+        self.created = created or {priority: 0 for priority in target}
+        self.failed = failed or {priority: 0 for priority in target}
+        self.elapsed_s = elapsed_s
+
+    @classmethod
+    def load(cls, path):
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get('version') != CHECKPOINT_VERSION:
+            raise ValueError(f"不支持的checkpoint版本: {data.get('version')}")
+        return cls(path, data['project_key'], data['target'], data['created'], data['failed'], data['elapsed_s'])
+
+    @property
+    def remaining(self):
+        return {priority: max(count - self.created.get(priority, 0), 0) for priority, count in self.target.items()}
+
+    @property
+    def total_created(self):
+        return sum(self.created.values())
+
+    @property
+    def total_target(self):
+        return sum(self.target.values())
+
+    def record(self, priority, created, failed):
+        self.created[priority] = self.created.get(priority, 0) + created
+        self.failed[priority] = self.failed.get(priority, 0) + failed
+
+    def save(self):
+        data = {
+            'version': CHECKPOINT_VERSION,
+            'project_key': self.project_key,
+            'target': self.target,
+            'created': self.created,
+            'failed': self.failed,
+            'elapsed_s': round(self.elapsed_s, 3),
+            'updated_at': datetime.now().isoformat(timespec='seconds'),
+        }
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.path)
+
+
+def _load_or_create_checkpoint(args, pool):
+    if os.path.exists(args.checkpoint) and not args.restart:
+        checkpoint = Checkpoint.load(args.checkpoint)
+        if checkpoint.project_key != jira_config.project_key:
+            raise ValueError(f"checkpoint属于项目 {checkpoint.project_key}，当前PROJECT_KEY为 {jira_config.project_key}，"
+                             f"请使用 --restart 或其他 --checkpoint 文件")
+        if args.total and args.total != checkpoint.total_target:
+            print(f"⚠ 继续已有checkpoint（目标 {checkpoint.total_target}），忽略 --total {args.total}")
+        print(f"继续填充: 已创建 {checkpoint.total_created}/{checkpoint.total_target}")
+        return checkpoint
+
+    target = pool.apply(_plan, (args.total or DEFAULT_TOTAL,))
+    checkpoint = Checkpoint(args.checkpoint, jira_config.project_key, target)
+    checkpoint.save()
+    return checkpoint
+
+
+def seed(args):
+    context = multiprocessing.get_context('spawn')
+    stop_event = context.Event()
+    with context.Pool(args.processes, initializer=_init_worker, initargs=(args.concurrency, stop_event)) as pool:
+        checkpoint = _load_or_create_checkpoint(args, pool)
+        shards = build_shards(checkpoint.remaining, args.batch_size)
+        if not shards:
+            print(f"✓ 已完成，无需填充: {checkpoint.total_created}/{checkpoint.total_target}")
+            return checkpoint
+
+        print(f"开始填充项目 {checkpoint.project_key}: 剩余 {sum(checkpoint.remaining.values())} 个事件，"
+              f"{len(shards)} 个分片，{args.processes} 个进程 × {args.concurrency} 并发")
+
+        start = time.time()
+        elapsed_before = checkpoint.elapsed_s
+        created_this_run = 0
+        results = pool.imap_unordered(_seed_shard, shards)
+        interrupted = False
+        while True:
+            try:
+                priority, created, failed, error = next(results)
+            except StopIteration:
+                break
+            except KeyboardInterrupt:
+                if interrupted:
+                    pool.terminate()
+                    print(f"\n已强制中断，进度已保存到 {checkpoint.path}")
+                    print("（强制中断时正在执行的分片可能已部分写入Jira，继续运行时会按checkpoint重新创建这部分数量）")
+                    return checkpoint
+                interrupted = True
+                stop_event.set()
+                print("\n正在等待执行中的分片完成，不再开始新的分片（再次按Ctrl+C强制退出）...")
+                continue
+            if not created and not failed:
+                continue
+
+            checkpoint.record(priority, created, failed)
+            checkpoint.elapsed_s = elapsed_before + time.time() - start
+            checkpoint.save()
+
+            created_this_run += created
+            elapsed = time.time() - start
+            rate = created_this_run / elapsed if elapsed > 0 else 0.0
+            remaining = sum(checkpoint.remaining.values())
+            eta = f"{remaining / rate:.0f}s" if rate > 0 else "-"
+            progress = checkpoint.total_created / checkpoint.total_target * 100 if checkpoint.total_target else 100.0
+            print(f"[{progress:5.1f}%] {checkpoint.total_created}/{checkpoint.total_target} "
+                  f"({priority} +{created}, 失败 {failed}) {rate:.1f} issues/s, 预计剩余 {eta}")
+            if error:
+                print(f"   ✗ 分片中的创建失败: {error}")
+
+        if interrupted:
+            print(f"已中断，进度已保存到 {checkpoint.path}，重新运行同一命令即可继续")
+            return checkpoint
+
+    elapsed = time.time() - start
+    total_failed = sum(checkpoint.failed.values())
+    print(f"\n✓ 本次创建 {created_this_run} 个事件，耗时 {elapsed:.1f}s，平均 {created_this_run / max(elapsed, 1e-9):.1f} issues/s")
+    print(f"   总进度 {checkpoint.total_created}/{checkpoint.total_target}: "
+          + ", ".join(f"{priority} {checkpoint.created[priority]}/{count}" for priority, count in checkpoint.target.items()))
+    if sum(checkpoint.remaining.values()):
+        print(f"   ⚠ 累计失败 {total_failed} 次，重新运行同一命令可重试未完成的部分")
+    return checkpoint
+
+
+def main():
+    parser = argparse.ArgumentParser(description="并行、可断点续传的Jira测试数据填充工具")
+    parser.add_argument("--total", type=int, help=f"要创建的事件总数，按SOC优先级分布切分（默认{DEFAULT_TOTAL}，继续已有checkpoint时忽略）")
+    parser.add_argument("--processes", type=int, default=os.cpu_count() or 1, help="工作进程数")
+    parser.add_argument("--concurrency", type=int, default=10, help="每个进程内的并发请求数")
+    parser.add_argument("--batch-size", type=int, default=100, help="每个分片的事件数（每完成一个分片写一次checkpoint）")
+    parser.add_argument("--checkpoint", default="seed_checkpoint.json", help="进度文件路径")
+    parser.add_argument("--restart", action="store_true", help="忽略已有的checkpoint重新开始")
+    args = parser.parse_args()
+
+    if args.processes < 1 or args.concurrency < 1 or args.batch_size < 1:
+        parser.error("--processes、--concurrency、--batch-size必须大于0")
+
+    try:
+        jira_config.validate_config()
+    except ValueError as e:
+        print(f"✗ 配置错误: {e}")
+        sys.exit(1)
+
+    checkpoint = seed(args)
+    if sum(checkpoint.remaining.values()):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
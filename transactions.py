@@ -0,0 +1,115 @@
+"""
+事务级计时
+一个业务操作常常由多个请求组成（值班交接 = 评论 + 分配，事件升级 = 更新优先级 + 评论），
+分析师关心的是整个操作的端到端等待时间。Transaction把其中嵌套的请求归为一个命名事务:
+
+    with Transaction("值班交接"):
+        client.add_comment(...)
+        client.assign_incident(...)
+
+    @transaction("事件升级")
+    def escalate(...):
+        ...
+
+事务结束时上报一条TXN类型的派生统计（响应时间为整个事务的耗时，包含429等待和重试），
+与原始请求并列出现在Locust统计、HDR分位数和CSV中，但不计入Aggregated的请求数和RPS。失败语义:
+
+    - 事务内任何一个请求失败（上报了exception），事务失败
+    - 事务体抛出异常（异常照常向外抛出），或调用了failure()，事务失败
+    - 用户被停止或Locust的任务控制流（GreenletExit、StopUser、InterruptTaskSet、RescheduleTask）
+      打断事务时，事务不完整，不上报
+
+事务按greenlet跟踪，可以嵌套：内层事务失败时外层同样失败。在其他greenlet中发送的请求（例如并发执行器的池中）
+不属于当前事务，需要在执行的函数内部开启事务。
+"""
+import time
+from functools import wraps
+
+from gevent import GreenletExit
+from gevent.local import local
+from locust import events
+from locust.exception import InterruptTaskSet, RescheduleTask, StopUser
+
+import derived_stats
+
+TRANSACTION_REQUEST_TYPE = "TXN"
+
+# 打断事务但不代表失败的异常（用户停止、Locust的任务控制流）
+CONTROL_FLOW_EXCEPTIONS = (GreenletExit, StopUser, InterruptTaskSet, RescheduleTask)
+
+_transaction_state = local()
+
+
+class TransactionFailure(Exception):
+    """事务失败（嵌套请求失败、事务体异常或显式标记）"""
+
+
+def _open_transactions():
+    stack = getattr(_transaction_state, 'stack', None)
+    if stack is None:
+        stack = _transaction_state.stack = []
+    return stack
+
+
+class Transaction:
+    """把当前greenlet中嵌套的请求归为一个命名事务（上下文管理器）"""
+
+    def __init__(self, name):
+        self.name = name
+        self.error = None
+        self._start_time = None
+        self._start = None
+
+    @property
+    def failed(self):
+        return self.error is not None
+
+    def failure(self, message):
+        """把事务标记为失败（保留第一个失败原因）"""
+        if self.error is None:
+            self.error = message if isinstance(message, Exception) else TransactionFailure(message)
+
+    def __enter__(self):
+        self._start_time = time.time()
+        self._start = time.perf_counter()
+        _open_transactions().append(self)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        response_time = (time.perf_counter() - self._start) * 1000
+        stack = _open_transactions()
+        stack.remove(self)
+        if exc_type is not None:
+            if issubclass(exc_type, CONTROL_FLOW_EXCEPTIONS):
+                return False
+            self.failure(TransactionFailure(f"{exc_type.__name__}: {exc_value}"))
+        if self.error is not None:
+            # 内层事务失败时外层同样失败
+            for txn in stack:
+                txn.failure(TransactionFailure(f"{TRANSACTION_REQUEST_TYPE} {self.name}: {self.error}"))
+        derived_stats.report(TRANSACTION_REQUEST_TYPE, self.name, response_time, exception=self.error,
+                             start_time=self._start_time)
+        return False
+
+
+def transaction(name):
+    """装饰器：把函数的一次调用作为一个命名事务"""
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with Transaction(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+@events.request.add_listener
+def _on_request(request_type, name, exception=None, **kwargs):
+    """请求失败时标记当前greenlet中所有未结束的事务"""
+    if exception is None:
+        return
+    stack = getattr(_transaction_state, 'stack', None)
+    if not stack:
+        return
+    for txn in stack:
+        txn.failure(TransactionFailure(f"{request_type} {name}: {exception}"))